@@ -0,0 +1,257 @@
+# ---------------- Data-driven sprite animation ----------------
+import json
+import os
+
+import arcade
+import numpy as np
+
+from TextureCache import texture_cache
+
+# Fichier de clips d'un personnage : assets/sprites/<Personnage>/animations.json
+ANIMATION_FILE = "animations.json"
+DEFAULT_FRAME_DURATION = 0.1
+DEFAULT_CAPACITY = 16
+# Événement émis quand un clip non bouclé arrive à sa dernière image
+END_EVENT = "end"
+
+
+def load_animation_data(path) -> dict:
+    """
+    Clips d'un personnage, par nom :
+
+        {"clips": {"attack": {"folder": "attack", "start": 1, "end": null,
+                              "frame_duration": 0.1, "loop": false,
+                              "events": {"7": "hit"}}}}
+
+    folder est relatif au fichier ; start / end découpent les frames du
+    dossier (comme frames[start:end]) ; events associe un index d'image du
+    clip à un nom d'événement renvoyé par Animator.update().
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def animation_folders(path) -> list[str]:
+    """Dossiers de frames utilisés par un fichier de clips (pour ScenePreloader)."""
+    directory = os.path.dirname(path)
+    clips = load_animation_data(path)["clips"].values()
+    return sorted({os.path.join(directory, clip["folder"]) for clip in clips})
+
+
+class Clip:
+    def __init__(self, name: str, textures: list, frame_duration: float, loop: bool, events: dict):
+        self.name = name
+        self.textures = textures
+        self.frame_duration = frame_duration
+        self.loop = loop
+        self.events = events
+
+
+class Character:
+    """Clips d'un personnage, lus depuis son fichier de données."""
+    def __init__(self, path: str, clips: dict[str, Clip]):
+        self.path = path
+        self.clips = clips
+
+    @classmethod
+    def load(cls, path):
+        directory = os.path.dirname(path)
+        clips = {}
+        for name, spec in load_animation_data(path)["clips"].items():
+            frames = texture_cache.load_frames(os.path.join(directory, spec["folder"]))
+            clips[name] = Clip(
+                name,
+                frames[spec.get("start", 0):spec.get("end")],
+                spec.get("frame_duration", DEFAULT_FRAME_DURATION),
+                spec.get("loop", True),
+                {int(frame): event for frame, event in spec.get("events", {}).items()},
+            )
+        return cls(path, clips)
+
+
+class Animator:
+    """
+    Animation de tous les acteurs d'une scène en une passe sur des tableaux.
+
+    Les clips de chaque personnage sont mis bout à bout dans une table de
+    textures commune ; un acteur n'est qu'un index de clip, une image, un
+    chrono. update() avance tous les chronos en NumPy, change d'image quand
+    le chrono dépasse la durée du clip (puis le remet à 0, comme les anciens
+    frame_timer), et n'affecte sprite.texture qu'aux acteurs qui changent
+    réellement d'image. Les images d'événement ("hit"...) et la fin des
+    clips non bouclés sont renvoyées sous forme de (index, événement).
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.characters: dict[str, Character] = {}
+        # table des clips (tous personnages) et table des images de tous les clips
+        self._clip_ids: dict[tuple[str, str], int] = {}
+        self._clip_names: list[str] = []
+        self.clip_start = np.zeros(0, np.int32)
+        self.clip_length = np.zeros(0, np.int32)
+        self.clip_duration = np.zeros(0, np.float64)
+        self.clip_loop = np.zeros(0, bool)
+        self.textures: list[arcade.Texture] = []
+        self.frame_event = np.zeros(0, np.int32)
+        self.event_names: list[str] = []
+
+        # acteurs
+        self.count = 0
+        self.sprites: list = []
+        self._actor_character: list[str] = []
+        self.clip = np.full(capacity, -1, np.int32)
+        self.frame = np.zeros(capacity, np.int32)
+        self.timer = np.zeros(capacity, np.float64)
+        self.done = np.zeros(capacity, bool)
+        self.paused = np.zeros(capacity, bool)
+        self.shown = np.full(capacity, -1, np.int32)
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def capacity(self) -> int:
+        return len(self.clip)
+
+    # -------------- données --------------
+    def load_character(self, path) -> Character:
+        """Charge (une fois) un fichier de clips et ajoute ses clips aux tables."""
+        path = os.path.normpath(path)
+        character = self.characters.get(path)
+        if character is not None:
+            return character
+        character = Character.load(path)
+        self.characters[path] = character
+        starts, lengths, durations, loops, events = [], [], [], [], []
+        for name, clip in character.clips.items():
+            self._clip_ids[(path, name)] = len(self._clip_names)
+            self._clip_names.append(name)
+            starts.append(len(self.textures))
+            lengths.append(len(clip.textures))
+            durations.append(clip.frame_duration)
+            loops.append(clip.loop)
+            frame_events = [-1] * len(clip.textures)
+            for frame, event in clip.events.items():
+                if 0 <= frame < len(frame_events):
+                    if event not in self.event_names:
+                        self.event_names.append(event)
+                    frame_events[frame] = self.event_names.index(event)
+            events.extend(frame_events)
+            self.textures.extend(clip.textures)
+        self.clip_start = np.append(self.clip_start, np.array(starts, np.int32))
+        self.clip_length = np.append(self.clip_length, np.array(lengths, np.int32))
+        self.clip_duration = np.append(self.clip_duration, np.array(durations, np.float64))
+        self.clip_loop = np.append(self.clip_loop, np.array(loops, bool))
+        self.frame_event = np.append(self.frame_event, np.array(events, np.int32))
+        return character
+
+    def clip_id(self, index: int, name: str) -> int:
+        """Identifiant du clip name du personnage de l'acteur index (pour play_many)."""
+        return self._clip_ids[(self._actor_character[index], name)]
+
+    # -------------- acteurs --------------
+    def add(self, sprite, character_path) -> int:
+        """Ajoute un acteur animé avec les clips de character_path ; renvoie son index."""
+        path = os.path.normpath(character_path)
+        self.load_character(path)
+        i = self.count
+        if i >= self.capacity:
+            self._grow(i + 1)
+        self.sprites.append(sprite)
+        self._actor_character.append(path)
+        self.clip[i] = -1
+        self.frame[i] = 0
+        self.timer[i] = 0
+        self.done[i] = False
+        self.paused[i] = False
+        self.shown[i] = -1
+        self.count = i + 1
+        return i
+
+    def _grow(self, needed: int):
+        capacity = max(1, self.capacity)
+        while capacity < needed:
+            capacity *= 2
+        for name, fill in (("clip", -1), ("frame", 0), ("timer", 0), ("done", False), ("paused", False), ("shown", -1)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill, old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def current(self, index: int) -> str | None:
+        clip = self.clip[index]
+        return self._clip_names[clip] if clip >= 0 else None
+
+    def play(self, index: int, name: str, restart: bool = False):
+        """Joue le clip name ; sans effet s'il est déjà en cours, sauf restart."""
+        self.play_many(np.array([index]), np.array([self.clip_id(index, name)]), restart)
+
+    def play_many(self, indices, clip_ids, restart: bool = False):
+        """play() pour plusieurs acteurs à la fois (clip_ids : voir clip_id)."""
+        indices = np.asarray(indices, np.int64)
+        clip_ids = np.asarray(clip_ids, np.int32)
+        if not restart:
+            changed = self.clip[indices] != clip_ids
+            indices, clip_ids = indices[changed], clip_ids[changed]
+        if len(indices) == 0:
+            return
+        self.clip[indices] = clip_ids
+        self.frame[indices] = 0
+        self.timer[indices] = 0
+        self.done[indices] = False
+        # première image tout de suite
+        has_frames = self.clip_length[clip_ids] > 0
+        self._show(indices[has_frames], self.clip_start[clip_ids[has_frames]])
+
+    def stop(self, index: int):
+        """L'acteur garde sa texture actuelle et n'est plus animé."""
+        self.clip[index] = -1
+
+    def pause(self, index: int, paused: bool = True):
+        """Fige l'acteur sur son image (chrono compris) jusqu'à pause(index, False)."""
+        self.paused[index] = paused
+
+    def _show(self, indices, texture_indices):
+        """Change la texture des seuls acteurs dont l'image affichée change."""
+        changed = self.shown[indices] != texture_indices
+        textures, sprites = self.textures, self.sprites
+        for i, t in zip(indices[changed].tolist(), texture_indices[changed].tolist()):
+            sprites[i].texture = textures[t]
+        self.shown[indices] = texture_indices
+
+    # -------------- update --------------
+    def update(self, delta_time: float) -> list[tuple[int, str]]:
+        """Avance tous les acteurs ; renvoie les événements (index, nom) dans l'ordre des acteurs."""
+        n = self.count
+        if n == 0:
+            return []
+        clip = self.clip[:n]
+        active = (clip >= 0) & ~self.done[:n] & ~self.paused[:n]
+        clip = np.maximum(clip, 0)
+        timer, frame = self.timer[:n], self.frame[:n]
+        timer[active] += delta_time
+        step = active & (timer > self.clip_duration[clip])
+        if not step.any():
+            return []
+        timer[step] = 0
+        frame[step] += 1
+
+        length = self.clip_length[clip]
+        looping = step & self.clip_loop[clip]
+        frame[looping] %= np.maximum(length[looping], 1)
+        finished = step & ~self.clip_loop[clip] & (frame >= length)
+        # un clip non bouclé reste sur sa dernière image
+        frame[finished] = np.maximum(length[finished] - 1, 0)
+        self.done[:n] |= finished
+
+        shown = step & ~finished & (length > 0)
+        indices = np.flatnonzero(shown)
+        texture_indices = self.clip_start[clip[indices]] + frame[indices]
+        self._show(indices, texture_indices)
+
+        events = []
+        event_ids = self.frame_event[texture_indices]
+        for i, e in zip(indices[event_ids >= 0].tolist(), event_ids[event_ids >= 0].tolist()):
+            events.append((i, self.event_names[e]))
+        events.extend((i, END_EVENT) for i in np.flatnonzero(finished).tolist())
+        events.sort(key=lambda event: event[0])
+        return events
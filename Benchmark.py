@@ -0,0 +1,217 @@
+"""
+Benchmark des scènes : coût de on_update et de on_draw avec des entrées scriptées.
+
+    python Benchmark.py                                   # scene1..3, scripts par défaut
+    python Benchmark.py scene2 --ticks 1200 --out bench.json
+    python Benchmark.py --offscreen --thresholds bench_thresholds.json
+
+Chaque scène est chargée dans MainView (setup chronométré), les dialogues
+sont passés à la touche SPACE, puis le script d'entrées (voir
+HeadlessRunner.SCRIPTS ou un fichier JSON [tick, action, touche]) joue le
+combat : déplacements, attaques, recul, fireballs. Sans --script, chaque
+scène a le sien (DEFAULT_SCRIPTS) : "kite" pour scene3, dont le héros ne
+lance ses fireballs qu'à distance, "chase" pour les autres.
+
+Résultat (JSON) par scène : setup, p50/p95/p99/max de on_update et on_draw
+en millisecondes, pics de combattants, particules, gouttes de pluie et fireballs.
+--offscreen utilise un contexte GL sans fenêtre (EGL, rendu logiciel
+possible) pour tourner sur une machine sans GPU ni écran.
+
+Seuils (--thresholds) : {"update_p95_ms": 2.0, "scene2": {"draw_p95_ms": 8.0}}
+les clés à la racine s'appliquent à toutes les scènes ; le code de
+sortie vaut 1 si une mesure dépasse son seuil. Il vaut 1 aussi si un pic
+de REQUIRED_PEAKS reste à 0 (le script n'a pas joué ce qu'on mesure).
+"""
+import json
+import os
+import sys
+import time
+
+DEFAULT_SCENES = ["scene1", "scene2", "scene3"]
+DEFAULT_TICKS = 900
+# Script d'entrées par scène quand --script n'est pas donné
+DEFAULT_SCRIPT = "chase"
+DEFAULT_SCRIPTS = {"scene3": "kite"}
+# Pics qui doivent être atteints pour que la mesure soit valable
+REQUIRED_PEAKS = {"scene3": ("fireballs",)}
+# Ticks entre deux appuis sur SPACE pendant les dialogues
+DIALOGUE_PRESS_INTERVAL = 30
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(name, samples):
+    """Temps (secondes) -> {name_p50_ms: ..., name_max_ms: ...}."""
+    values = sorted(samples)
+    result = {f"{name}_p{p}_ms": round(percentile(values, p) * 1000, 3) for p in PERCENTILES}
+    result[f"{name}_max_ms"] = round(values[-1] * 1000, 3) if values else 0.0
+    return result
+
+
+class SceneBenchmark:
+    """Joue une scène dans MainView en chronométrant chaque update et chaque draw."""
+    def __init__(self, window, scene_module: str, script, ticks: int = DEFAULT_TICKS):
+        self.window = window
+        self.scene_module = scene_module
+        self.script = script
+        self.ticks = ticks
+
+    def _fake_music(self, view):
+        # MainView met la musique en pause pendant les cinématiques
+        class _Silent:
+            def pause(self):
+                pass
+
+            def play(self):
+                pass
+        view.bg_music = _Silent()
+
+    def run(self) -> dict:
+        import arcade
+        import main
+        from FrameProfiler import entity_counts
+
+        view = main.MainView(self.window)
+        self.window.show_view(view)
+        self._fake_music(view)
+        ctx = self.window.ctx
+
+        t0 = time.perf_counter()
+        view.setup_scene(self.scene_module)
+        ctx.finish()
+        setup_seconds = time.perf_counter() - t0
+        scene = view.current_scene
+
+        update_times, draw_times = [], []
+        peaks = {"fighters": 0, "particles": 0, "rain": 0, "fireballs": 0}
+        dialogue_ticks = 0
+        fight_tick = 0
+        for _ in range(self.ticks):
+            if getattr(scene, "dialogue_active", False):
+                if dialogue_ticks % DIALOGUE_PRESS_INTERVAL == 0:
+                    view.on_key_press(arcade.key.SPACE, 0)
+                dialogue_ticks += 1
+            else:
+                for action, key in self.script(scene, fight_tick):
+                    if action == "press":
+                        view.on_key_press(key, 0)
+                    else:
+                        view.on_key_release(key, 0)
+                fight_tick += 1
+
+            t = time.perf_counter()
+            scene.on_update(main.SIM_DT)
+            update_times.append(time.perf_counter() - t)
+
+            t = time.perf_counter()
+            view.on_draw()
+            ctx.finish()  # inclut le temps GPU
+            draw_times.append(time.perf_counter() - t)
+
+            for name, value in entity_counts(scene).items():
+                peaks[name] = max(peaks[name], value)
+            if getattr(scene, "player_health", 1) <= 0 or getattr(scene, "hero_health", 1) <= 0:
+                break
+
+        result = {
+            "scene": self.scene_module,
+            "ticks": len(update_times),
+            "dialogue_ticks": dialogue_ticks,
+            "setup_ms": round(setup_seconds * 1000, 3),
+        }
+        result.update(summarize("update", update_times))
+        result.update(summarize("draw", draw_times))
+        result.update({f"peak_{name}": value for name, value in peaks.items()})
+        return result
+
+
+def check_thresholds(results, thresholds) -> list[str]:
+    """Liste des dépassements 'scene: mesure valeur > seuil'."""
+    failures = []
+    for result in results:
+        limits = {k: v for k, v in thresholds.items() if not isinstance(v, dict)}
+        limits.update(thresholds.get(result["scene"], {}))
+        for key, limit in limits.items():
+            value = result.get(key)
+            if value is not None and value > limit:
+                failures.append(f"{result['scene']}: {key} {value} > {limit}")
+    return failures
+
+
+def check_required_peaks(results) -> list[str]:
+    """Liste des pics de REQUIRED_PEAKS restés à 0 'scene: peak_x 0'."""
+    failures = []
+    for result in results:
+        for name in REQUIRED_PEAKS.get(result["scene"], ()):
+            if not result.get(f"peak_{name}"):
+                failures.append(f"{result['scene']}: peak_{name} 0 (script {result['script']})")
+    return failures
+
+
+def main(argv):
+    args = list(argv)
+
+    def option(name, default):
+        if name in args:
+            i = args.index(name)
+            value = args[i + 1]
+            del args[i:i + 2]
+            return value
+        return default
+
+    def flag(name):
+        if name in args:
+            args.remove(name)
+            return True
+        return False
+
+    if flag("--help"):
+        print(__doc__)
+        return 0
+    if flag("--offscreen"):
+        os.environ["ARCADE_HEADLESS"] = "1"
+    ticks = int(option("--ticks", DEFAULT_TICKS))
+    script_option = option("--script", None)
+    out_path = option("--out", None)
+    thresholds_path = option("--thresholds", None)
+    scenes = args or DEFAULT_SCENES
+
+    import arcade
+    import HeadlessRunner
+
+    window = arcade.Window(960, 720, "Benchmark", visible=False)
+
+    results = []
+    for name in scenes:
+        script_name = script_option or DEFAULT_SCRIPTS.get(name, DEFAULT_SCRIPT)
+        script = HeadlessRunner.SCRIPTS.get(script_name) or HeadlessRunner.load_script(script_name)
+        result = {"scene": name, "script": script_name}
+        result.update(SceneBenchmark(window, name, script, ticks).run())
+        results.append(result)
+    report = {"ticks": ticks, "gl_renderer": window.ctx.info.RENDERER, "scenes": results}
+
+    text = json.dumps(report, indent=1)
+    if out_path:
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+    failures = check_required_peaks(results)
+    if thresholds_path:
+        with open(thresholds_path, encoding="utf-8") as f:
+            failures += check_thresholds(results, json.load(f))
+    for failure in failures:
+        print("❌", failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,73 @@
+# ---------------- Merged static collision geometry ----------------
+import arcade
+import numpy as np
+
+# Calques de tuiles qui servent de murs / sol aux moteurs physiques
+COLLISION_LAYERS = ("Platforms", "Ground")
+
+
+def merge_rectangles(solid: np.ndarray) -> np.ndarray:
+    """
+    Fusion gloutonne des cases pleines d'une grille (ligne 0 = haut de la carte).
+
+    Chaque case pleine pas encore couverte démarre un rectangle, étendu vers la
+    droite tant que les cases sont pleines, puis vers le bas tant que toute
+    la ligne suivante l'est aussi. Renvoie un tableau (N, 4) de
+    (colonne, ligne, largeur, hauteur) en cases.
+    """
+    solid = np.asarray(solid, bool)
+    rows, cols = solid.shape
+    covered = np.zeros_like(solid)
+    rects = []
+    for row in range(rows):
+        for col in range(cols):
+            if not solid[row, col] or covered[row, col]:
+                continue
+            width = 1
+            while col + width < cols and solid[row, col + width] and not covered[row, col + width]:
+                width += 1
+            height = 1
+            while row + height < rows:
+                span = slice(col, col + width)
+                if not (solid[row + height, span].all() and not covered[row + height, span].any()):
+                    break
+                height += 1
+            covered[row:row + height, col:col + width] = True
+            rects.append((col, row, width, height))
+    return np.array(rects, np.int32).reshape(-1, 4)
+
+
+def collision_list(tile_map, wall_list: arcade.SpriteList) -> arcade.SpriteList:
+    """
+    Murs pour PhysicsEnginePlatformer : rectangles fusionnés de la carte
+    compilée si wall_list en est un calque, sinon wall_list tel quel.
+
+    Les tuiles pleines sont remplacées par les rectangles fusionnés ; les
+    tuiles dont la hit box ne couvre pas toute la case (bords, herbe) gardent
+    leur propre sprite pour ne rien changer aux collisions.
+    """
+    collision = getattr(tile_map, "collision", None)
+    if not collision:
+        return wall_list
+    name = next((name for name, layer in tile_map.sprite_lists.items() if layer is wall_list), None)
+    if name not in collision:
+        return wall_list
+
+    rects, partial = collision[name]
+    step_x = tile_map.tile_width * tile_map.scaling
+    step_y = tile_map.tile_height * tile_map.scaling
+    walls = arcade.SpriteList(use_spatial_hash=True)
+    for col, row, width, height in rects.tolist():
+        sprite = arcade.SpriteSolidColor(width * step_x, height * step_y, color=arcade.color.WHITE)
+        sprite.left = col * step_x
+        sprite.top = (tile_map.height - row) * step_y
+        walls.append(sprite)
+    # case d'une tuile d'après sa texture (left/bottom suivent la hit box, pas la case)
+    cells = {(round((sprite.center_x - sprite.width / 2) / step_x),
+              tile_map.height - 1 - round((sprite.center_y - sprite.height / 2) / step_y)): sprite
+             for sprite in wall_list}
+    for row, col in partial.tolist():
+        sprite = cells.get((col, row))
+        if sprite is not None:
+            walls.append(sprite)
+    return walls
@@ -1,45 +1,187 @@
-# ---------------- MP4 cutscene (OpenCV + pyglet audio) ----------------
+# ---------------- MP4 cutscene (frame pack ou OpenCV + pyglet audio) ----------------
+import atexit
+import os
+import queue
+import time
+import weakref
+from array import array
+
+import arcade
+import numpy as np
 import pyglet
 import threading
+from arcade.gl import BufferDescription
+
+from FramePack import FramePackReader, pack_path_for
+
+# Nombre de frames décodées d'avance
+DEFAULT_QUEUE_DEPTH = 8
+
+# Retard (en frames) au-delà duquel on seek au lieu de sauter des frames
+DEFAULT_SEEK_THRESHOLD = 15
+# Avance prise lors d'un seek, le temps que le décodeur se repositionne
+SEEK_LEAD_FRAMES = 2
+
+# Marqueur de fin de vidéo dans la file
+_EOF = object()
+
+# Attente max (s) du thread de décodage à la fermeture
+CLOSE_TIMEOUT = 1.0
+
+# Lecteurs ouverts : fermés à la sortie du programme (voir _close_open_players)
+_open_players = weakref.WeakSet()
+
+# Quad texturé : la frame OpenCV (BGR, première ligne en haut) est envoyée
+# telle quelle, l'inversion des canaux et le retournement se font ici.
+VERTEX_SHADER = """
+#version 330
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+in vec2 in_vert;
+in vec2 in_uv;
+out vec2 v_uv;
+void main() {
+    gl_Position = window.projection * window.view * vec4(in_vert, 0.0, 1.0);
+    v_uv = in_uv;
+}
+"""
+FRAGMENT_SHADER = """
+#version 330
+uniform sampler2D frame;
+in vec2 v_uv;
+out vec4 out_color;
+void main() {
+    out_color = vec4(texture(frame, v_uv).bgr, 1.0);
+}
+"""
+
+
+class OpenCVSource:
+    """cv2.VideoCapture derrière la même interface que FramePackReader."""
+    def __init__(self, cap):
+        self.cap = cap
+        fps = cap.get(5)  # CAP_PROP_FPS
+        try:
+            self.fps = float(fps) if fps and fps > 1e-6 else 30.0
+        except Exception:
+            self.fps = 30.0
+        self.width = int(cap.get(3))   # CAP_PROP_FRAME_WIDTH
+        self.height = int(cap.get(4))  # CAP_PROP_FRAME_HEIGHT
+
+    def read(self, buf=None):
+        return self.cap.read(buf)
+
+    def seek(self, index: int):
+        self.cap.set(1, index)  # CAP_PROP_POS_FRAMES
+
+    def release(self):
+        self.cap.release()
 
 
 class CutscenePlayer:
     """
-    Decode les frames avec OpenCV et les dessine via pyglet ImageData.
+    Decode les frames (frame pack mmap, ou OpenCV à défaut) dans un thread et les dessine via une texture GL
+    unique, créée à open() et réécrite en place à chaque frame.
     Joue aussi l'audio en parallèle avec pyglet.media.
+
+    Le thread de décodage remplit une file bornée (queue_depth) de frames prêtes
+    à envoyer ; update() ne fait que dépiler la frame due. Avec drop_late, les
+    frames en retard sont sautées au lieu d'être affichées une par une.
+
+    L'horloge maître est le temps de lecture du Player audio : un petit retard
+    fait sauter des frames, un gros retard (seek_threshold) fait un seek.
+
+    close() arrête le décodeur ; s'il est encore dans source.read() au bout
+    de CLOSE_TIMEOUT, c'est lui qui libère la source en sortant. Les
+    lecteurs encore ouverts sont fermés à la sortie du programme : un thread
+    tué au milieu de cv2.VideoCapture.read() fait avorter le processus.
     """
-    def __init__(self, file_path: str, audio_path: str):
+    def __init__(self, file_path: str, audio_path: str,
+                 queue_depth: int = DEFAULT_QUEUE_DEPTH, drop_late: bool = True,
+                 seek_threshold: int = DEFAULT_SEEK_THRESHOLD):
         self.file_path = file_path
         self.audio_path = audio_path
-        self.cap = None          # cv2.VideoCapture
+        self.source = None       # FramePackReader, ou OpenCVSource en secours
         self.fps = 30.0
-        self._accum = 0.0
+        self._clock = 0.0
         self.finished = False
-        self._pyg_image = None   # pyglet.image.ImageData
         self._w = 0
         self._h = 0
+
+        # Rendu GPU : texture persistante + quad
+        self._texture = None     # arcade.gl.Texture2D (w, h, 3 composantes)
+        self._program = None
+        self._geometry = None
+        self._quad_rect = None
+        self._buffers: list[np.ndarray] = []  # anneau de buffers de décodage
         self._audio_player = None
 
-    def open(self) -> bool:
+        # Décodage en arrière-plan
+        self.queue_depth = max(1, queue_depth)
+        self.drop_late = drop_late
+        self._frames: queue.Queue = queue.Queue(maxsize=self.queue_depth)
+        self._pending = None     # prochaine frame dépilée mais pas encore due
+        self._stop = threading.Event()
+        self._decoder: threading.Thread | None = None
+        # Libération de la source : par close(), ou par le décodeur si close() n'a pas pu l'attendre
+        self._release_lock = threading.Lock()
+        self._decoder_done = False
+        self._decoder_releases = False
+
+        # Compteurs
+        self.frames_decoded = 0
+        self.frames_shown = 0
+        self.dropped_frames = 0
+        self.decode_time = 0.0   # secondes cumulées dans source.read
+        self.max_decode_time = 0.0
+        self.starved_updates = 0  # updates où la frame due n'était pas encore décodée
+
+        # Synchro sur l'horloge audio
+        self.seek_threshold = seek_threshold
+        self._next_index = 0          # index de la prochaine frame attendue
+        self._seek_target = None      # côté thread principal : frames à jeter avant cet index
+        self._decoder_seek = None     # côté décodeur : position demandée
+        self.seeks = 0
+        self.seek_skipped_frames = 0
+        self._drift_sum = 0.0
+        self.max_drift = 0.0
+
+    def _open_source(self):
+        # Frame pack pré-converti (mmap, pas d'OpenCV) s'il existe
+        pack_path = pack_path_for(self.file_path)
+        if os.path.isfile(pack_path):
+            try:
+                return FramePackReader(pack_path)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Frame pack illisible, retour à OpenCV: {e}")
+
         try:
             import cv2
         except Exception as e:
             print(f"⚠️ OpenCV not installed: {e}")
-            self.finished = True
-            return False
+            return None
 
         cap = cv2.VideoCapture(self.file_path)
         if not cap.isOpened():
             print("⚠️ cv2.VideoCapture could not open:", self.file_path)
+            return None
+        source = OpenCVSource(cap)
+        # Frames décodées directement dans un anneau de buffers réutilisés :
+        # file pleine + frame à afficher + frame en attente + frame en cours de décodage
+        self._buffers = [np.empty((source.height, source.width, 3), np.uint8)
+                         for _ in range(self.queue_depth + 3)]
+        return source
+
+    def open(self) -> bool:
+        self.source = self._open_source()
+        if self.source is None:
             self.finished = True
             return False
-
-        fps = cap.get(5)  # CAP_PROP_FPS
-        try:
-            self.fps = float(fps) if fps and fps > 1e-6 else 30.0
-        except Exception:
-            self.fps = 30.0
-        self.cap = cap
+        self.fps = self.source.fps
+        self._w, self._h = self.source.width, self.source.height
+        self._create_gl_objects()
 
         # charger l'audio si fourni
         if self.audio_path:
@@ -50,56 +192,206 @@ class CutscenePlayer:
             except Exception as e:
                 print(f"⚠️ Impossible de charger l'audio: {e}")
 
+        self._decoder = threading.Thread(target=self._decode_loop, args=(self.source, self._buffers),
+                                         name="cutscene-decoder", daemon=True)
+        self._decoder.start()
+        _open_players.add(self)
         return True
 
     def play_audio(self):
         if self._audio_player:
             self._audio_player.play()
 
+    def _create_gl_objects(self):
+        try:
+            ctx = arcade.get_window().ctx
+        except Exception:
+            return  # pas de contexte GL : pas d'affichage
+        self._texture = ctx.texture((self._w, self._h), components=3, filter=(ctx.LINEAR, ctx.LINEAR))
+        self._program = ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+        self._quad_buffer = ctx.buffer(reserve=4 * 4 * 4)
+        self._geometry = ctx.geometry(
+            [BufferDescription(self._quad_buffer, "2f 2f", ["in_vert", "in_uv"])],
+            mode=ctx.TRIANGLE_STRIP,
+        )
+
+    # -------------- decoder thread --------------
+    def _decode_loop(self, source, buffers):
+        # source et buffers en local : close() peut vider les attributs pendant un read
+        try:
+            index = 0
+            while not self._stop.is_set():
+                target, self._decoder_seek = self._decoder_seek, None
+                if target is not None:
+                    source.seek(target)
+                    index = target
+                t = time.perf_counter()
+                buf = buffers[index % len(buffers)] if buffers else None
+                ok, frame = source.read(buf)
+                if not ok or frame is None:
+                    self._put(_EOF)
+                    return
+                elapsed = time.perf_counter() - t
+                self.decode_time += elapsed
+                self.max_decode_time = max(self.max_decode_time, elapsed)
+                self.frames_decoded += 1
+                self._put((index, frame))
+                index += 1
+        finally:
+            with self._release_lock:
+                self._decoder_done = True
+                if self._decoder_releases:
+                    _release(source)
+
+    def _put(self, item):
+        # put bloquant mais interruptible par close()
+        while not self._stop.is_set():
+            try:
+                self._frames.put(item, timeout=0.05)
+                return
+            except queue.Full:
+                continue
+
+    # -------------- main thread --------------
+    def _master_clock(self, dt: float) -> float:
+        """Temps de lecture : celui du Player audio quand il joue, sinon une horloge locale."""
+        if self._audio_player is not None and self._audio_player.playing:
+            self._clock = self._audio_player.time
+        else:
+            self._clock += dt
+        return self._clock
+
+    def _request_seek(self, target: int):
+        # Le thread de décodage repositionne la vidéo ; en attendant on jette
+        # tout ce qui arrive avec un index antérieur à la cible.
+        self._seek_target = target
+        self._decoder_seek = target
+        self.seeks += 1
+
     def update(self, dt: float):
-        if self.finished or not self.cap:
+        if self.finished or not self.source:
             return
 
-        import cv2
+        t = self._master_clock(dt)
+        due = int(t * self.fps)
 
-        # accumulate time and read as many frames as needed to keep up
-        self._accum += dt
-        frames_to_read = int(self._accum * self.fps)
-        if frames_to_read < 1:
-            return
-        self._accum -= frames_to_read / self.fps
+        # Gros retard : seek plutôt que lire et jeter frame par frame
+        next_index = self._pending[0] if isinstance(self._pending, tuple) else self._next_index
+        if self._seek_target is None and due - next_index > self.seek_threshold:
+            self._request_seek(due + SEEK_LEAD_FRAMES)
 
-        ok, frame = False, None
-        for _ in range(frames_to_read):
-            ok, frame = self.cap.read()
-            if not ok:
+        frame = None
+        frame_index = -1
+        while True:
+            if self._pending is None:
+                try:
+                    self._pending = self._frames.get_nowait()
+                except queue.Empty:
+                    if frame is None and self._next_index <= due:
+                        self.starved_updates += 1
+                    break
+            if self._pending is _EOF:
+                self.finished = True
+                if self._audio_player:
+                    self._audio_player.pause()
+                return
+            index, data = self._pending
+            if self._seek_target is not None:
+                if index < self._seek_target:
+                    self.seek_skipped_frames += 1
+                    self._pending = None
+                    continue
+                self._seek_target = None
+            if index > due:
+                break
+            # petit retard : la frame précédente est sautée
+            if frame is not None:
+                self.dropped_frames += 1
+            frame, frame_index = data, index
+            self._next_index = index + 1
+            self._pending = None
+            if not self.drop_late:
                 break
 
-        if not ok or frame is None:
-            self.finished = True
-            if self._audio_player:
-                self._audio_player.pause()
+        if frame is None:
             return
 
-        # BGR -> RGB, flip vertically for GL-style coordinates
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, _ = frame.shape
-        self._w, self._h = w, h
-        pitch = -w * 3  # negative pitch flips vertically
-        self._pyg_image = pyglet.image.ImageData(w, h, "RGB", frame.tobytes(), pitch=pitch)
+        if self._texture is not None:
+            h, w, _ = frame.shape
+            if (w, h) != self._texture.size:
+                self._texture.resize((w, h))
+            # upload direct depuis le buffer numpy, sans conversion ni copie
+            self._texture.write(frame)
+        self.frames_shown += 1
+
+        # Dérive A/V : position de la frame affichée - horloge audio (positif = vidéo en avance)
+        drift = frame_index / self.fps - t
+        self._drift_sum += abs(drift)
+        self.max_drift = max(self.max_drift, abs(drift))
+
+    def stats(self) -> dict:
+        decoded = max(1, self.frames_decoded)
+        return {
+            "frames_decoded": self.frames_decoded,
+            "frames_shown": self.frames_shown,
+            "dropped_frames": self.dropped_frames,
+            "starved_updates": self.starved_updates,
+            "queue_depth": self._frames.qsize(),
+            "queue_capacity": self.queue_depth,
+            "avg_decode_ms": 1000.0 * self.decode_time / decoded,
+            "max_decode_ms": 1000.0 * self.max_decode_time,
+            "seeks": self.seeks,
+            "seek_skipped_frames": self.seek_skipped_frames,
+            "avg_av_drift_ms": 1000.0 * self._drift_sum / max(1, self.frames_shown),
+            "max_av_drift_ms": 1000.0 * self.max_drift,
+        }
 
     def draw(self, x: float, y: float, w: float, h: float):
-        if self._pyg_image:
-            self._pyg_image.blit(x, y, width=w, height=h)
+        if self._texture is None or self.frames_shown == 0:
+            return
+        if self._quad_rect != (x, y, w, h):
+            # haut du quad -> v = 0 (première ligne de la frame)
+            self._quad_buffer.write(array('f', [
+                x, y + h, 0.0, 0.0,
+                x, y, 0.0, 1.0,
+                x + w, y + h, 1.0, 0.0,
+                x + w, y, 1.0, 1.0,
+            ]))
+            self._quad_rect = (x, y, w, h)
+        self._texture.use(0)
+        self._geometry.render(self._program)
 
     def close(self):
-        if self.cap:
-            try:
-                self.cap.release()
-            except Exception:
-                pass
-        self.cap = None
-        self._pyg_image = None
+        self._stop.set()
+        _open_players.discard(self)
+        if self._decoder:
+            self._decoder.join(timeout=CLOSE_TIMEOUT)
+        with self._release_lock:
+            if self._decoder is not None and not self._decoder_done:
+                # encore dans source.read : le décodeur libérera la source en sortant
+                self._decoder_releases = True
+            elif self.source:
+                _release(self.source)
+        self._decoder = None
+        self.source = None
+        self._texture = None
+        self._geometry = None
+        self._program = None
+        self._buffers = []
         self.finished = True
         if self._audio_player:
             self._audio_player.delete()
+
+
+def _release(source):
+    try:
+        source.release()
+    except Exception:
+        pass
+
+
+@atexit.register
+def _close_open_players():
+    """Sortie du programme pendant une cinématique : on arrête proprement le décodeur."""
+    for player in list(_open_players):
+        player.close()
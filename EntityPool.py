@@ -0,0 +1,77 @@
+# ---------------- Entity pools ----------------
+import arcade
+
+
+class EntityPool:
+    """
+    Réserve d'entités (Sprite) préallouées dans une SpriteList.
+
+    acquire() rend visible une entité libre, release() la cache et la remet
+    dans la réserve : elle garde sa place dans la SpriteList, donc ni
+    allocation Python ni redimensionnement des buffers GPU pendant un combat.
+    La réserve ne grandit que si elle est épuisée ; high_water indique le
+    maximum d'entités actives en même temps, pour régler capacity.
+    """
+    def __init__(self, factory, capacity: int, sprite_list: arcade.SpriteList | None = None):
+        self.factory = factory
+        self.sprite_list = sprite_list if sprite_list is not None else arcade.SpriteList()
+        self.active: list = []
+        self._free: list = []
+        self.high_water = 0
+        self.grown = 0
+        self.reserve(capacity)
+
+    def reserve(self, capacity: int):
+        """Préalloue jusqu'à capacity entités (à appeler une fois les textures chargées)."""
+        while self.capacity < capacity:
+            self._free.append(self._create())
+
+    def _create(self):
+        entity = self.factory()
+        entity.visible = False
+        entity.pool_active = False
+        self.sprite_list.append(entity)
+        return entity
+
+    def __len__(self):
+        return len(self.active)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.active) + len(self._free)
+
+    def acquire(self):
+        if self._free:
+            entity = self._free.pop()
+        else:
+            entity = self._create()
+            self.grown += 1
+        entity.pool_active = True
+        entity.visible = True
+        self.active.append(entity)
+        self.high_water = max(self.high_water, len(self.active))
+        return entity
+
+    def release(self, entity):
+        # sans effet si l'entité est déjà libre (retirée deux fois dans la même frame)
+        if not entity.pool_active:
+            return
+        entity.pool_active = False
+        entity.visible = False
+        self.active.remove(entity)
+        self._free.append(entity)
+
+    def release_all(self):
+        for entity in list(self.active):
+            self.release(entity)
+
+    def draw(self):
+        self.sprite_list.draw()
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self.active),
+            "capacity": self.capacity,
+            "high_water": self.high_water,
+            "grown": self.grown,
+        }
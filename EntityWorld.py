@@ -0,0 +1,502 @@
+# ---------------- Array-backed entities ----------------
+import math
+
+import arcade
+import numpy as np
+
+from Animator import Animator
+
+DEFAULT_CAPACITY = 16
+
+# Comportement d'IA d'une entité
+AI_NONE = 0      # pilotée par les entrées (joueur)
+AI_FOLLOW = 1    # suit sa cible et l'attaque à portée
+
+# État "hurt" après une propulsion : durée, freinage par update, vitesse résiduelle annulée
+HURT_TIME = 0.5
+KNOCKBACK_DECAY = 0.95
+KNOCKBACK_STOP = 0.5
+
+# Clignotement sous le seuil de vie (secondes entre alternances)
+BLINK_INTERVAL = 0.15
+
+# Entités cinématiques : hauteur de marche franchie sans saut (px)
+STEP_UP = 12
+
+
+def _number(value: float):
+    """float -> int s'il est entier : les scènes écrivaient change_x = 0 / 7 en int, et Replay compare repr()."""
+    return int(value) if value.is_integer() else value
+
+
+class Archetype:
+    """
+    Type d'entité : données de configuration copiées dans les tableaux au spawn.
+
+    animations   : fichier de clips (idle / walk / attack) du personnage
+    art_facing   : 1 si l'image regarde à droite, -1 si elle regarde à gauche
+    strike_event : événement de clip qui porte le coup (END_EVENT = fin de l'attaque)
+    follow_range : (|dx|, |dy|) sous lesquels l'IA attaque au lieu d'avancer
+    knockback    : (force, portée, délai) ; sans force le coup touche tout de suite
+    reaction     : délai (s) à portée avant que l'IA lance son attaque
+    kinematic    : déplacée par movement_system (NumPy) au lieu du PhysicsWorld
+    """
+    def __init__(self, animations: str, health: int = 1, scale: float = 1.0, art_facing: int = 1,
+                 attack_damage: int = 1, strike_event: str = "hit", hit_particles: int = 0,
+                 ai: int = AI_NONE, speed: float = 0.0,
+                 follow_range: tuple[float, float] = (0.0, math.inf), cancel_out_of_range: bool = False,
+                 knockback: tuple[float, float, float] | None = None, freeze_when_hurt: bool = False,
+                 blink_below: int = 0, health_bar: tuple[float, float] | None = None,
+                 reaction: float = 0.0, kinematic: bool = False):
+        self.animations = animations
+        self.health = health
+        self.scale = scale
+        self.art_facing = art_facing
+        self.attack_damage = attack_damage
+        self.strike_event = strike_event
+        self.hit_particles = hit_particles
+        self.ai = ai
+        self.speed = speed
+        self.follow_range = follow_range
+        self.cancel_out_of_range = cancel_out_of_range
+        self.knockback = knockback
+        self.freeze_when_hurt = freeze_when_hurt
+        self.blink_below = blink_below
+        self.health_bar = health_bar
+        self.reaction = reaction
+        self.kinematic = kinematic
+
+
+class EntityWorld:
+    """
+    Combattants d'une scène en "structure of arrays" : une entité n'est
+    qu'un index ; position, vitesse, vie, orientation, IA, attaque,
+    propulsion et clignotement sont des tableaux NumPy typés, et chaque
+    système est une passe vectorisée sur toutes les entités.
+
+    Le sprite de l'entité sert de corps au PhysicsWorld (même déplacement
+    qu'arcade) et à l'affichage : pull() recopie positions et vitesses après
+    le step physique, les systèmes travaillent sur les tableaux, push()
+    ne réécrit dans les sprites que ce qui a changé (vitesse, orientation,
+    alpha). Hors de cette passe, set_velocity() écrit les deux.
+
+    Les entités cinématiques (foules) n'ont pas de corps physique : leur
+    position est dans les tableaux, movement_system() les déplace toutes
+    contre les rectangles de set_walls() et push() recopie les positions.
+    Une entité retirée (despawn) est réutilisée par le prochain spawn du
+    même archétype.
+
+    Chaque entité a un acteur dans self.animator, au même index ; les
+    événements de clips (coup porté, fin d'attaque) sont traités par la scène.
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.animator = Animator(capacity)
+        self.count = 0
+        self.sprites: list[arcade.Sprite] = []
+        self.archetypes: list[Archetype] = []
+        self._free: list[int] = []
+        # murs (gauche, bas, droite, haut) des entités cinématiques ; pas un composant
+        self.walls = np.zeros((0, 4), np.float64)
+
+        # composants
+        self.active = np.zeros(capacity, bool)
+        self.pos = np.zeros((capacity, 2), np.float64)
+        self.vel = np.zeros((capacity, 2), np.float64)
+        self.health = np.zeros(capacity, np.int64)
+        self.max_health = np.zeros(capacity, np.int64)
+        self.attack_damage = np.zeros(capacity, np.int64)
+        self.scale = np.ones(capacity, np.float64)
+        self.art_facing = np.ones(capacity, np.int8)
+        self.facing = np.ones(capacity, np.int8)
+        self.target = np.full(capacity, -1, np.int32)
+        # clips idle / walk / attack (identifiants de l'Animator)
+        self.idle_clip = np.zeros(capacity, np.int32)
+        self.walk_clip = np.zeros(capacity, np.int32)
+        self.attack_clip = np.zeros(capacity, np.int32)
+        # déplacement cinématique : boîte autour du centre (gauche, bas, droite, haut)
+        self.kinematic = np.zeros(capacity, bool)
+        self.extent = np.zeros((capacity, 4), np.float64)
+        self.on_ground = np.zeros(capacity, bool)
+        # IA et attaque
+        self.ai = np.zeros(capacity, np.int8)
+        self.speed = np.zeros(capacity, np.float64)
+        self.follow_range = np.zeros((capacity, 2), np.float64)
+        self.cancel_out_of_range = np.zeros(capacity, bool)
+        self.attacking = np.zeros(capacity, bool)
+        self.reaction = np.zeros(capacity, np.float64)
+        self.ready_timer = np.zeros(capacity, np.float64)
+        # coup différé avec propulsion (force, portée, délai) et son chrono
+        self.knockback = np.zeros((capacity, 3), np.float64)
+        self.pending = np.zeros(capacity, bool)
+        self.pending_timer = np.zeros(capacity, np.float64)
+        # propulsé
+        self.hurt = np.zeros(capacity, bool)
+        self.hurt_timer = np.zeros(capacity, np.float64)
+        self.freeze_when_hurt = np.zeros(capacity, bool)
+        # clignotement
+        self.blink_below = np.zeros(capacity, np.int64)
+        self.blink_timer = np.zeros(capacity, np.float64)
+        self.blink_visible = np.ones(capacity, bool)
+
+        # ce qui a été recopié des / vers les sprites
+        self._pulled_vel = np.zeros((capacity, 2), np.float64)
+        self._pushed_pos = np.zeros((capacity, 2), np.float64)
+        self._shown_scale_x = np.zeros(capacity, np.float64)
+        self._shown_alpha = np.full(capacity, 255, np.int16)
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def capacity(self) -> int:
+        return len(self.active)
+
+    # -------------- entités --------------
+    def spawn(self, archetype: Archetype, x: float, y: float, sprite: arcade.Sprite | None = None) -> int:
+        """Crée une entité (et son sprite) à (x, y), ou réutilise une entité retirée ; renvoie son index."""
+        e = self._reusable(archetype) if sprite is None else None
+        if e is not None:
+            sprite = self.sprites[e]
+            sprite.visible = True
+            self.animator.pause(e, False)
+        else:
+            sprite = sprite if sprite is not None else arcade.Sprite()
+            e = self.count
+            if e >= self.capacity:
+                self._grow(e + 1)
+            anim = self.animator.add(sprite, archetype.animations)
+            assert anim == e, "une entité = un acteur de l'Animator, au même index"
+            self.sprites.append(sprite)
+            self.archetypes.append(archetype)
+            self.count = e + 1
+            self.idle_clip[e] = self.clip(e, "idle")
+            self.walk_clip[e] = self.clip(e, "walk")
+            self.attack_clip[e] = self.clip(e, "attack")
+
+        self.active[e] = True
+        self.health[e] = self.max_health[e] = archetype.health
+        self.attack_damage[e] = archetype.attack_damage
+        self.scale[e] = archetype.scale
+        self.art_facing[e] = archetype.art_facing
+        # sprite retourné au départ (scale_x < 0), comme dans les scènes d'origine
+        self.facing[e] = -archetype.art_facing
+        self.target[e] = -1
+        self.ai[e] = archetype.ai
+        self.speed[e] = archetype.speed
+        self.follow_range[e] = archetype.follow_range
+        self.cancel_out_of_range[e] = archetype.cancel_out_of_range
+        self.attacking[e] = False
+        self.reaction[e] = archetype.reaction
+        self.ready_timer[e] = 0
+        self.kinematic[e] = archetype.kinematic
+        self.on_ground[e] = False
+        self.knockback[e] = archetype.knockback or (0.0, 0.0, 0.0)
+        self.pending[e] = False
+        self.pending_timer[e] = 0
+        self.hurt[e] = False
+        self.hurt_timer[e] = 0
+        self.freeze_when_hurt[e] = archetype.freeze_when_hurt
+        self.blink_below[e] = archetype.blink_below
+        self.blink_timer[e] = 0
+        self.blink_visible[e] = True
+
+        self.animator.play(e, "idle")
+        sprite.center_x = x
+        sprite.center_y = y
+        sprite.scale = archetype.scale
+        sprite.scale_x = -abs(sprite.scale_x)
+        self._shown_scale_x[e] = sprite.scale_x
+        self._shown_alpha[e] = sprite.alpha
+        self.pos[e] = self._pushed_pos[e] = x, y
+        self.vel[e] = self._pulled_vel[e] = sprite.change_x, sprite.change_y
+        # boîte de la hit box de l'image idle, symétrique en x (l'orientation change)
+        points = sprite.hit_box.get_adjusted_points()
+        half = (max(p[0] for p in points) - min(p[0] for p in points)) / 2
+        self.extent[e] = -half, min(p[1] for p in points) - y, half, max(p[1] for p in points) - y
+        return e
+
+    def _reusable(self, archetype: Archetype) -> int | None:
+        for i, e in enumerate(self._free):
+            if self.archetypes[e] is archetype:
+                return self._free.pop(i)
+        return None
+
+    def _grow(self, needed: int):
+        old_capacity = self.capacity
+        capacity = max(1, old_capacity)
+        while capacity < needed:
+            capacity *= 2
+        # tous les tableaux de composants (une ligne par entité)
+        for name, value in list(vars(self).items()):
+            if name != "walls" and isinstance(value, np.ndarray) and len(value) == old_capacity:
+                new = np.zeros((capacity,) + value.shape[1:], value.dtype)
+                new[:self.count] = value[:self.count]
+                setattr(self, name, new)
+
+    def despawn(self, e: int):
+        """Retire l'entité des systèmes et cache son sprite ; son index sera réutilisé."""
+        if not self.active[e]:
+            return
+        self.active[e] = False
+        self.attacking[e] = self.pending[e] = self.hurt[e] = False
+        self.animator.stop(e)
+        self.sprites[e].visible = False
+        self._free.append(e)
+
+    def alive(self) -> np.ndarray:
+        """Entités actives avec de la vie."""
+        n = self.count
+        return np.flatnonzero(self.active[:n] & (self.health[:n] > 0))
+
+    def set_walls(self, bounds):
+        """Rectangles (gauche, bas, droite, haut) contre lesquels movement_system déplace les entités cinématiques."""
+        self.walls = np.array(list(bounds), np.float64).reshape(-1, 4)
+
+    def clip(self, e: int, name: str) -> int:
+        return self.animator.clip_id(e, name)
+
+    # -------------- accès hors systèmes --------------
+    def set_velocity(self, e: int, vx=None, vy=None):
+        """Écrit la vitesse dans le tableau et dans le sprite (entrées, fins d'attaque)."""
+        sprite = self.sprites[e]
+        if vx is not None:
+            self.vel[e, 0] = self._pulled_vel[e, 0] = vx
+            sprite.change_x = vx
+        if vy is not None:
+            self.vel[e, 1] = self._pulled_vel[e, 1] = vy
+            sprite.change_y = vy
+
+    def start_attack(self, e: int):
+        self.start_attacks(np.array([e]))
+
+    def start_attacks(self, indices: np.ndarray):
+        self.attacking[indices] = True
+        self.ready_timer[indices] = 0
+        self.animator.play_many(indices, self.attack_clip[indices], restart=True)
+
+    def end_attack(self, e: int):
+        """Fin du clip d'attaque ; l'IA s'arrête (sauf si propulsée) et revient à idle."""
+        self.attacking[e] = False
+        if self.ai[e] != AI_NONE:
+            if not self.hurt[e]:
+                self.set_velocity(e, vx=0)
+            self.animator.play(e, "idle")
+
+    def damage(self, e: int, amount: int) -> bool:
+        """Retire amount de vie ; renvoie True si l'entité est (ou reste) à 0 ou moins."""
+        self.health[e] -= amount
+        return self.health[e] <= 0
+
+    def request_strike(self, e: int) -> bool:
+        """
+        Coup avec propulsion de e sur sa cible : mis en attente (délai de
+        l'archétype) si la cible est à portée, ni déjà propulsée ni visée.
+        """
+        t = self.target[e]
+        in_range = abs(self.sprites[e].center_x - self.sprites[t].center_x) <= self.knockback[e, 1]
+        if in_range and not self.hurt[t] and not self.pending[e]:
+            self.pending[e] = True
+            self.pending_timer[e] = 0
+            return True
+        return False
+
+    # -------------- systèmes --------------
+    def pull(self):
+        """Positions et vitesses des sprites (après le step physique) -> tableaux ; les cinématiques y sont déjà."""
+        n = self.count
+        bodies = np.flatnonzero(~self.kinematic[:n]).tolist()
+        if bodies:
+            sprites = [self.sprites[e] for e in bodies]
+            self.pos[bodies] = [(s.center_x, s.center_y) for s in sprites]
+            self.vel[bodies] = [(s.change_x, s.change_y) for s in sprites]
+        self._pulled_vel[:n] = self.vel[:n]
+
+    def movement_system(self, gravity: float = 1.0):
+        """
+        Déplace toutes les entités cinématiques actives d'un update : gravité,
+        avance en x sauf si un mur plus haut que STEP_UP la bloque, puis pose
+        sur le plus haut dessus de mur sous ses pieds. Pas de plafond (ces
+        entités ne sautent pas) ni de collision entre entités.
+        """
+        n = self.count
+        moving = np.flatnonzero(self.active[:n] & self.kinematic[:n])
+        if len(moving) == 0:
+            return
+        pos, vel, extent = self.pos[moving], self.vel[moving], self.extent[moving]
+        walls = self.walls
+        vel[:, 1] -= gravity
+        bottom = pos[:, 1] + extent[:, 1]
+        top = pos[:, 1] + extent[:, 3]
+
+        def overlap_x(x):
+            # (entités, murs) : la boîte centrée en x chevauche le mur en x
+            return (walls[:, 0] < (x + extent[:, 2])[:, None]) & (walls[:, 2] > (x + extent[:, 0])[:, None])
+
+        x = pos[:, 0] + vel[:, 0]
+        blocking = overlap_x(x) & (walls[:, 3] > (bottom + STEP_UP)[:, None]) & (walls[:, 1] < top[:, None])
+        x = np.where(blocking.any(axis=1), pos[:, 0], x)
+
+        under = overlap_x(x) & (walls[:, 3] <= (bottom + STEP_UP)[:, None])
+        support = np.where(under, walls[:, 3], -np.inf).max(axis=1, initial=-np.inf)
+        new_bottom = bottom + vel[:, 1]
+        landed = new_bottom <= support
+        new_bottom[landed] = support[landed]
+        vel[landed, 1] = 0
+
+        pos[:, 0] = x
+        pos[:, 1] = new_bottom - extent[:, 1]
+        self.pos[moving] = pos
+        self.vel[moving] = vel
+        self.on_ground[moving] = landed
+
+    def strike_system(self, delta_time: float) -> list[tuple[int, int]]:
+        """
+        Coups en attente dont le délai est écoulé : la cible est propulsée
+        (hurt, vitesse ± force) et perd la vie de l'attaquant. Renvoie (attaquant, cible).
+        """
+        n = self.count
+        pending = self.active[:n] & self.pending[:n]
+        if not pending.any():
+            return []
+        self.pending_timer[:n][pending] += delta_time
+        landed = pending & (self.pending_timer[:n] >= self.knockback[:n, 2])
+        hits = []
+        for e in np.flatnonzero(landed).tolist():
+            t = int(self.target[e])
+            self.pending[e] = False
+            self.hurt[t] = True
+            self.hurt_timer[t] = 0
+            direction = -1 if self.pos[t, 0] < self.pos[e, 0] else 1
+            self.vel[t, 0] = self.knockback[e, 0] * direction
+            self.damage(t, int(self.attack_damage[e]))
+            hits.append((e, t))
+        return hits
+
+    def hurt_system(self, delta_time: float) -> np.ndarray:
+        """
+        Recul des entités propulsées ; leur animation reste figée si
+        l'archétype le demande. Renvoie le masque des entités en recul à ce
+        tick (y compris celles qui s'en remettent) : ni IA ni choix de clip.
+        """
+        n = self.count
+        hurt = self.active[:n] & self.hurt[:n]
+        self.animator.paused[:n] = hurt & self.freeze_when_hurt[:n]
+        if not hurt.any():
+            return hurt
+        timer = self.hurt_timer[:n]
+        timer[hurt] += delta_time
+        recovered = hurt & (timer > HURT_TIME)
+        self.hurt[:n][recovered] = False
+        timer[recovered] = 0
+        vx = self.vel[:n, 0]
+        vx[hurt] *= KNOCKBACK_DECAY
+        vx[hurt & (np.abs(vx) < KNOCKBACK_STOP)] = 0
+        return hurt
+
+    def follow_system(self, delta_time: float, busy: np.ndarray) -> np.ndarray:
+        """
+        IA AI_FOLLOW (hors entités busy) : avance vers la cible, attaque à
+        portée (après son délai de réaction), s'arrête si la cible est
+        morte. Renvoie les entités qui attaquent.
+        """
+        n = self.count
+        ai = self.active[:n] & (self.ai[:n] == AI_FOLLOW) & ~busy
+        if not ai.any():
+            return np.zeros(0, np.int64)
+        target = np.maximum(self.target[:n], 0)
+        target_alive = self.health[target] > 0
+        delta = self.pos[target] - self.pos[:n]
+        far = np.abs(delta[:, 0]) > self.follow_range[:n, 0]
+        near_y = np.abs(delta[:, 1]) < self.follow_range[:n, 1]
+        attacking = self.attacking[:n]
+        cancel = self.cancel_out_of_range[:n]
+
+        chase = ai & target_alive & far & (cancel | ~attacking)
+        # à portée : sur place jusqu'à la fin du délai de réaction, puis attaque
+        waiting = ai & target_alive & ~far & near_y & ~attacking
+        ready = self.ready_timer[:n]
+        ready[waiting] += delta_time
+        start = waiting & (ready >= self.reaction[:n])
+        ready[~waiting] = 0
+        # cible morte, ou (sans annulation) attaque en cours : sur place
+        stop = ai & ~target_alive | (ai & ~cancel & attacking)
+        # trop loin pendant l'attaque, ou cible morte : l'attaque est abandonnée
+        abandon = (chase | (stop & cancel)) & attacking
+        idle = np.flatnonzero(abandon & chase)
+        self.animator.play_many(idle, self.idle_clip[idle])
+        attacking[abandon] = False
+
+        vx = self.vel[:n, 0]
+        vx[chase] = np.where(delta[chase, 0] > 0, self.speed[:n][chase], -self.speed[:n][chase])
+        vx[stop | waiting] = 0
+        started = np.flatnonzero(start)
+        self.start_attacks(started)
+        return started
+
+    def animation_system(self, busy: np.ndarray):
+        """Clip idle / walk des entités libres (ni en attaque ni busy), selon leur vitesse."""
+        n = self.count
+        free = self.active[:n] & ~self.attacking[:n] & ~busy
+        indices = np.flatnonzero(free)
+        if len(indices) == 0:
+            return
+        moving = self.vel[indices, 0] != 0
+        self.animator.play_many(indices, np.where(moving, self.walk_clip[indices], self.idle_clip[indices]))
+
+    def facing_system(self):
+        """Chaque entité regarde sa cible."""
+        n = self.count
+        has_target = self.active[:n] & (self.target[:n] >= 0)
+        target = np.maximum(self.target[:n], 0)
+        facing = np.where(self.pos[target, 0] > self.pos[:n, 0], 1, -1).astype(np.int8)
+        self.facing[:n][has_target] = facing[has_target]
+
+    def blink_system(self, delta_time: float):
+        """Clignotement (alpha 0 / 255) des entités vivantes sous leur seuil de vie."""
+        n = self.count
+        health = self.health[:n]
+        blinking = self.active[:n] & (health > 0) & (health < self.blink_below[:n])
+        timer = self.blink_timer[:n]
+        timer[blinking] += delta_time
+        toggle = blinking & (timer > BLINK_INTERVAL)
+        self.blink_visible[:n][toggle] ^= True
+        timer[toggle] = 0
+        timer[~blinking] = 0
+        self.blink_visible[:n][~blinking] = True
+
+    def push(self):
+        """Recopie dans les sprites les positions (cinématiques), vitesses, orientations et alphas qui ont changé."""
+        n = self.count
+        sprites = self.sprites
+        moved = np.flatnonzero(self.kinematic[:n] & (self.pos[:n] != self._pushed_pos[:n]).any(axis=1))
+        for e, position in zip(moved.tolist(), self.pos[moved].tolist()):
+            sprites[e].position = position
+        self._pushed_pos[moved] = self.pos[moved]
+
+        vel, pulled = self.vel[:n], self._pulled_vel[:n]
+        for e in np.flatnonzero((vel != pulled).any(axis=1)).tolist():
+            vx, vy = vel[e].tolist()
+            if vx != pulled[e, 0]:
+                sprites[e].change_x = _number(vx)
+            if vy != pulled[e, 1]:
+                sprites[e].change_y = _number(vy)
+        pulled[:] = vel
+
+        scale_x = self.scale[:n] * self.facing[:n] * self.art_facing[:n]
+        for e in np.flatnonzero(scale_x != self._shown_scale_x[:n]).tolist():
+            sprites[e].scale_x = float(scale_x[e])
+        self._shown_scale_x[:n] = scale_x
+
+        alpha = np.where(self.blink_visible[:n], 255, 0)
+        for e in np.flatnonzero(alpha != self._shown_alpha[:n]).tolist():
+            sprites[e].alpha = int(alpha[e])
+        self._shown_alpha[:n] = alpha
+
+    def events(self, delta_time: float) -> list[tuple[int, str]]:
+        """Avance les clips ; renvoie (entité, événement)."""
+        return self.animator.update(delta_time)
+
+    def is_strike(self, e: int, event: str) -> bool:
+        """L'événement porte le coup de l'attaque en cours de e."""
+        return bool(self.attacking[e]) and event == self.archetypes[e].strike_event
+
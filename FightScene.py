@@ -0,0 +1,398 @@
+# ---------------- Shared fight scene ----------------
+import arcade
+
+from Animator import END_EVENT
+from CollisionBuilder import collision_list
+from EntityWorld import EntityWorld
+from FrameProfiler import profiler
+from HudRenderer import HudRenderer
+from ParticleSystem import ParticleSystem
+from PhysicsWorld import PhysicsWorld
+from RandomStreams import random_streams
+from ScenePreloader import load_tilemap
+from StaticLayerCache import StaticLayerCache
+from TextCache import text_cache
+from TextureCache import texture_cache
+
+SCREEN_WIDTH = 640
+SCREEN_HEIGHT = 480
+
+# Particules
+PARTICLE_DEFAULT_COUNT = 18
+PARTICLE_MIN_SPEED = 1.0
+PARTICLE_MAX_SPEED = 3.0
+PARTICLE_MIN_LIFE = 0.4
+PARTICLE_MAX_LIFE = 1.0
+
+
+class FightScene:
+    """
+    Combat commun aux scènes : carte, sons, dialogues, combattants dans un
+    EntityWorld (composants en tableaux, systèmes vectorisés), physique,
+    barres de vie et particules.
+
+    Une scène n'est qu'une configuration (attributs de classe ci-dessous :
+    carte, archétypes et positions de départ, vitesses du joueur) plus les
+    hooks de ce qui lui est propre (pluie, cooldown, fireballs, écran de fin).
+    """
+    # --- configuration (redéfinie par chaque scène) ---
+    name = 0
+    # Name of the next scene module to load when player dies (optional)
+    next_scene_module = None
+    map_file = None
+    tile_scaling = 1.48
+    # Texture de fond (None : seulement les tuiles)
+    background = None
+    player_archetype = None
+    follower_archetype = None
+    player_start = (0, 0)
+    follower_start = (0, 0)
+    player_speed = 5
+    jump_speed = 20
+
+    dialogues: list[str] = []
+    dialogue_index = 0
+    dialogue_active = True
+
+    def __init__(self):
+        # Visuals
+        self.background_texture = None
+
+        # Sounds
+        self.boss_attack_sound = None
+        self.follower_attack_sound = None
+        self.background_music = None
+
+        # Sprites & lists
+        self.player_list = arcade.SpriteList()
+        self.wall_list = arcade.SpriteList()
+        self.tile_map = None
+        self.static_layers = None
+        self.collision_list = None
+
+        # Combattants : un index d'entité chacun, sprites créés par le monde
+        self.world = EntityWorld()
+        self.player_entity = None
+        self.follower_entity = None
+        self.player_sprite = None
+        self.follower_sprite = None
+
+        # Physics (joueur, héros et murs dans un seul monde)
+        self.physics = None
+
+        # Barres de vie : (entité, index de barre)
+        self.hud = None
+        self.health_bars: list[tuple[int, int]] = []
+
+        # Particules (tableaux NumPy, un seul draw)
+        self.particles = ParticleSystem(
+            arcade.color.ALIZARIN_CRIMSON, diameter=6,
+            min_speed=PARTICLE_MIN_SPEED, max_speed=PARTICLE_MAX_SPEED,
+            min_life=PARTICLE_MIN_LIFE, max_life=PARTICLE_MAX_LIFE,
+            seed=random_streams.next_seed("particles"),
+        )
+
+    # -------------- état des combattants (tableaux du monde) --------------
+    @property
+    def player_health(self) -> int:
+        return int(self.world.health[self.player_entity])
+
+    @player_health.setter
+    def player_health(self, value: int):
+        self.world.health[self.player_entity] = value
+
+    @property
+    def hero_health(self) -> int:
+        return int(self.world.health[self.follower_entity])
+
+    @hero_health.setter
+    def hero_health(self, value: int):
+        self.world.health[self.follower_entity] = value
+
+    @property
+    def player_max_health(self) -> int:
+        return int(self.world.max_health[self.player_entity])
+
+    @property
+    def hero_max_health(self) -> int:
+        return int(self.world.max_health[self.follower_entity])
+
+    @property
+    def attacking(self) -> bool:
+        return bool(self.world.attacking[self.player_entity])
+
+    @property
+    def follower_attacking(self) -> bool:
+        return bool(self.world.attacking[self.follower_entity])
+
+    @property
+    def follower_hurt(self) -> bool:
+        return bool(self.world.hurt[self.follower_entity])
+
+    # -------------- setup --------------
+    def setup(self):
+        for _ in self.setup_stages():
+            pass
+
+    def setup_stages(self):
+        """
+        setup() par étapes : chaque yield rend la main au ScenePreloader, qui
+        répartit ainsi la construction (carte, combattants, physique) sur
+        plusieurs frames.
+        """
+        # Load sounds and music
+        try:
+            self.boss_attack_sound = arcade.load_sound(":resources:sounds/hit5.wav")
+        except Exception:
+            self.boss_attack_sound = None
+        try:
+            self.follower_attack_sound = arcade.load_sound(":resources:sounds/hit4.wav")
+        except Exception:
+            self.follower_attack_sound = None
+        try:
+            self.background_music = arcade.load_sound(":resources:music/funkyrobot.mp3")
+        except Exception:
+            self.background_music = None
+
+        # Background image
+        self.background_texture = None
+        if self.background:
+            try:
+                self.background_texture = texture_cache.load_texture(self.background)
+            except Exception:
+                self.background_texture = None
+
+        yield
+
+        # Tilemap / ground (calque Platforms ou Ground), construite par lots de tuiles
+        try:
+            self.tile_map = load_tilemap(self.map_file, scaling=self.tile_scaling, stages=True)
+            if hasattr(self.tile_map, "build_stages"):
+                yield from self.tile_map.build_stages()
+            self.wall_list = self.tile_map.sprite_lists.get('Platforms') or self.tile_map.sprite_lists.get('Ground') or arcade.SpriteList()
+        except Exception:
+            self.tile_map = None
+            self.wall_list = arcade.SpriteList()
+        # Calques statiques cuits dans une texture au premier draw
+        self.static_layers = StaticLayerCache(self.tile_map)
+        # Collisions : tuiles pleines fusionnées en rectangles (carte compilée)
+        self.collision_list = collision_list(self.tile_map, self.wall_list)
+        yield
+
+        # Combattants : le joueur et le héros (s'il y en a un) se ciblent l'un l'autre
+        world = self.world
+        self.player_entity = self.spawn(self.player_archetype, *self.player_start)
+        self.player_sprite = world.sprites[self.player_entity]
+        if self.follower_archetype is not None:
+            self.follower_entity = self.spawn(self.follower_archetype, *self.follower_start)
+            world.target[self.player_entity] = self.follower_entity
+            world.target[self.follower_entity] = self.player_entity
+            self.follower_sprite = world.sprites[self.follower_entity]
+        yield
+
+        # Physics: un seul monde pour tous les acteurs, murs = self.collision_list
+        try:
+            self.physics = PhysicsWorld(self.collision_list, gravity_constant=1)
+            for e, sprite in enumerate(world.sprites):
+                if not world.kinematic[e]:
+                    self.physics.add(sprite)
+        except Exception:
+            self.physics = None
+        # mêmes murs pour les entités cinématiques (déplacées en NumPy)
+        world.set_walls((w.left, w.bottom, w.right, w.top) for w in self.collision_list)
+        yield
+
+        self.setup_scene()
+
+    def spawn(self, archetype, x, y) -> int:
+        """Entité affichée dans player_list, avec sa barre de vie si l'archétype en a une."""
+        e = self.world.spawn(archetype, x, y)
+        sprite = self.world.sprites[e]
+        self.player_list.append(sprite)
+        if self.physics is not None and not archetype.kinematic and sprite not in self.physics:
+            self.physics.add(sprite)
+        if archetype.health_bar:
+            if self.hud is None:
+                self.hud = HudRenderer()
+            self.health_bars.append((e, self.hud.add(sprite, *archetype.health_bar)))
+        return e
+
+    def setup_scene(self):
+        """Hook : assets et systèmes propres à la scène (après les combattants et la physique)."""
+
+    def spawn_particles(self, x, y, count=PARTICLE_DEFAULT_COUNT):
+        """Crée des particules simples autour de (x,y)."""
+        self.particles.emit(x, y, count)
+
+    # -------------- draw --------------
+    def on_draw(self):
+        profiler.start()
+        # Draw background
+        if self.background_texture:
+            arcade.draw_texture_rect(
+                self.background_texture,
+                arcade.XYWH(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, SCREEN_WIDTH, SCREEN_HEIGHT),
+            )
+        # Draw layers (calques statiques : un seul quad ; wall_list n'est dessiné que s'il n'est pas un calque)
+        self.static_layers.draw(self.wall_list)
+        profiler.lap("draw_tiles")
+        self.draw_background_effects()
+        self.player_list.draw()
+        self.draw_foreground_sprites()
+        profiler.lap("draw_sprites")
+
+        # draw particles (au-dessus des sprites pour effet visible)
+        self.particles.draw()
+        profiler.lap("draw_particles")
+
+        # Health bars (un seul draw pour toutes les barres)
+        if self.hud is not None:
+            world = self.world
+            for e, bar in self.health_bars:
+                self.hud.set_health(bar, int(world.health[e]), int(world.max_health[e]))
+            self.hud.draw()
+        profiler.lap("draw_hud")
+
+        # Display current dialogue (smaller font)
+        if self.dialogue_active:
+            text = self.dialogues[self.dialogue_index]
+            text_cache.draw_text(text, 35, 40, arcade.color.WHITE, 14, width=580, align="left")
+            text_cache.draw_text("Press SPACE to continue...", 35, 10, arcade.color.LIGHT_GRAY, 12)
+        self.draw_overlay()
+        text_cache.draw()
+
+    def draw_background_effects(self):
+        """Hook : dessiné entre les tuiles et les sprites (pluie)."""
+
+    def draw_foreground_sprites(self):
+        """Hook : sprites dessinés au-dessus des combattants (projectiles)."""
+
+    def draw_overlay(self):
+        """Hook : textes d'interface propres à la scène."""
+
+    # -------------- update --------------
+    def on_update(self, delta_time):
+        if self.dialogue_active:
+            return
+        profiler.start()
+        self.update_before_physics(delta_time)
+        if self.physics:
+            self.physics.step()
+        self.world.movement_system(self.physics.gravity_constant if self.physics is not None else 1)
+        profiler.lap("physics")
+        self.update_after_physics(delta_time)
+
+        # Systèmes des combattants (positions lues après la physique)
+        world = self.world
+        world.pull()
+        for attacker, target in world.strike_system(delta_time):
+            self.on_strike_landed(attacker, target)
+        busy = world.hurt_system(delta_time)
+        for e in world.follow_system(delta_time, busy).tolist():
+            self.on_attack_started(e)
+        world.animation_system(busy)
+        self.steer(delta_time)
+        profiler.lap("ai")
+        world.facing_system()
+        world.blink_system(delta_time)
+        world.push()
+        profiler.lap("entities")
+
+        # Tous les clips en une passe ; coups portés et fins d'attaque
+        for e, event in world.events(delta_time):
+            self.on_animation_event(e, event)
+        profiler.lap("animation")
+        # Mettre à jour les particules (position, gravité simple, alpha)
+        self.particles.update(delta_time)
+        profiler.lap("particles")
+
+    def update_before_physics(self, delta_time):
+        """Hook : timers de la scène (cooldown)."""
+
+    def update_after_physics(self, delta_time):
+        """Hook : effets et projectiles de la scène, avant les systèmes des combattants."""
+
+    def steer(self, delta_time):
+        """Hook : ajustements de vitesse propres à la scène, après l'IA."""
+
+    # -------------- combat --------------
+    def on_animation_event(self, e, event):
+        """Événements des clips (voir assets/sprites/*/animations.json)"""
+        world = self.world
+        if world.is_strike(e, event):
+            self.strike(e)
+        if event == END_EVENT and world.attacking[e]:
+            world.end_attack(e)
+
+    def strike(self, e):
+        """Coup de e sur sa cible : propulsion différée si son archétype en a une, sinon dégâts immédiats."""
+        world = self.world
+        t = int(world.target[e])
+        if t < 0 or world.health[t] <= 0:
+            return
+        if world.knockback[e, 0] > 0:
+            world.request_strike(e)
+            return
+        dead = world.damage(t, int(world.attack_damage[e]))
+        self.hit_effect(e, t)
+        if dead:
+            self.kill(t, e)
+
+    def on_strike_landed(self, attacker, target):
+        """Propulsion arrivée (dégâts déjà appliqués par le monde)."""
+        self.hit_effect(attacker, target)
+        if self.world.health[target] <= 0:
+            self.kill(target, attacker)
+
+    def hit_effect(self, attacker, target):
+        count = self.world.archetypes[attacker].hit_particles
+        if count:
+            sprite = self.world.sprites[target]
+            self.spawn_particles(sprite.center_x, sprite.center_y, count=count)
+
+    def kill(self, e, killer):
+        try:
+            self.world.sprites[e].kill()
+        except Exception:
+            pass
+        self.on_death(e, killer)
+
+    def on_death(self, e, killer):
+        """Hook : fin de combat propre à la scène (killer : entité, ou autre cause)."""
+
+    def on_attack_started(self, e):
+        """Une entité IA commence son attaque."""
+        if self.follower_attack_sound:
+            arcade.play_sound(self.follower_attack_sound)
+
+    # -------------- inputs --------------
+    def can_attack(self) -> bool:
+        return True
+
+    def on_player_attack(self):
+        """Hook : le joueur vient de lancer une attaque."""
+
+    def on_key_press(self, key, modifiers):
+        # Advance dialogue with SPACE, start fight after last
+        if self.dialogue_active and key == arcade.key.SPACE:
+            self.dialogue_index += 1
+            if self.dialogue_index >= len(self.dialogues):
+                self.dialogue_active = False
+            return
+        world, player = self.world, self.player_entity
+        if key == arcade.key.UP and self.physics and self.physics.can_jump(self.player_sprite):
+            world.set_velocity(player, vy=self.jump_speed)
+        elif key == arcade.key.LEFT:
+            world.set_velocity(player, vx=-self.player_speed)
+        elif key == arcade.key.RIGHT:
+            world.set_velocity(player, vx=self.player_speed)
+        elif key == arcade.key.SPACE:
+            if not self.attacking and self.player_health > 0 and self.can_attack():
+                world.start_attack(player)
+                if self.boss_attack_sound:
+                    arcade.play_sound(self.boss_attack_sound)
+                self.on_player_attack()
+
+    def on_key_release(self, key, modifiers):
+        if key == arcade.key.LEFT or key == arcade.key.RIGHT:
+            self.world.set_velocity(self.player_entity, vx=0)
@@ -0,0 +1,131 @@
+"""
+Frame packs : cinématiques pré-décodées, lues par mmap sans OpenCV.
+
+Conversion (hors jeu, nécessite OpenCV) :
+
+    python FramePack.py assets/videos/scene1.mp4 assets/videos/scene2.mp4
+    python FramePack.py --zlib assets/videos/*.mp4     # frames légèrement compressées
+
+Chaque vidéo donne un fichier <nom>.framepack à côté du .mp4, à la
+résolution virtuelle du jeu. CutscenePlayer l'utilise automatiquement
+s'il existe, sinon il garde la lecture OpenCV.
+
+Format (little endian) :
+    en-tête   : magic 'HFPK', version u16, largeur u16, hauteur u16,
+                codec u8 (0 brut, 1 zlib), fps f32, nb frames u32, offset index u64
+    frames    : BGR 8 bits, première ligne en haut (comme cv2), brutes ou zlib
+    index     : nb frames x (offset u64, taille u32)
+"""
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+import numpy as np
+
+MAGIC = b"HFPK"
+VERSION = 1
+HEADER = struct.Struct("<4sHHHBfIQ")
+INDEX_ENTRY = struct.Struct("<QI")
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+
+# Résolution virtuelle du jeu (main.VIRTUAL_W / VIRTUAL_H)
+PACK_W, PACK_H = 640, 480
+
+
+def pack_path_for(video_path: str) -> str:
+    return os.path.splitext(video_path)[0] + ".framepack"
+
+
+# ---------------- Conversion ----------------
+def convert(video_path: str, out_path: str | None = None, codec: int = CODEC_RAW,
+            size: tuple[int, int] = (PACK_W, PACK_H)) -> str:
+    import cv2
+
+    out_path = out_path or pack_path_for(video_path)
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise OSError(f"cv2.VideoCapture could not open: {video_path}")
+    fps = cap.get(5) or 30.0  # CAP_PROP_FPS
+
+    index = []
+    with open(out_path, "wb") as f:
+        f.write(b"\0" * HEADER.size)  # réécrit à la fin
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            if (frame.shape[1], frame.shape[0]) != size:
+                frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+            data = np.ascontiguousarray(frame).tobytes()
+            if codec == CODEC_ZLIB:
+                data = zlib.compress(data, 1)
+            index.append((f.tell(), len(data)))
+            f.write(data)
+        index_offset = f.tell()
+        for entry in index:
+            f.write(INDEX_ENTRY.pack(*entry))
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, size[0], size[1], codec, float(fps), len(index), index_offset))
+    cap.release()
+    return out_path
+
+
+# ---------------- Lecture ----------------
+class FramePackReader:
+    """
+    Source de frames pour CutscenePlayer (même interface que la source OpenCV).
+    Les frames brutes sont des vues numpy sur le mmap : aucune copie avant l'upload GPU.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        # ACCESS_COPY : vue modifiable (exigée par Texture2D.write) sans toucher au fichier
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, version, self.width, self.height, self.codec, self.fps, self.frame_count, index_offset = \
+            HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.release()
+            raise ValueError(f"Not a frame pack (v{VERSION}): {path}")
+        self._index = np.frombuffer(self._mm, dtype=np.dtype([("offset", "<u8"), ("size", "<u4")]),
+                                    count=self.frame_count, offset=index_offset)
+        self._frame_bytes = self.width * self.height * 3
+        self._next = 0
+
+    def read(self, _buf=None):
+        if self._next >= self.frame_count:
+            return False, None
+        offset, size = self._index[self._next]
+        self._next += 1
+        if self.codec == CODEC_ZLIB:
+            data = bytearray(zlib.decompress(self._mm[offset:offset + size]))
+            return True, np.frombuffer(data, np.uint8).reshape(self.height, self.width, 3)
+        frame = np.frombuffer(self._mm, np.uint8, count=self._frame_bytes, offset=int(offset))
+        return True, frame.reshape(self.height, self.width, 3)
+
+    def seek(self, index: int):
+        self._next = max(0, min(int(index), self.frame_count))
+
+    def release(self):
+        # Les vues numpy encore vivantes empêchent de fermer le mmap : on laisse le GC s'en charger
+        self._index = None
+        try:
+            self._mm.close()
+        except (BufferError, ValueError):
+            pass
+        self._file.close()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    codec = CODEC_RAW
+    if "--zlib" in args:
+        args.remove("--zlib")
+        codec = CODEC_ZLIB
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+    for video in args:
+        print(f"🎞️ {video} -> {convert(video, codec=codec)}")
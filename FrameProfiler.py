@@ -0,0 +1,175 @@
+# ---------------- Frame profiler overlay ----------------
+import time
+
+import arcade
+import numpy as np
+
+# Frames gardées dans les graphes
+HISTORY = 180
+# Hauteur du graphe = 2 frames à 60 Hz
+GRAPH_MAX_MS = 1000 / 30
+# Rafraîchissement des textes de la légende (secondes)
+LEGEND_REFRESH = 0.25
+
+# Ordre d'empilement / de la légende ; les sections inconnues sont ajoutées à la fin
+SECTION_ORDER = [
+    "physics", "ai", "entities", "animation", "particles", "rain", "fireballs",
+    "preload", "draw_tiles", "draw_rain", "draw_sprites", "draw_particles", "draw_hud", "draw_text",
+]
+PALETTE = [
+    arcade.color.RED, arcade.color.ORANGE, arcade.color.YELLOW, arcade.color.ALIZARIN_CRIMSON,
+    arcade.color.SKY_BLUE, arcade.color.FLAME, arcade.color.GRAY, arcade.color.GREEN,
+    arcade.color.CYAN, arcade.color.LIME_GREEN, arcade.color.PINK, arcade.color.VIOLET,
+    arcade.color.WHITE_SMOKE, arcade.color.BROWN, arcade.color.GOLD,
+]
+
+
+def section_color(name: str):
+    index = SECTION_ORDER.index(name) if name in SECTION_ORDER else len(SECTION_ORDER) + sum(map(ord, name))
+    return PALETTE[index % len(PALETTE)]
+
+
+def entity_counts(scene) -> dict:
+    """Nombre de combattants vivants, de particules, de gouttes et de fireballs actives dans une scène."""
+    world = getattr(scene, "world", None)
+    particles = getattr(scene, "particles", None)
+    rain = getattr(scene, "rain", None)
+    rain_pool = getattr(scene, "rain_pool", None)
+    projectiles = getattr(scene, "projectiles", None)
+    return {
+        "fighters": len(world.alive()) if world is not None else 0,
+        "particles": len(particles) if particles is not None else 0,
+        "rain": len(rain) if rain is not None else (len(rain_pool) if rain_pool is not None else 0),
+        "fireballs": len(projectiles) if projectiles is not None else 0,
+    }
+
+
+class FrameProfiler:
+    """
+    Temps par sous-système, frame par frame, affiché en surimpression (F3).
+
+    Les scènes appellent start() au début de on_update / on_draw puis
+    lap("nom") après chaque bloc : le temps écoulé depuis l'appel précédent
+    est compté pour ce bloc. Désactivé, chaque appel ne coûte qu'un test.
+    """
+    def __init__(self, history: int = HISTORY):
+        self.enabled = False
+        self.history = history
+        self._reset()
+        # Légende (arcade.Text), créée au premier draw
+        self._texts: dict[str, arcade.Text] = {}
+        self._legend_time = 0.0
+
+    def _reset(self):
+        self.sections: dict[str, np.ndarray] = {}
+        self.frame_ms = np.zeros(self.history, np.float32)
+        self.frames = 0
+        self.counts: dict[str, int] = {}
+        self._current: dict[str, float] = {}
+        self._lap_time = time.perf_counter()
+        self._last_frame = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self._reset()
+
+    # -------------- mesure --------------
+    def start(self):
+        if self.enabled:
+            self._lap_time = time.perf_counter()
+
+    def lap(self, name: str):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._current[name] = self._current.get(name, 0.0) + (now - self._lap_time)
+        self._lap_time = now
+
+    def end_frame(self, counts: dict | None = None):
+        """Range les temps de la frame écoulée dans l'historique."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        i = self.frames % self.history
+        for name, seconds in self._current.items():
+            if name not in self.sections:
+                self.sections[name] = np.zeros(self.history, np.float32)
+        for name, values in self.sections.items():
+            values[i] = self._current.get(name, 0.0) * 1000
+        self.frame_ms[i] = (now - self._last_frame) * 1000 if self._last_frame else 0.0
+        self._last_frame = now
+        self._current = {}
+        self.counts = counts or {}
+        self.frames += 1
+
+    def ordered_sections(self) -> list[str]:
+        known = [name for name in SECTION_ORDER if name in self.sections]
+        return known + sorted(name for name in self.sections if name not in SECTION_ORDER)
+
+    def averages(self) -> dict[str, float]:
+        n = min(self.frames, self.history)
+        if n == 0:
+            return {}
+        return {name: float(values[:n].mean()) for name, values in self.sections.items()}
+
+    # -------------- affichage --------------
+    def _text(self, key, x, y, color=arcade.color.WHITE):
+        text = self._texts.get(key)
+        if text is None:
+            text = self._texts[key] = arcade.Text("", x, y, color, 10)
+        text.x, text.y = x, y
+        return text
+
+    def draw(self, width: int, height: int):
+        """Dessine la surimpression en coordonnées fenêtre (coin haut gauche)."""
+        if not self.enabled:
+            return
+        names = self.ordered_sections()
+        graph_w, graph_h = 3 * self.history // 2, 120
+        legend_h = 14 * (len(names) + 3)
+        left, top = 10, height - 10
+        bottom = top - graph_h - legend_h
+        arcade.draw_lbwh_rectangle_filled(left - 6, bottom - 6, graph_w + 12, graph_h + legend_h + 12, (0, 0, 0, 170))
+
+        graph_bottom = top - graph_h
+        scale = graph_h / GRAPH_MAX_MS
+        for ms, color in ((1000 / 60, arcade.color.DARK_GREEN), (GRAPH_MAX_MS, arcade.color.DARK_RED)):
+            y = graph_bottom + ms * scale
+            arcade.draw_line(left, y, left + graph_w, y, color, 1)
+
+        # Courbes empilées : chaque section au-dessus des précédentes, la plus ancienne frame à gauche
+        n = min(self.frames, self.history)
+        if n > 1:
+            order = (np.arange(n) + (self.frames - n)) % self.history
+            xs = left + np.arange(n) * (graph_w / (self.history - 1))
+            stacked = np.zeros(n, np.float32)
+            for name in names:
+                stacked += self.sections[name][order]
+                ys = graph_bottom + np.minimum(stacked, GRAPH_MAX_MS) * scale
+                arcade.draw_line_strip(list(zip(xs.tolist(), ys.tolist())), section_color(name), 1)
+            ys = graph_bottom + np.minimum(self.frame_ms[order], GRAPH_MAX_MS) * scale
+            arcade.draw_line_strip(list(zip(xs.tolist(), ys.tolist())), arcade.color.WHITE, 1)
+
+        # Légende : moyenne et max sur l'historique, rafraîchie quelques fois par seconde
+        refresh = time.perf_counter() - self._legend_time > LEGEND_REFRESH
+        if refresh:
+            self._legend_time = time.perf_counter()
+        averages = self.averages()
+        y = graph_bottom - 14
+        lines = [("frame", arcade.color.WHITE,
+                  f"frame {self.frame_ms[:n].mean() if n else 0:5.2f} ms  (max {self.frame_ms[:n].max() if n else 0:5.2f})")]
+        for name in names:
+            lines.append((name, section_color(name),
+                          f"{name:<15}{averages.get(name, 0):6.2f} ms  (max {self.sections[name][:n].max() if n else 0:5.2f})"))
+        lines.append(("counts", arcade.color.LIGHT_GRAY,
+                      "  ".join(f"{name} {value}" for name, value in self.counts.items())))
+        for key, color, label in lines:
+            text = self._text(key, left, y, color)
+            if refresh or not text.text:
+                text.text = label
+            text.draw()
+            y -= 14
+
+
+# Instance unique : les scènes y déclarent leurs sections
+profiler = FrameProfiler()
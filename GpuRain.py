@@ -0,0 +1,152 @@
+# ---------------- GPU rain ----------------
+import math
+
+import arcade
+import numpy as np
+from arcade.gl import BufferDescription
+
+# Chaque goutte ne stocke qu'une graine (x de départ, vitesse, vent, phase) ;
+# sa position est recalculée dans le shader à partir du temps écoulé.
+VERTEX_SHADER = """
+#version 330
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+uniform float time;
+uniform float top;
+uniform float fall;
+uniform float steps_per_second;
+uniform vec2 size;
+in vec2 in_vert;
+in vec4 in_drop;
+out vec2 v_uv;
+void main() {
+    float speed = in_drop.y * steps_per_second;
+    float period = fall / speed;
+    // temps écoulé depuis la dernière réapparition de la goutte en haut
+    float t = fract(time / period + in_drop.w) * period;
+    vec2 pos = vec2(in_drop.x + in_drop.z * steps_per_second * t, top - speed * t);
+    gl_Position = window.projection * window.view * vec4(pos + in_vert * size, 0.0, 1.0);
+    v_uv = in_vert * 2.0;
+}
+"""
+FRAGMENT_SHADER = """
+#version 330
+uniform vec4 color;
+in vec2 v_uv;
+out vec4 out_color;
+void main() {
+    // bords adoucis comme l'ancienne texture soft square
+    float a = (1.0 - v_uv.x * v_uv.x) * (1.0 - v_uv.y * v_uv.y);
+    out_color = vec4(color.rgb, color.a * a);
+}
+"""
+
+# Les vitesses des scènes sont en px par update, à 60 updates par seconde
+STEPS_PER_SECOND = 60
+
+
+class GpuRain:
+    """
+    Pluie simulée entièrement dans le vertex shader.
+
+    Même comportement que les gouttes Sprite : chaque goutte part du haut de
+    la zone, tombe à une vitesse tirée dans [min_speed, max_speed] avec une
+    dérive horizontale wind ± wind_jitter, et réapparaît en haut une fois
+    passée sous bottom. Le nombre de gouttes est choisi pour que le débit
+    moyen de réapparition vaille rate gouttes par seconde ; update() ne fait
+    qu'avancer l'horloge, quel que soit ce nombre.
+    """
+    def __init__(self, rate: float, width: float, top: float, bottom: float = -20,
+                 min_speed: float = 3.0, max_speed: float = 7.0,
+                 wind: float = 0.0, wind_jitter: float = 0.5,
+                 color=arcade.color.LIGHT_GRAY, alpha: int = 180,
+                 drop_size: tuple[float, float] = (2, 12), seed=None):
+        self.width = width
+        self.top, self.bottom = top, bottom
+        self.min_speed, self.max_speed = min_speed, max_speed
+        self.wind, self.wind_jitter = wind, wind_jitter
+        rgb = arcade.types.Color.from_iterable(color)
+        self.color = (rgb[0] / 255, rgb[1] / 255, rgb[2] / 255, alpha / 255)
+        self.drop_size = drop_size
+        self.rng = np.random.default_rng(seed)
+        self.time = 0.0
+
+        self.rate = 0.0
+        self.drops = np.zeros((0, 4), np.float32)
+        self.set_rate(rate)
+
+        # GL, créé au premier draw
+        self._program = None
+        self._geometry = None
+        self._drop_buffer = None
+        self._dirty = True
+
+    def __len__(self):
+        return len(self.drops)
+
+    def mean_fall_time(self) -> float:
+        """Durée moyenne (secondes) d'une chute complète, vitesse uniforme dans [min, max]."""
+        lo, hi = self.min_speed, self.max_speed
+        inv_speed = math.log(hi / lo) / (hi - lo) if hi > lo else 1 / lo
+        return (self.top - self.bottom) * inv_speed / STEPS_PER_SECOND
+
+    def set_rate(self, rate: float):
+        """Change le débit (gouttes par seconde) : ne régénère les graines que si besoin."""
+        if rate == self.rate:
+            return
+        self.rate = rate
+        count = max(0, math.ceil(rate * self.mean_fall_time()))
+        old = len(self.drops)
+        if count <= old:
+            self.drops = self.drops[:count]
+        else:
+            rng, n = self.rng, count - old
+            new = np.empty((n, 4), np.float32)
+            new[:, 0] = rng.uniform(0, self.width, n)
+            new[:, 1] = rng.uniform(self.min_speed, self.max_speed, n)
+            new[:, 2] = self.wind + rng.uniform(-self.wind_jitter, self.wind_jitter, n)
+            new[:, 3] = rng.uniform(0, 1, n)  # phase : gouttes déjà réparties sur la hauteur
+            self.drops = np.concatenate([self.drops, new])
+        self._dirty = True
+
+    def update(self, delta_time: float):
+        self.time += delta_time
+
+    # -------------- rendu --------------
+    def _create_gl_objects(self, ctx):
+        self._program = ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+        quad = ctx.buffer(data=np.array([-0.5, 0.5, -0.5, -0.5, 0.5, 0.5, 0.5, -0.5], np.float32))
+        self._drop_buffer = ctx.buffer(reserve=max(16, self.drops.nbytes))
+        self._geometry = ctx.geometry(
+            [
+                BufferDescription(quad, "2f", ["in_vert"]),
+                BufferDescription(self._drop_buffer, "4f", ["in_drop"], instanced=True),
+            ],
+            mode=ctx.TRIANGLE_STRIP,
+        )
+
+    def draw(self):
+        n = len(self.drops)
+        if n == 0:
+            return
+        ctx = arcade.get_window().ctx
+        if self._program is None:
+            self._create_gl_objects(ctx)
+        if self._dirty:
+            # seul envoi de données : quand le nombre de gouttes change
+            if self._drop_buffer.size < self.drops.nbytes:
+                self._drop_buffer.orphan(size=self.drops.nbytes)
+            self._drop_buffer.write(self.drops)
+            self._dirty = False
+
+        program = self._program
+        program["time"] = self.time
+        program["top"] = self.top
+        program["fall"] = self.top - self.bottom
+        program["steps_per_second"] = STEPS_PER_SECOND
+        program["size"] = self.drop_size
+        program["color"] = self.color
+        ctx.enable(ctx.BLEND)
+        self._geometry.render(program, instances=n)
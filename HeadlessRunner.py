@@ -0,0 +1,210 @@
+"""
+Simulation des scènes sans fenêtre : équilibrage et perf sans lancer le jeu.
+
+    python HeadlessRunner.py scene2                      # script "chase", 1 combat
+    python HeadlessRunner.py scene2 --script idle --runs 20 --seed 1
+    python HeadlessRunner.py scene3 --script inputs.json
+
+Aucune arcade.Window n'est ouverte : la carte (collisions) et les frames
+d'animation sont chargées sur CPU, rien n'est envoyé au GPU ni dessiné,
+les sons sont coupés et on_update est appelé à pas fixe (SIM_DT) aussi
+vite que possible, avec des entrées scriptées.
+
+--seed N est la graine maître de RandomStreams (particules, pluie, horde...) :
+le combat i de --runs utilise N + i, deux lancements identiques donnent les
+mêmes combats. Sans --seed, les tirages changent à chaque lancement.
+
+Un script est soit le nom d'une stratégie de SCRIPTS (fonction appelée à
+chaque tick), soit un fichier JSON : liste de [tick, "press"|"release", "NOM_TOUCHE"].
+"""
+import importlib
+import json
+import sys
+import time
+
+import arcade
+
+from FightScene import SCREEN_WIDTH
+from main import SIM_DT
+from RandomStreams import random_streams
+
+# Durée max d'un combat simulé (secondes de jeu)
+DEFAULT_MAX_SECONDS = 300
+# Distance (px) à laquelle la stratégie "chase" attaque
+CHASE_ATTACK_RANGE = 90
+# Stratégie "kite" : ticks de poursuite puis ticks de recul, en boucle
+KITE_CHASE_TICKS = 180
+KITE_RETREAT_TICKS = 90
+# Recul : on fait demi-tour à moins de KITE_EDGE px du bord de l'arène
+KITE_EDGE = 60
+SOUND_ATTRIBUTES = ("boss_attack_sound", "follower_attack_sound", "background_music")
+
+
+# ---------------- Scripts d'entrées ----------------
+def idle_script(scene, tick):
+    """Le joueur ne touche à rien (le héros doit gagner)."""
+    return []
+
+
+def attack_script(scene, tick):
+    """Attaque dès que le cooldown le permet, sans bouger."""
+    if getattr(scene, 'player_can_attack', True) and not scene.attacking:
+        return [("press", arcade.key.SPACE)]
+    return []
+
+
+def chase_script(scene, tick):
+    """Marche vers le héros et attaque à portée."""
+    player, hero = scene.player_sprite, scene.follower_sprite
+    if player is None or hero is None:
+        return []
+    events = []
+    dx = hero.center_x - player.center_x
+    if abs(dx) > CHASE_ATTACK_RANGE / 2:
+        key = arcade.key.RIGHT if dx > 0 else arcade.key.LEFT
+        if (player.change_x > 0) != (dx > 0) or player.change_x == 0:
+            events.append(("press", key))
+    elif player.change_x:
+        events.append(("release", arcade.key.LEFT))
+    if abs(dx) < CHASE_ATTACK_RANGE and getattr(scene, 'player_can_attack', True) and not scene.attacking:
+        events.append(("press", arcade.key.SPACE))
+    return events
+
+
+def kite_script(scene, tick):
+    """
+    Comme "chase", mais recule régulièrement pour sortir de la portée du corps
+    à corps : le héros de scene3 lance alors ses fireballs.
+    """
+    player, hero = scene.player_sprite, scene.follower_sprite
+    if player is None or hero is None:
+        return []
+    phase = tick % (KITE_CHASE_TICKS + KITE_RETREAT_TICKS)
+    if phase < KITE_CHASE_TICKS:
+        if phase == 0:
+            # fin du recul : on relâche la touche avant de repartir vers le héros
+            return [("release", arcade.key.LEFT), ("release", arcade.key.RIGHT)]
+        return chase_script(scene, tick)
+    away = 1 if player.center_x >= hero.center_x else -1
+    if not KITE_EDGE < player.center_x + away * KITE_EDGE < SCREEN_WIDTH - KITE_EDGE:
+        away = -away  # acculé au bord : on repart de l'autre côté
+    key, other = (arcade.key.RIGHT, arcade.key.LEFT) if away > 0 else (arcade.key.LEFT, arcade.key.RIGHT)
+    if phase == KITE_CHASE_TICKS or (player.change_x > 0) != (away > 0) or player.change_x == 0:
+        return [("release", other), ("press", key)]
+    return []
+
+
+SCRIPTS = {
+    "idle": idle_script,
+    "attack": attack_script,
+    "chase": chase_script,
+    "kite": kite_script,
+}
+
+
+def load_script(path):
+    """Fichier JSON [tick, action, touche] -> fonction de script."""
+    with open(path, encoding="utf-8") as f:
+        events = json.load(f)
+    by_tick = {}
+    for tick, action, key in events:
+        by_tick.setdefault(int(tick), []).append((action, getattr(arcade.key, key)))
+    return lambda scene, tick: by_tick.get(tick, [])
+
+
+# ---------------- Runner ----------------
+class HeadlessRunner:
+    """Joue un combat complet d'une scène, sans rendu, et renvoie son issue."""
+    def __init__(self, scene_module: str, script="chase", max_seconds: float = DEFAULT_MAX_SECONDS,
+                 seed=None):
+        self.scene_module = scene_module
+        self.script = SCRIPTS[script] if isinstance(script, str) else script
+        self.max_ticks = int(max_seconds / SIM_DT)
+        self.seed = seed
+        self.scene = None
+
+    def setup(self):
+        if self.seed is not None:
+            random_streams.seed(self.seed)
+        mod = importlib.import_module(self.scene_module)
+        scene = mod.Scene()
+        scene.setup()
+        for name in SOUND_ATTRIBUTES:
+            setattr(scene, name, None)
+        scene.dialogue_active = False
+        self.scene = scene
+        return scene
+
+    @staticmethod
+    def winner(scene):
+        if scene.player_health <= 0:
+            return "hero"
+        if scene.hero_health <= 0:
+            return "player"
+        return None
+
+    def run(self) -> dict:
+        t0 = time.perf_counter()
+        scene = self.setup()
+        t1 = time.perf_counter()
+        tick = 0
+        winner = None
+        while tick < self.max_ticks:
+            for action, key in self.script(scene, tick):
+                if action == "press":
+                    scene.on_key_press(key, 0)
+                else:
+                    scene.on_key_release(key, 0)
+            scene.on_update(SIM_DT)
+            tick += 1
+            winner = self.winner(scene)
+            if winner or getattr(scene, "ending_screen_active", False):
+                break
+        t2 = time.perf_counter()
+        return {
+            "scene": self.scene_module,
+            "winner": winner or "timeout",
+            "ticks": tick,
+            "sim_seconds": round(tick * SIM_DT, 2),
+            "player_health": scene.player_health,
+            "hero_health": scene.hero_health,
+            "setup_seconds": round(t1 - t0, 4),
+            "wall_seconds": round(t2 - t1, 4),
+        }
+
+
+def main(argv):
+    args = list(argv)
+
+    def option(name, default):
+        if name in args:
+            i = args.index(name)
+            value = args[i + 1]
+            del args[i:i + 2]
+            return value
+        return default
+
+    script = option("--script", "chase")
+    runs = int(option("--runs", 1))
+    seed = option("--seed", None)
+    max_seconds = float(option("--max-seconds", DEFAULT_MAX_SECONDS))
+    if not args:
+        print(__doc__)
+        return 1
+    if script not in SCRIPTS:
+        script = load_script(script)
+
+    for scene_module in args:
+        wins = {}
+        for i in range(runs):
+            run_seed = None if seed is None else int(seed) + i
+            result = HeadlessRunner(scene_module, script, max_seconds, run_seed).run()
+            wins[result["winner"]] = wins.get(result["winner"], 0) + 1
+            print(json.dumps(result))
+        if runs > 1:
+            print(f"{scene_module}: {wins}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,128 @@
+"""
+Mode horde : fps soutenus selon la taille de la vague.
+
+    python HordeBenchmark.py --offscreen
+    python HordeBenchmark.py --waves 10,50,100,200,400,800 --ticks 300 --out horde.json
+
+Pour chaque taille, la scène horde est chargée dans MainView avec une
+seule vague de cette taille. Le joueur ne bouge pas et ne perd pas de
+vie : la vague reste entière. Une fois tous les héros apparus puis
+arrivés au contact (WARMUP_TICKS), chaque frame (un update + un draw,
+ctx.finish() compris) est chronométrée pendant --ticks frames.
+
+Résultat (JSON) par taille : héros en jeu, p50/p95/p99/max de update,
+draw et frame en millisecondes, fps_p50 et fps_p95 (fps soutenus :
+1000 / p95 de la frame). sustained_60fps_wave est la plus grande vague
+dont la frame p95 tient dans 1/60 s.
+--offscreen : contexte GL sans fenêtre, comme Benchmark.py.
+"""
+import json
+import os
+import sys
+import time
+
+DEFAULT_WAVES = [10, 25, 50, 100, 200, 400]
+DEFAULT_TICKS = 300
+# Updates après la dernière apparition, le temps que la vague arrive au contact
+WARMUP_TICKS = 240
+# Vie du joueur pendant la mesure (il ne doit pas mourir)
+PLAYER_HEALTH = 10**9
+
+
+class HordeBenchmark:
+    """Une vague de size héros dans MainView ; frames chronométrées une fois la vague au contact."""
+    def __init__(self, window, size: int, ticks: int = DEFAULT_TICKS):
+        self.window = window
+        self.size = size
+        self.ticks = ticks
+
+    def run(self) -> dict:
+        import main
+        from Benchmark import summarize
+        from HeadlessRunner import SOUND_ATTRIBUTES
+
+        view = main.MainView(self.window)
+        self.window.show_view(view)
+        ctx = self.window.ctx
+        view.setup_scene("horde")
+        scene = view.current_scene
+        for name in SOUND_ATTRIBUTES:
+            setattr(scene, name, None)
+        scene.dialogue_active = False
+        scene.waves = (self.size,)
+        world = scene.world
+        world.health[scene.player_entity] = world.max_health[scene.player_entity] = PLAYER_HEALTH
+
+        def frame():
+            t0 = time.perf_counter()
+            scene.on_update(main.SIM_DT)
+            t1 = time.perf_counter()
+            view.on_draw()
+            ctx.finish()  # inclut le temps GPU
+            return t1 - t0, time.perf_counter() - t1
+
+        while scene.wave == 0 or scene.to_spawn:
+            frame()
+        for _ in range(WARMUP_TICKS):
+            frame()
+
+        update_times, draw_times = [], []
+        for _ in range(self.ticks):
+            update, draw = frame()
+            update_times.append(update)
+            draw_times.append(draw)
+        frame_times = [u + d for u, d in zip(update_times, draw_times)]
+
+        result = {"wave": self.size, "heroes": len(scene.hero_ids())}
+        result.update(summarize("update", update_times))
+        result.update(summarize("draw", draw_times))
+        result.update(summarize("frame", frame_times))
+        result["fps_p50"] = round(1000 / result["frame_p50_ms"], 1)
+        result["fps_p95"] = round(1000 / result["frame_p95_ms"], 1)
+        return result
+
+
+def main(argv):
+    args = list(argv)
+
+    def option(name, default):
+        if name in args:
+            i = args.index(name)
+            value = args[i + 1]
+            del args[i:i + 2]
+            return value
+        return default
+
+    def flag(name):
+        if name in args:
+            args.remove(name)
+            return True
+        return False
+
+    if flag("--help"):
+        print(__doc__)
+        return 0
+    if flag("--offscreen"):
+        os.environ["ARCADE_HEADLESS"] = "1"
+    ticks = int(option("--ticks", DEFAULT_TICKS))
+    waves = [int(w) for w in option("--waves", ",".join(map(str, DEFAULT_WAVES))).split(",")]
+    out_path = option("--out", None)
+
+    import arcade
+
+    window = arcade.Window(960, 720, "Horde benchmark", visible=False)
+    results = [HordeBenchmark(window, size, ticks).run() for size in waves]
+    sustained = [r["wave"] for r in results if r["frame_p95_ms"] <= 1000 / 60]
+    report = {"ticks": ticks, "gl_renderer": window.ctx.info.RENDERER,
+              "sustained_60fps_wave": max(sustained, default=0), "waves": results}
+
+    text = json.dumps(report, indent=1)
+    if out_path:
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
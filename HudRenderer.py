@@ -0,0 +1,139 @@
+# ---------------- Batched HUD health bars ----------------
+import arcade
+import numpy as np
+from arcade.gl import BufferDescription
+
+# Une barre = un quad instancié : fond gris et remplissage dans le même fragment shader
+VERTEX_SHADER = """
+#version 330
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+in vec2 in_vert;
+in vec4 in_rect;
+in vec4 in_fill;
+out vec2 v_uv;
+out vec4 v_fill;
+void main() {
+    vec2 world = in_rect.xy + in_vert * in_rect.zw;
+    gl_Position = window.projection * window.view * vec4(world, 0.0, 1.0);
+    v_uv = in_vert;
+    v_fill = in_fill;
+}
+"""
+FRAGMENT_SHADER = """
+#version 330
+uniform vec4 background;
+in vec2 v_uv;
+in vec4 v_fill;
+out vec4 out_color;
+void main() {
+    out_color = v_uv.x < v_fill.x ? vec4(v_fill.yzw, 1.0) : background;
+}
+"""
+
+# Sous ce ratio de vie la barre passe au rouge
+LOW_HEALTH_RATIO = 0.3
+BACKGROUND_COLOR = arcade.color.GRAY
+HIGH_COLOR = arcade.color.GREEN
+LOW_COLOR = arcade.color.RED
+
+
+def _rgb(color) -> tuple[float, float, float]:
+    return tuple(c / 255 for c in arcade.types.Color.from_iterable(color)[:3])
+
+
+class HudRenderer:
+    """
+    Barres de vie de tous les combattants en un seul draw instancié.
+
+    Chaque barre suit un sprite : (x - largeur/2, y + hauteur du sprite/4),
+    comme les anciens draw_lbwh_rectangle_filled. Les tableaux d'instances
+    restent en place d'une frame à l'autre : set_health() ne recalcule le
+    remplissage et la couleur que si la vie a changé ; les positions et les
+    remplissages sont dans deux buffers GPU réécrits seulement s'ils ont bougé.
+    """
+    def __init__(self):
+        self.sprites: list[arcade.Sprite] = []
+        self.sizes = np.zeros((0, 2), np.float32)
+        # (x, y, largeur, hauteur) et (remplissage, r, g, b) par barre
+        self._rects = np.zeros((0, 4), np.float32)
+        self._fills = np.zeros((0, 4), np.float32)
+        self._health: list[tuple | None] = []
+        self._rects_dirty = self._fills_dirty = True
+
+        # GL, créé au premier draw
+        self._program = None
+        self._geometry = None
+        self._rect_buffer = None
+        self._fill_buffer = None
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def add(self, sprite: arcade.Sprite, width: float, height: float) -> int:
+        """Ajoute une barre au-dessus de sprite ; renvoie son index pour set_health()."""
+        self.sprites.append(sprite)
+        self.sizes = np.vstack([self.sizes, np.array([[width, height]], np.float32)])
+        self._rects = np.vstack([self._rects, np.zeros((1, 4), np.float32)])
+        self._fills = np.vstack([self._fills, np.zeros((1, 4), np.float32)])
+        self._rects[-1, 2:] = self.sizes[-1]
+        self._health.append(None)
+        # le nombre d'instances change : buffers recréés au prochain draw
+        self._geometry = None
+        return len(self.sprites) - 1
+
+    def set_health(self, index: int, health: float, max_health: float):
+        if self._health[index] == (health, max_health):
+            return
+        self._health[index] = (health, max_health)
+        ratio = max(0.0, min(1.0, health / max(1, max_health)))
+        self._fills[index, 0] = ratio
+        self._fills[index, 1:] = _rgb(HIGH_COLOR if ratio > LOW_HEALTH_RATIO else LOW_COLOR)
+        self._fills_dirty = True
+
+    def _update_positions(self):
+        rects = self._rects
+        for i, sprite in enumerate(self.sprites):
+            x = sprite.center_x - self.sizes[i, 0] // 2
+            y = sprite.center_y + sprite.height // 4
+            if rects[i, 0] != x or rects[i, 1] != y:
+                rects[i, 0] = x
+                rects[i, 1] = y
+                self._rects_dirty = True
+
+    # -------------- rendu --------------
+    def _create_gl_objects(self, ctx):
+        if self._program is None:
+            self._program = ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+            self._program["background"] = _rgb(BACKGROUND_COLOR) + (1.0,)
+        quad = ctx.buffer(data=np.array([0, 1, 0, 0, 1, 1, 1, 0], np.float32))
+        self._rect_buffer = ctx.buffer(reserve=max(self._rects.nbytes, 16))
+        self._fill_buffer = ctx.buffer(reserve=max(self._fills.nbytes, 16))
+        self._geometry = ctx.geometry(
+            [
+                BufferDescription(quad, "2f", ["in_vert"]),
+                BufferDescription(self._rect_buffer, "4f", ["in_rect"], instanced=True),
+                BufferDescription(self._fill_buffer, "4f", ["in_fill"], instanced=True),
+            ],
+            mode=ctx.TRIANGLE_STRIP,
+        )
+        self._rects_dirty = self._fills_dirty = True
+
+    def draw(self):
+        n = len(self.sprites)
+        if n == 0:
+            return
+        ctx = arcade.get_window().ctx
+        if self._geometry is None:
+            self._create_gl_objects(ctx)
+        self._update_positions()
+        if self._rects_dirty:
+            self._rect_buffer.write(self._rects)
+            self._rects_dirty = False
+        if self._fills_dirty:
+            self._fill_buffer.write(self._fills)
+            self._fills_dirty = False
+        ctx.enable(ctx.BLEND)
+        self._geometry.render(self._program, instances=n)
@@ -0,0 +1,480 @@
+"""
+Cartes Tiled compilées.
+
+Étape de build (facultative : une carte absente ou périmée est compilée
+au premier chargement) :
+
+    python MapCompiler.py                     # First_Map, Second_Map, Last_Map
+    python MapCompiler.py assets/Tileset/Maps/Second_Map.tmx
+
+Chaque carte devient <carte>.mapc à côté du .tmx : un seul fichier NumPy
+(npz non compressé) qui contient les gid de chaque calque (avec les bits
+de retournement Tiled), les régions de tileset déjà résolues (image,
+rectangle, hit box, boîte de collision de la tuile), les calques objets
+et une signature de chaque source (.tmx, .tsx, images : mtime, taille,
+hash). Pour les calques de collision (CollisionBuilder.COLLISION_LAYERS),
+les tuiles pleines sont déjà fusionnées en rectangles.
+
+Le chargement fait une seule lecture de fichier, vérifie les signatures
+(un stat par source, le hash seulement si le mtime a bougé) puis crée les
+sprites directement, sans XML ni CSV à reparser.
+"""
+import hashlib
+import io
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from CollisionBuilder import COLLISION_LAYERS, merge_rectangles
+from SpriteAtlas import image_digest
+
+COMPILER_VERSION = 2
+COMPILED_SUFFIX = ".mapc"
+
+DEFAULT_MAPS = [
+    "assets/Tileset/Maps/First_Map.tmx",
+    "assets/Tileset/Maps/Second_Map.tmx",
+    "assets/Tileset/Maps/Last_Map.tmx",
+]
+
+# Bits de retournement dans les gid Tiled
+FLIPPED_HORIZONTALLY = 0x80000000
+FLIPPED_VERTICALLY = 0x40000000
+FLIPPED_DIAGONALLY = 0x20000000
+GID_MASK = 0x1FFFFFFF
+# Sprites de tuiles créés entre deux pauses de CompiledTileMap.build_stages (~4 ms)
+BUILD_CHUNK = 32
+
+
+class UnsupportedMap(Exception):
+    """Carte utilisant une fonction Tiled non gérée ici : on garde arcade.load_tilemap."""
+
+
+def compiled_path_for(map_file) -> str:
+    return os.path.splitext(str(map_file))[0] + COMPILED_SUFFIX
+
+
+def _file_digest(path) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def _signature(path) -> list:
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size, _file_digest(path)]
+
+
+def _json_value(value):
+    """Valeurs de propriétés Tiled (Color, Path...) -> JSON."""
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return value
+    if isinstance(value, tuple):
+        return list(value)
+    return str(value)
+
+
+def _properties(properties) -> dict:
+    return {key: _json_value(value) for key, value in (properties or {}).items()}
+
+
+# ---------------- Compilation ----------------
+def _tileset_sources(map_file) -> list[str]:
+    """Fichiers .tsx externes référencés par la carte."""
+    root = ET.parse(map_file).getroot()
+    directory = os.path.dirname(map_file)
+    return [os.path.normpath(os.path.join(directory, ts.get("source")))
+            for ts in root.iter("tileset") if ts.get("source")]
+
+
+def _find_tile(tiled_map, gid):
+    """Même résolution gid -> (tileset, tuile) que arcade.TileMap._get_tile_by_gid."""
+    for firstgid, tileset in tiled_map.tilesets.items():
+        if gid < firstgid:
+            continue
+        if tileset.image is not None and firstgid <= gid < firstgid + tileset.tile_count:
+            tile_id = gid - firstgid
+            tile = (tileset.tiles or {}).get(tile_id)
+            return tileset, tile_id, tile
+        if tileset.image is None and tileset.tiles:
+            tile = tileset.tiles.get(gid - firstgid)
+            if tile is not None:
+                return tileset, tile.id, tile
+    return None
+
+
+def _tile_collision(tile, width, height) -> list | None:
+    """Boîte de collision définie dans le tileset, relative au centre de la tuile (comme arcade)."""
+    import pytiled_parser
+
+    if tile is None or tile.objects is None:
+        return None
+    for obj in tile.objects.tiled_objects:
+        if isinstance(obj, pytiled_parser.tiled_object.Rectangle) and obj.size is not None:
+            sx = obj.coordinates.x - width / 2
+            sy = -(obj.coordinates.y - height / 2)
+            ex = obj.coordinates.x + obj.size.width - width / 2
+            ey = -(obj.coordinates.y + obj.size.height) + height / 2
+            return [[sx, sy], [ex, sy], [ex, ey], [sx, ey]]
+        if isinstance(obj, (pytiled_parser.tiled_object.Polygon, pytiled_parser.tiled_object.Polyline)):
+            points = [[p.x + obj.coordinates.x - width / 2, -(p.y + obj.coordinates.y - height / 2)]
+                      for p in obj.points]
+            if len(points) > 1 and points[0] == points[-1]:
+                points.pop()
+            return points
+        raise UnsupportedMap(f"collision {type(obj).__name__} of tile {tile.id}")
+    return None
+
+
+def _region(tiled_map, gid, map_dir, images, sheets):
+    import arcade
+
+    found = _find_tile(tiled_map, gid)
+    if found is None:
+        raise UnsupportedMap(f"no tile for gid {gid}")
+    tileset, tile_id, tile = found
+    if tile is not None and tile.animation:
+        raise UnsupportedMap(f"animated tile {tile_id} in {tileset.name}")
+
+    if tileset.image is not None:
+        image_path = tileset.image
+        columns = tileset.columns
+        margin, spacing = tileset.margin or 0, tileset.spacing or 0
+        x = margin + (tile_id % columns) * (tileset.tile_width + spacing)
+        y = margin + (tile_id // columns) * (tileset.tile_height + spacing)
+        w, h = tileset.tile_width, tileset.tile_height
+    else:
+        image_path = tile.image
+        x, y, w, h = tile.x, tile.y, tile.width, tile.height
+
+    image_path = os.path.normpath(str(image_path))
+    if image_path not in sheets:
+        from TextureCache import decode_image
+        with open(image_path, 'rb') as f:
+            sheets[image_path] = decode_image(f.read())
+        images.append(image_path)
+    im = sheets[image_path].crop((x, y, x + w, y + h))
+    return {
+        "image": images.index(image_path),
+        "rect": [x, y, w, h],
+        "tile_id": tile_id,
+        "hit_box": [[float(px), float(py)] for px, py in arcade.hitbox.algo_default.calculate(im)],
+        "hash": image_digest(im),
+        "collision": _tile_collision(tile, w, h),
+        "properties": _properties(tile.properties if tile else None),
+        "class": tile.class_ if tile else None,
+    }
+
+
+def _is_full(region, tile_width, tile_height) -> bool:
+    """La hit box de la tuile couvre toute la case de la grille."""
+    w, h = region["rect"][2:]
+    if (w, h) != (tile_width, tile_height) or region["collision"] is not None:
+        return False
+    xs = [p[0] for p in region["hit_box"]]
+    ys = [p[1] for p in region["hit_box"]]
+    return (len(xs) == 4 and min(xs) <= -w / 2 and max(xs) >= w / 2
+            and min(ys) <= -h / 2 and max(ys) >= h / 2)
+
+
+def _collision(gids, regions, tile_width, tile_height):
+    """(rectangles fusionnés des cases pleines, cases (ligne, colonne) à garder telles quelles)."""
+    ids = gids & GID_MASK
+    full_ids = [gid for gid, region in regions.items() if _is_full(region, tile_width, tile_height)]
+    full = np.isin(ids, full_ids)
+    partial = np.argwhere((ids != 0) & ~full).astype(np.int32)
+    return merge_rectangles(full), partial
+
+
+def _object_layer(layer) -> list[dict]:
+    objects = []
+    for obj in layer.tiled_objects:
+        size = getattr(obj, "size", None)
+        points = getattr(obj, "points", None)
+        objects.append({
+            "id": obj.id,
+            "type": type(obj).__name__,
+            "name": obj.name,
+            "class": obj.class_,
+            "x": obj.coordinates.x,
+            "y": obj.coordinates.y,
+            "width": size.width if size else 0,
+            "height": size.height if size else 0,
+            "rotation": obj.rotation,
+            "points": [[p.x, p.y] for p in points] if points else None,
+            "properties": _properties(obj.properties),
+        })
+    return objects
+
+
+def compile_map(map_file, out_path=None) -> str:
+    """Compile un .tmx en .mapc ; lève UnsupportedMap si la carte ne peut pas l'être."""
+    import pytiled_parser
+
+    map_file = os.path.normpath(str(map_file))
+    out_path = out_path or compiled_path_for(map_file)
+    tiled_map = pytiled_parser.parse_map(Path(map_file))
+    if tiled_map.infinite:
+        raise UnsupportedMap("infinite map")
+    map_dir = os.path.dirname(map_file)
+
+    images: list[str] = []
+    sheets: dict = {}
+    regions: dict[int, dict] = {}
+    layers, arrays = [], {}
+    for layer in tiled_map.layers:
+        if isinstance(layer, pytiled_parser.TileLayer):
+            gids = np.asarray(layer.data, dtype=np.uint32)
+            for gid in np.unique(gids & GID_MASK).tolist():
+                if gid and gid not in regions:
+                    regions[gid] = _region(tiled_map, gid, map_dir, images, sheets)
+            if layer.name in COLLISION_LAYERS:
+                rects, partial = _collision(gids, regions, tiled_map.tile_size.width, tiled_map.tile_size.height)
+                arrays[f"rects_{len(layers)}"] = rects
+                arrays[f"partial_{len(layers)}"] = partial
+            arrays[f"layer_{len(layers)}"] = gids
+            layers.append({
+                "kind": "tiles",
+                "name": layer.name,
+                "visible": layer.visible,
+                "opacity": layer.opacity,
+                "tint": list(layer.tint_color) if layer.tint_color else None,
+                "properties": _properties(layer.properties),
+            })
+        elif isinstance(layer, pytiled_parser.ObjectLayer):
+            layers.append({
+                "kind": "objects",
+                "name": layer.name,
+                "visible": layer.visible,
+                "properties": _properties(layer.properties),
+                "objects": _object_layer(layer),
+            })
+        else:
+            raise UnsupportedMap(f"{type(layer).__name__} {layer.name!r}")
+
+    sources = [map_file] + _tileset_sources(map_file) + images
+    meta = {
+        "version": COMPILER_VERSION,
+        "width": tiled_map.map_size.width,
+        "height": tiled_map.map_size.height,
+        "tile_width": tiled_map.tile_size.width,
+        "tile_height": tiled_map.tile_size.height,
+        "properties": _properties(tiled_map.properties),
+        "background_color": list(tiled_map.background_color) if tiled_map.background_color else None,
+        "images": [os.path.relpath(path, map_dir).replace(os.sep, '/') for path in images],
+        "sources": {os.path.relpath(path, map_dir).replace(os.sep, '/'): _signature(path) for path in sources},
+        "layers": layers,
+        "regions": {str(gid): region for gid, region in regions.items()},
+    }
+    arrays["meta"] = np.frombuffer(json.dumps(meta, separators=(",", ":")).encode("utf-8"), np.uint8)
+
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(buffer.getvalue())
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+# ---------------- Lecture ----------------
+class CompiledMap:
+    """Contenu d'un .mapc : métadonnées + tableaux de gid, chargés en une lecture."""
+    def __init__(self, map_file, data: bytes):
+        self.map_file = os.path.normpath(str(map_file))
+        self.map_dir = os.path.dirname(self.map_file)
+        with np.load(io.BytesIO(data)) as npz:
+            self.meta = json.loads(npz["meta"].tobytes().decode("utf-8"))
+            self.layer_data = {key: npz[key] for key in npz.files if key.startswith("layer_")}
+            self.collision_data = {key: npz[key] for key in npz.files if key.startswith(("rects_", "partial_"))}
+        self.regions = {int(gid): region for gid, region in self.meta["regions"].items()}
+
+    def is_current(self) -> bool:
+        if self.meta.get("version") != COMPILER_VERSION:
+            return False
+        for rel, (mtime, size, digest) in self.meta["sources"].items():
+            path = os.path.join(self.map_dir, rel)
+            try:
+                st = os.stat(path)
+            except OSError:
+                return False
+            if st.st_mtime_ns == mtime and st.st_size == size:
+                continue
+            # fichier touché : seul le contenu compte
+            if st.st_size != size or _file_digest(path) != digest:
+                return False
+        return True
+
+    def image_frames(self) -> dict[str, dict]:
+        """Régions par image source, au format des animations de SpriteAtlas (pour TextureCache)."""
+        frames: dict[str, dict] = {}
+        for gid, region in sorted(self.regions.items()):
+            path = os.path.join(self.map_dir, self.meta["images"][region["image"]])
+            frames.setdefault(path, {"frames": [], "gids": []})
+            frames[path]["frames"].append(region)
+            frames[path]["gids"].append(gid)
+        return frames
+
+    def build(self, scaling: float = 1.0, layer_options: dict | None = None,
+              stages: bool = False) -> "CompiledTileMap":
+        """Sprites de la carte ; stages=True : rien n'est créé, voir CompiledTileMap.build_stages."""
+        return CompiledTileMap(self, scaling, layer_options, stages)
+
+
+def read_compiled(map_file) -> CompiledMap | None:
+    """Lit le .mapc d'une carte s'il existe et que ses sources n'ont pas changé."""
+    path = compiled_path_for(map_file)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        compiled = CompiledMap(map_file, data)
+    except (OSError, ValueError, KeyError):
+        return None
+    return compiled if compiled.is_current() else None
+
+
+def load_or_compile(map_file) -> CompiledMap | None:
+    """Carte compilée à jour (recompilée si besoin), ou None si elle n'est pas compilable."""
+    compiled = read_compiled(map_file)
+    if compiled is not None:
+        return compiled
+    try:
+        compile_map(map_file)
+    except UnsupportedMap as e:
+        print(f"⚠️ {map_file} non compilée : {e}")
+        return None
+    return read_compiled(map_file)
+
+
+# ---------------- Construction des sprites ----------------
+def _flip(texture, raw_gid: int):
+    if raw_gid & FLIPPED_DIAGONALLY:
+        texture = texture.flip_diagonally()
+    if raw_gid & FLIPPED_HORIZONTALLY:
+        texture = texture.flip_horizontally()
+    if raw_gid & FLIPPED_VERTICALLY:
+        texture = texture.flip_vertically()
+    return texture
+
+
+def _flip_points(points, raw_gid: int):
+    if raw_gid & FLIPPED_VERTICALLY:
+        points = [(x, -y) for x, y in points]
+    if raw_gid & FLIPPED_HORIZONTALLY:
+        points = [(-x, y) for x, y in points]
+    if raw_gid & FLIPPED_DIAGONALLY:
+        points = [(y, x) for x, y in points]
+    return points
+
+
+class CompiledTileMap:
+    """
+    Remplace arcade.TileMap pour une carte compilée : mêmes attributs
+    (sprite_lists, object_lists, width, height, tile_width, tile_height,
+    scaling, properties) et mêmes positions / textures / hit boxes de sprites.
+    Les objets des calques objets sont des dicts (voir _object_layer).
+    collision : nom de calque -> (rectangles fusionnés, cases partielles),
+    utilisé par CollisionBuilder.collision_list.
+
+    Avec stages=True, les sprites ne sont créés que par build_stages(), par
+    lots de BUILD_CHUNK (préchargement réparti sur plusieurs frames).
+    """
+    def __init__(self, compiled: CompiledMap, scaling: float = 1.0, layer_options: dict | None = None,
+                 stages: bool = False):
+        import arcade
+
+        meta = compiled.meta
+        self.compiled = compiled
+        self.width, self.height = meta["width"], meta["height"]
+        self.tile_width, self.tile_height = meta["tile_width"], meta["tile_height"]
+        self.scaling = scaling
+        self.properties = meta["properties"]
+        self.background_color = meta["background_color"]
+        self.sprite_lists: dict[str, arcade.SpriteList] = OrderedDict()
+        self.object_lists: dict[str, list[dict]] = OrderedDict()
+        self.collision: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self.layer_options = layer_options or {}
+        if not stages:
+            for _ in self.build_stages():
+                pass
+
+    def build_stages(self, chunk: int = BUILD_CHUNK):
+        """Crée les sprites des calques ; rend la main (yield) tous les chunk sprites."""
+        import arcade
+        from TextureCache import texture_cache
+
+        compiled, meta, scaling = self.compiled, self.compiled.meta, self.scaling
+        textures = {}
+        for image_path, anim in compiled.image_frames().items():
+            for gid, texture in zip(anim["gids"], texture_cache.load_atlas_frames(image_path, anim)):
+                textures[gid] = texture
+
+        yield
+        layer_options = self.layer_options
+        built = 0
+        step_x, step_y = self.tile_width * scaling, self.tile_height * scaling
+        for i, layer in enumerate(meta["layers"]):
+            if layer["kind"] == "objects":
+                self.object_lists[layer["name"]] = layer["objects"]
+                continue
+            options = layer_options.get(layer["name"], {})
+            sprite_list = arcade.SpriteList(use_spatial_hash=options.get("use_spatial_hash", False))
+            gids = compiled.layer_data[f"layer_{i}"]
+            if f"rects_{i}" in compiled.collision_data:
+                self.collision[layer["name"]] = (compiled.collision_data[f"rects_{i}"],
+                                                 compiled.collision_data[f"partial_{i}"])
+            rows, cols = np.nonzero(gids)
+            flipped = {}
+            for row, col, raw in zip(rows.tolist(), cols.tolist(), gids[rows, cols].tolist()):
+                gid = raw & GID_MASK
+                region = compiled.regions[gid]
+                texture = textures[gid]
+                if raw != gid:
+                    texture = flipped.get(raw) or flipped.setdefault(raw, _flip(texture, raw))
+                sprite = arcade.Sprite(texture, scale=scaling)
+                sprite.center_x = col * step_x + sprite.width / 2
+                sprite.center_y = (self.height - row - 1) * step_y + sprite.height / 2
+                if region["properties"]:
+                    sprite.properties.update(region["properties"])
+                if region["class"]:
+                    sprite.properties["class"] = region["class"]
+                sprite.properties["tile_id"] = region["tile_id"]
+                if region["collision"]:
+                    sprite.hit_box = arcade.hitbox.RotatableHitBox(
+                        _flip_points(region["collision"], raw),
+                        position=sprite.position, angle=sprite.angle, scale=sprite.scale,
+                    )
+                if layer["tint"]:
+                    sprite.color = arcade.types.Color.from_iterable(layer["tint"])
+                if layer["opacity"]:
+                    sprite.alpha = int(layer["opacity"] * 255)
+                sprite_list.append(sprite)
+                built += 1
+                if built % chunk == 0:
+                    yield
+            sprite_list.visible = layer["visible"]
+            if layer["properties"]:
+                sprite_list.properties = layer["properties"]
+            self.sprite_lists[layer["name"]] = sprite_list
+
+
+def main(argv):
+    for map_file in argv or DEFAULT_MAPS:
+        try:
+            out_path = compile_map(map_file)
+        except UnsupportedMap as e:
+            print(f"⚠️ {map_file} non compilée : {e}")
+            continue
+        compiled = read_compiled(map_file)
+        merged = {key: len(value) for key, value in compiled.collision_data.items() if key.startswith("rects_")}
+        print(f"🗺️ {map_file} -> {out_path} ({os.path.getsize(out_path)} bytes, "
+              f"{len(compiled.layer_data)} layers, {len(compiled.regions)} tiles, collision rects {merged})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
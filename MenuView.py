@@ -2,11 +2,12 @@
 Menu with textured buttons (idle/hover/pressed) + pixel text overlay.
 Arcade 3.3.2 compatible.
 """
-import random
-
 import arcade
 import arcade.gui
 
+from RandomStreams import random_streams
+from TextureCache import load_texture
+
 # --- chemins des sprites ---
 BUTTON_FOLDER = "assets/sprites/Button"
 START_IDLE = f"{BUTTON_FOLDER}/start_idle.png"
@@ -34,23 +35,23 @@ class MenuView(arcade.View):
 
         self.backgrounds = []
         # self.backgrounds.append(arcade.load_texture("assets/backgrounds/bg_1.png"))
-        self.backgrounds.append(arcade.load_texture("assets/backgrounds/bg_2.png"))
+        self.backgrounds.append(load_texture("assets/backgrounds/bg_2.png"))
 
-        self.rnd_bg_index = random.randint(0, len(self.backgrounds)-1)
+        self.rnd_bg_index = random_streams.python("menu").randint(0, len(self.backgrounds)-1)
 
         # textures bouton
-        start_idle = arcade.load_texture(START_IDLE)
-        start_hover = arcade.load_texture(START_HOVER)
-        start_pressed = arcade.load_texture(START_PRESSED)
-        exit_idle = arcade.load_texture(EXIT_IDLE)
-        exit_hover = arcade.load_texture(EXIT_HOVER)
-        exit_pressed = arcade.load_texture(EXIT_PRESSED)
-        options_idle = arcade.load_texture(OPTIONS_IDLE)
-        options_hover = arcade.load_texture(OPTIONS_HOVER)
-        options_pressed = arcade.load_texture(OPTIONS_PRESSED)
+        start_idle = load_texture(START_IDLE)
+        start_hover = load_texture(START_HOVER)
+        start_pressed = load_texture(START_PRESSED)
+        exit_idle = load_texture(EXIT_IDLE)
+        exit_hover = load_texture(EXIT_HOVER)
+        exit_pressed = load_texture(EXIT_PRESSED)
+        options_idle = load_texture(OPTIONS_IDLE)
+        options_hover = load_texture(OPTIONS_HOVER)
+        options_pressed = load_texture(OPTIONS_PRESSED)
         btn_w, btn_h = start_idle.width*0.7, start_idle.height*0.7
 
-        self.keymaps = arcade.load_texture(KEYMAPS)
+        self.keymaps = load_texture(KEYMAPS)
 
         # boutons (Start / Exit)
         self.start_button = arcade.gui.UITextureButton(
@@ -126,10 +127,10 @@ class SubMenu(arcade.gui.UIMouseFilterMixin, arcade.gui.UIAnchorLayout):
     ):
         super().__init__(size_hint=(1, 1))
 
-        back_idle = arcade.load_texture(BACK_IDLE)
-        back_hover = arcade.load_texture(BACK_HOVER)
-        back_pressed = arcade.load_texture(BACK_PRESSED)
-        options_bg = arcade.load_texture(OPTIONS_BACKGROUND)
+        back_idle = load_texture(BACK_IDLE)
+        back_hover = load_texture(BACK_HOVER)
+        back_pressed = load_texture(BACK_PRESSED)
+        options_bg = load_texture(OPTIONS_BACKGROUND)
 
         # Setup frame which will act like the window.
         frame = self.add(arcade.gui.UIAnchorLayout(width=300, height=400, size_hint=None))
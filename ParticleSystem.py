@@ -0,0 +1,166 @@
+# ---------------- Vectorized particles ----------------
+import math
+
+import arcade
+import numpy as np
+from arcade.gl import BufferDescription
+
+# Disque plein instancié : un quad unitaire + un attribut (x, y, taille, alpha) par particule
+VERTEX_SHADER = """
+#version 330
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+in vec2 in_vert;
+in vec4 in_particle;
+out vec2 v_pos;
+out float v_alpha;
+void main() {
+    vec2 world = in_particle.xy + in_vert * in_particle.z;
+    gl_Position = window.projection * window.view * vec4(world, 0.0, 1.0);
+    v_pos = in_vert * 2.0;
+    v_alpha = in_particle.w;
+}
+"""
+FRAGMENT_SHADER = """
+#version 330
+uniform vec4 color;
+in vec2 v_pos;
+in float v_alpha;
+out vec4 out_color;
+void main() {
+    if (dot(v_pos, v_pos) > 1.0) discard;
+    out_color = vec4(color.rgb, color.a * v_alpha);
+}
+"""
+
+DEFAULT_CAPACITY = 256
+
+
+class ParticleSystem:
+    """
+    Particules en "structure of arrays" : positions, vitesses, vie et échelle
+    dans des tableaux NumPy, intégrées et triées en une passe vectorisée,
+    puis dessinées en un seul draw instancié.
+
+    Même comportement que les anciennes particules Sprite : vitesse en px par
+    update, gravité soustraite à vy à chaque update, alpha = vie restante.
+    """
+    def __init__(self, color=arcade.color.ALIZARIN_CRIMSON, diameter: float = 6,
+                 min_speed: float = 1.0, max_speed: float = 3.0,
+                 min_life: float = 0.4, max_life: float = 1.0,
+                 gravity: float = 0.12, spread: float = 6, seed=None,
+                 capacity: int = DEFAULT_CAPACITY):
+        self.color = tuple(c / 255 for c in arcade.types.Color.from_iterable(color))
+        self.diameter = diameter
+        self.min_speed, self.max_speed = min_speed, max_speed
+        self.min_life, self.max_life = min_life, max_life
+        self.gravity = gravity
+        self.spread = spread
+        self.rng = np.random.default_rng(seed)
+
+        # Particules vivantes compactées en tête des tableaux : [0, count)
+        self.count = 0
+        self.high_water = 0
+        self.pos = np.zeros((capacity, 2), np.float32)
+        self.vel = np.zeros((capacity, 2), np.float32)
+        self.life = np.zeros(capacity, np.float32)
+        self.life_max = np.ones(capacity, np.float32)
+        self.scale = np.ones(capacity, np.float32)
+        self._instances = np.zeros((capacity, 4), np.float32)
+
+        # GL, créé au premier draw
+        self._program = None
+        self._geometry = None
+        self._instance_buffer = None
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def capacity(self) -> int:
+        return len(self.life)
+
+    def _grow(self, needed: int):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name in ("pos", "vel", "life", "life_max", "scale", "_instances"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def emit(self, x: float, y: float, count: int):
+        """Crée count particules autour de (x, y) (ancien spawn_particles)."""
+        if count <= 0:
+            return
+        start, end = self.count, self.count + count
+        if end > self.capacity:
+            self._grow(end)
+        rng = self.rng
+        self.pos[start:end, 0] = x + rng.uniform(-self.spread, self.spread, count)
+        self.pos[start:end, 1] = y + rng.uniform(-self.spread, self.spread, count)
+        speed = rng.uniform(self.min_speed, self.max_speed, count)
+        angle = rng.uniform(0, 2 * math.pi, count)
+        self.vel[start:end, 0] = np.cos(angle) * speed
+        self.vel[start:end, 1] = np.sin(angle) * speed * 0.8
+        life = rng.uniform(self.min_life, self.max_life, count)
+        self.life[start:end] = life
+        self.life_max[start:end] = life
+        self.scale[start:end] = rng.uniform(0.6, 1.2, count)
+        self.count = end
+        self.high_water = max(self.high_water, end)
+
+    def update(self, delta_time: float):
+        n = self.count
+        if n == 0:
+            return
+        self.pos[:n] += self.vel[:n]
+        self.vel[:n, 1] -= self.gravity  # légère gravité
+        self.life[:n] -= delta_time
+
+        alive = self.life[:n] > 0
+        kept = int(np.count_nonzero(alive))
+        if kept != n:
+            # compaction : les survivantes restent contiguës
+            for arr in (self.pos, self.vel, self.life, self.life_max, self.scale):
+                arr[:kept] = arr[:n][alive]
+            self.count = kept
+
+    def clear(self):
+        self.count = 0
+
+    # -------------- rendu --------------
+    def _create_gl_objects(self, ctx):
+        self._program = ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+        quad = ctx.buffer(data=np.array([-0.5, 0.5, -0.5, -0.5, 0.5, 0.5, 0.5, -0.5], np.float32))
+        self._instance_buffer = ctx.buffer(reserve=self._instances.nbytes)
+        self._geometry = ctx.geometry(
+            [
+                BufferDescription(quad, "2f", ["in_vert"]),
+                BufferDescription(self._instance_buffer, "4f", ["in_particle"], instanced=True),
+            ],
+            mode=ctx.TRIANGLE_STRIP,
+        )
+
+    def draw(self):
+        n = self.count
+        if n == 0:
+            return
+        ctx = arcade.get_window().ctx
+        if self._program is None:
+            self._create_gl_objects(ctx)
+
+        inst = self._instances
+        inst[:n, 0:2] = self.pos[:n]
+        inst[:n, 2] = self.scale[:n] * self.diameter
+        np.divide(self.life[:n], np.maximum(self.life_max[:n], 0.0001), out=inst[:n, 3])
+        if self._instance_buffer.size < inst.nbytes:
+            self._instance_buffer.orphan(size=inst.nbytes)
+        self._instance_buffer.write(inst[:n])
+
+        self._program["color"] = self.color
+        ctx.enable(ctx.BLEND)
+        self._geometry.render(self._program, instances=n)
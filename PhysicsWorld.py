@@ -0,0 +1,250 @@
+# ---------------- Batched platformer physics ----------------
+import math
+
+import arcade
+import numpy as np
+
+# Taille des cases de la grille de broadphase, en unités monde (~ 3 tuiles)
+CELL_SIZE = 64.0
+# Distance sous les pieds testée par can_jump (comme PhysicsEnginePlatformer)
+JUMP_DISTANCE = 5
+
+
+def _bounds(sprite) -> tuple[float, float, float, float]:
+    """(gauche, bas, droite, haut) de la hit box, en un seul calcul des points."""
+    points = sprite.hit_box.get_adjusted_points()
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+class Body:
+    """État physique d'un acteur du monde."""
+    __slots__ = ("sprite", "on_ground", "candidates", "region")
+
+    def __init__(self, sprite: arcade.Sprite):
+        self.sprite = sprite
+        # Le dernier step s'est terminé posé sur un mur / sol
+        self.on_ground = False
+        # Murs proches pour ce step et zone (gauche, bas, droite, haut) qu'ils couvrent
+        self.candidates: list = []
+        self.region = (0.0, 0.0, 0.0, 0.0)
+
+
+class PhysicsWorld:
+    """
+    Tous les acteurs d'une scène et la géométrie statique du niveau.
+
+    Même déplacement que arcade.PhysicsEnginePlatformer (gravité, sortie de
+    mur, montée des pentes, recherche dichotomique en x), mais pour N
+    acteurs avec une seule broadphase : les murs sont rangés une fois dans
+    une grille uniforme ; à chaque step, la zone balayée de chaque acteur
+    est calculée pour tous en NumPy et ne récupère que les murs des cases
+    qu'elle touche. Les tests de collision du déplacement ne portent que sur
+    ces murs proches : le coût suit acteurs + géométrie proche.
+
+    Pas de rotation ni de plateformes mobiles ; les acteurs ne se bloquent
+    pas entre eux. Appeler rebuild() si les murs changent.
+    """
+    def __init__(self, walls, gravity_constant: float = 1.0, cell_size: float = CELL_SIZE):
+        self.gravity_constant = gravity_constant
+        self.cell_size = cell_size
+        self.walls_source = walls
+        self.bodies: list[Body] = []
+        self._by_sprite: dict[int, Body] = {}
+        self.rebuild()
+
+    # -------------- géométrie statique --------------
+    def rebuild(self):
+        """(Re)construit la grille de broadphase à partir des murs."""
+        walls = self.walls_source
+        if walls is None:
+            walls = []
+        elif isinstance(walls, arcade.SpriteList):
+            walls = [walls]
+        self.walls = [wall for wall_list in walls for wall in wall_list]
+        self.wall_bounds = [(w.left, w.bottom, w.right, w.top) for w in self.walls]
+        self.grid: dict[tuple[int, int], list[int]] = {}
+        for i, (left, bottom, right, top) in enumerate(self.wall_bounds):
+            for cx in range(self._cell(left), self._cell(right) + 1):
+                for cy in range(self._cell(bottom), self._cell(top) + 1):
+                    self.grid.setdefault((cx, cy), []).append(i)
+
+    def _cell(self, value: float) -> int:
+        return math.floor(value / self.cell_size)
+
+    def _query(self, left, bottom, right, top) -> list[int]:
+        """Index des murs dont une case de grille touche la zone, dans l'ordre de la liste de murs."""
+        found = set()
+        for cx in range(self._cell(left), self._cell(right) + 1):
+            for cy in range(self._cell(bottom), self._cell(top) + 1):
+                found.update(self.grid.get((cx, cy), ()))
+        return sorted(found)
+
+    # -------------- acteurs --------------
+    def add(self, sprite: arcade.Sprite) -> Body:
+        body = Body(sprite)
+        self.bodies.append(body)
+        self._by_sprite[id(sprite)] = body
+        return body
+
+    def remove(self, sprite: arcade.Sprite):
+        body = self._by_sprite.pop(id(sprite), None)
+        if body is not None:
+            self.bodies.remove(body)
+
+    def __contains__(self, sprite) -> bool:
+        return id(sprite) in self._by_sprite
+
+    def __len__(self):
+        return len(self.bodies)
+
+    def on_ground(self, sprite: arcade.Sprite) -> bool:
+        """L'acteur a touché le sol en descendant pendant le dernier step."""
+        body = self._by_sprite.get(id(sprite))
+        return body is not None and body.on_ground
+
+    def can_jump(self, sprite: arcade.Sprite, y_distance: float = JUMP_DISTANCE) -> bool:
+        """Un mur sous les pieds à moins de y_distance (même test que PhysicsEnginePlatformer)."""
+        sprite.center_y -= y_distance
+        try:
+            bounds = _bounds(sprite)
+            return bool(self._hits(sprite, bounds, self._query(*bounds)))
+        finally:
+            sprite.center_y += y_distance
+
+    # -------------- collisions --------------
+    def _hits(self, sprite, bounds, candidates) -> list:
+        """Rejet par boîtes englobantes, puis test exact d'arcade (hit boxes) sur le reste."""
+        left, bottom, right, top = bounds
+        hits = []
+        for i in candidates:
+            w_left, w_bottom, w_right, w_top = self.wall_bounds[i]
+            if w_right <= left or w_left >= right or w_top <= bottom or w_bottom >= top:
+                continue
+            wall = self.walls[i]
+            if arcade.check_for_collision(sprite, wall):
+                hits.append(wall)
+        return hits
+
+    def _collide(self, body: Body) -> list:
+        """Murs touchés à la position actuelle ; requête de grille si l'acteur sort de sa zone."""
+        bounds = _bounds(body.sprite)
+        left, bottom, right, top = body.region
+        if bounds[0] >= left and bounds[2] <= right and bounds[1] >= bottom and bounds[3] <= top:
+            return self._hits(body.sprite, bounds, body.candidates)
+        return self._hits(body.sprite, bounds, self._query(*bounds))
+
+    def _broadphase(self):
+        """Zone balayée de chaque acteur pour ce step (vectorisé) puis murs des cases touchées."""
+        bodies = self.bodies
+        bounds = np.array([_bounds(b.sprite) for b in bodies], np.float64).reshape(-1, 4)
+        motion = np.array([(b.sprite.change_x, b.sprite.change_y) for b in bodies], np.float64).reshape(-1, 2)
+        dx = np.abs(motion[:, 0]) + 1.0
+        dy = np.abs(motion[:, 1]) + 1.0
+        # en y : chute ou saut, puis montée de pente d'au plus |change_x|
+        regions = np.stack([
+            bounds[:, 0] - dx,
+            bounds[:, 1] - dy - JUMP_DISTANCE,
+            bounds[:, 2] + dx,
+            bounds[:, 3] + dy + dx,
+        ], axis=1)
+        for body, region in zip(bodies, regions.tolist()):
+            body.region = tuple(region)
+            body.candidates = self._query(*region)
+
+    # -------------- step --------------
+    def step(self):
+        """Avance tous les acteurs d'une frame."""
+        for body in self.bodies:
+            body.sprite.change_y -= self.gravity_constant
+        self._broadphase()
+        for body in self.bodies:
+            self._move(body)
+
+    def _wiggle_until_free(self, body: Body):
+        """Comme arcade : essaie 8 positions autour, à distance 1, 2, 4..."""
+        sprite = body.sprite
+        o_x, o_y = sprite.position
+        distance = 1
+        while True:
+            for x, y in ((o_x, o_y + distance), (o_x, o_y - distance),
+                         (o_x + distance, o_y), (o_x - distance, o_y),
+                         (o_x + distance, o_y + distance), (o_x + distance, o_y - distance),
+                         (o_x - distance, o_y + distance), (o_x - distance, o_y - distance)):
+                sprite.position = x, y
+                if not self._collide(body):
+                    return
+            distance *= 2
+
+    def _move(self, body: Body):
+        """Portage de arcade.physics_engines._move_sprite (ramp_up=True, sans rotation)."""
+        sprite = body.sprite
+        body.on_ground = False
+        if self._collide(body):
+            self._wiggle_until_free(body)
+
+        original_x, original_y = sprite.position
+
+        # --- y
+        sprite.center_y += sprite.change_y
+        hit_list = self._collide(body)
+        if hit_list:
+            if sprite.change_y > 0:
+                while self._collide(body):
+                    sprite.center_y -= 1
+            elif sprite.change_y < 0:
+                for wall in hit_list:
+                    while arcade.check_for_collision(sprite, wall):
+                        sprite.center_y += 0.25
+                    if getattr(wall, "change_x", 0.0) != 0:
+                        sprite.center_x += wall.change_x
+                body.on_ground = True
+            sprite.change_y = min(0.0, getattr(hit_list[0], "change_y", 0.0))
+        sprite.center_y = round(sprite.center_y, 2)
+
+        # --- x (recherche dichotomique de la plus grande avance possible)
+        if sprite.change_x:
+            almost_original_y = sprite.center_y
+            direction = math.copysign(1, sprite.change_x)
+            cur_x_change = abs(sprite.change_x)
+            upper_bound = cur_x_change
+            lower_bound = 0
+            cur_y_change = 0
+
+            exit_loop = False
+            while not exit_loop:
+                sprite.center_x = original_x + cur_x_change * direction
+                collision = self._collide(body)
+                if collision:
+                    # montée de pente
+                    cur_y_change = cur_x_change
+                    sprite.center_y = original_y + cur_y_change
+                    collision = self._collide(body)
+                    if collision:
+                        cur_y_change -= cur_x_change
+                    else:
+                        while not collision and cur_y_change > 0:
+                            cur_y_change -= 1
+                            sprite.center_y = almost_original_y + cur_y_change
+                            collision = self._collide(body)
+                        cur_y_change += 1
+                        collision = []
+
+                    if collision:
+                        upper_bound = cur_x_change - 1
+                        if upper_bound - lower_bound <= 0:
+                            cur_x_change = lower_bound
+                            exit_loop = True
+                        else:
+                            cur_x_change = (upper_bound + lower_bound) // 2
+                    else:
+                        exit_loop = True
+                else:
+                    lower_bound = cur_x_change
+                    if upper_bound - lower_bound <= 0:
+                        exit_loop = True
+                    else:
+                        cur_x_change = (upper_bound + lower_bound) // 2 + (upper_bound + lower_bound) % 2
+
+            sprite.position = original_x + cur_x_change * direction, almost_original_y + cur_y_change
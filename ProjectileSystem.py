@@ -0,0 +1,280 @@
+# ---------------- Vectorized projectiles ----------------
+import math
+
+import arcade
+import numpy as np
+
+DEFAULT_CAPACITY = 64
+# Durée d'une image d'animation (vol et explosion)
+FRAME_TIME = 0.1
+
+# États d'un projectile
+FLYING = 0
+EXPLODING = 1
+
+
+class ProjectileKind:
+    """Type de projectile : textures de vol / d'explosion, échelle, rayon de collision."""
+    def __init__(self, flying_textures, exploding_textures, scale: float = 1.0, radius: float = 8.0):
+        self.flying_textures = list(flying_textures)
+        self.exploding_textures = list(exploding_textures)
+        self.scale = scale
+        self.radius = radius
+
+
+class ProjectileSystem:
+    """
+    Projectiles en "structure of arrays" (comme ParticleSystem) : position,
+    vitesse, état et animation dans des tableaux NumPy, avancés, testés et
+    triés en une passe vectorisée par update.
+
+    La collision est balayée : le segment parcouru pendant la frame est testé
+    contre la boîte englobante de la hit box de chaque cible, élargie du
+    rayon du projectile. Un projectile rapide ne traverse donc plus sa cible
+    entre deux frames ; il explose au point d'entrée et on_hit(cible, x, y)
+    est appelé. Les projectiles en vol qui sortent de bounds sont retirés.
+
+    Les sprites de sprite_list ne servent qu'à l'affichage : le sprite i
+    montre le projectile i ; après chaque update (ou tir), seul ce qui a
+    changé est recopié. La compaction fait changer un sprite de projectile :
+    sprite.serial dit lequel il montre (-1 si caché), pour que
+    l'interpolation de MainView ne glisse pas d'un projectile à l'autre.
+    """
+    def __init__(self, sprite_list: arcade.SpriteList | None = None,
+                 bounds: tuple[float, float, float, float] | None = None,
+                 capacity: int = DEFAULT_CAPACITY):
+        self.sprite_list = sprite_list if sprite_list is not None else arcade.SpriteList()
+        # (gauche, bas, droite, haut) hors de laquelle un projectile en vol disparaît
+        self.bounds = bounds
+        self.kinds: list[ProjectileKind] = []
+        self.targets: list[tuple] = []
+
+        # Projectiles vivants compactés en tête des tableaux : [0, count)
+        self.count = 0
+        self.high_water = 0
+        self.pos = np.zeros((capacity, 2), np.float64)
+        self.vel = np.zeros((capacity, 2), np.float64)
+        self.kind = np.zeros(capacity, np.int32)
+        self.state = np.zeros(capacity, np.int8)
+        self.frame = np.zeros(capacity, np.int32)
+        self.frame_timer = np.zeros(capacity, np.float64)
+        self.angle = np.zeros(capacity, np.float64)
+        # identifiant unique : le sprite d'une case sait quel projectile il montre
+        self.serial = np.zeros(capacity, np.int64)
+        self._next_serial = 1
+
+        # Ce que montre chaque sprite (identifiant, état, image)
+        self._shown = np.full((0, 3), -1, np.int64)
+        self._shown_count = 0
+        self._dirty = False
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def capacity(self) -> int:
+        return len(self.kind)
+
+    # -------------- configuration --------------
+    def add_kind(self, flying_textures, exploding_textures, scale: float = 1.0, radius: float = 8.0) -> int:
+        """Déclare un type de projectile ; renvoie son index pour fire()."""
+        self.kinds.append(ProjectileKind(flying_textures, exploding_textures, scale, radius))
+        return len(self.kinds) - 1
+
+    def add_target(self, sprite: arcade.Sprite, on_hit, kinds=None):
+        """
+        sprite peut être touché par les projectiles (de kinds, ou de tous les types) ;
+        on_hit(sprite, x, y) est appelé à chaque impact.
+        """
+        self.targets.append((sprite, on_hit, None if kinds is None else set(kinds)))
+
+    def remove_target(self, sprite: arcade.Sprite):
+        self.targets = [target for target in self.targets if target[0] is not sprite]
+
+    def reserve(self, capacity: int):
+        """Préalloue tableaux et sprites pour capacity projectiles (textures chargées)."""
+        if capacity > self.capacity:
+            self._grow(capacity)
+        self._reserve_sprites(capacity)
+
+    def _grow(self, needed: int):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name in ("pos", "vel", "kind", "state", "frame", "frame_timer", "angle", "serial"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def _reserve_sprites(self, count: int):
+        while len(self._shown) < count:
+            sprite = arcade.Sprite()
+            sprite.visible = False
+            sprite.serial = -1
+            self.sprite_list.append(sprite)
+            self._shown = np.vstack([self._shown, np.full((1, 3), -1, np.int64)])
+
+    # -------------- tirs --------------
+    def fire(self, kind: int, x: float, y: float, target_x: float, target_y: float, speed: float) -> int:
+        """Tire un projectile de (x, y) vers (target_x, target_y) ; renvoie son index."""
+        dx = target_x - x
+        dy = target_y - y
+        distance = (dx**2 + dy**2)**0.5
+        if distance > 0:
+            return self.fire_velocity(kind, x, y, (dx / distance) * speed, (dy / distance) * speed)
+        return self.fire_velocity(kind, x, y, 0.0, 0.0)
+
+    def fire_velocity(self, kind: int, x: float, y: float, vx: float, vy: float) -> int:
+        """Tire un projectile de vitesse (vx, vy) en px par update, orienté dans sa direction."""
+        i = self.count
+        if i >= self.capacity:
+            self._grow(i + 1)
+        self.pos[i] = x, y
+        self.vel[i] = vx, vy
+        self.kind[i] = kind
+        self.state[i] = FLYING
+        self.frame[i] = 0
+        self.frame_timer[i] = 0
+        # le haut de l'image pointe vers la direction de tir
+        self.angle[i] = math.degrees(math.atan2(vy, vx)) + 90 if (vx or vy) else 0.0
+        self.serial[i] = self._next_serial
+        self._next_serial += 1
+        self.count = i + 1
+        self.high_water = max(self.high_water, self.count)
+        self._dirty = True
+        return i
+
+    def start_explosion(self, i: int):
+        """Démarre l'animation d'explosion"""
+        self.state[i] = EXPLODING
+        self.frame[i] = 0
+        self.frame_timer[i] = 0
+        self.vel[i] = 0
+
+    def clear(self):
+        self.count = 0
+        self._dirty = True
+
+    # -------------- update --------------
+    def _swept_hits(self, start: np.ndarray, move: np.ndarray, flying: np.ndarray):
+        """Première cible touchée par chaque segment start -> start + move : (t, index de cible)."""
+        n = len(start)
+        best_t = np.full(n, np.inf)
+        best_target = np.full(n, -1, np.int32)
+        radius = np.array([kind.radius for kind in self.kinds], np.float64)[self.kind[:n]]
+        for index, (sprite, _, kinds) in enumerate(self.targets):
+            if not sprite.visible or not sprite.sprite_lists:
+                continue
+            candidates = flying if kinds is None else flying & np.isin(self.kind[:n], list(kinds))
+            if not candidates.any():
+                continue
+            points = sprite.hit_box.get_adjusted_points()
+            xs = [p[0] for p in points]
+            ys = [p[1] for p in points]
+            lo = np.stack([min(xs) - radius, min(ys) - radius], axis=1)
+            hi = np.stack([max(xs) + radius, max(ys) + radius], axis=1)
+            # test des dalles : intervalle de t où le segment est dans la boîte, par axe
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t1 = (lo - start) / move
+                t2 = (hi - start) / move
+            still = move == 0
+            inside = (start >= lo) & (start <= hi)
+            t_near = np.where(still, np.where(inside, -np.inf, np.inf), np.minimum(t1, t2))
+            t_far = np.where(still, np.where(inside, np.inf, -np.inf), np.maximum(t1, t2))
+            t_enter = t_near.max(axis=1)
+            t_exit = t_far.min(axis=1)
+            hit = candidates & (t_enter <= t_exit) & (t_exit >= 0) & (t_enter <= 1)
+            t_enter = np.maximum(t_enter, 0)
+            closer = hit & (t_enter < best_t)
+            best_t[closer] = t_enter[closer]
+            best_target[closer] = index
+        return best_t, best_target
+
+    def update(self, delta_time: float):
+        n = self.count
+        if n == 0:
+            if self._dirty:
+                self.sync_sprites()
+            return
+        flying = self.state[:n] == FLYING
+        start = self.pos[:n].copy()
+        move = self.vel[:n].copy()
+        self.pos[:n] += self.vel[:n]
+
+        # impacts : le projectile explose au point d'entrée dans la cible
+        removed = np.zeros(n, bool)
+        if self.targets:
+            t, target = self._swept_hits(start, move, flying)
+            for i in np.flatnonzero(target >= 0).tolist():
+                self.pos[i] = start[i] + move[i] * t[i]
+                self.start_explosion(i)
+                if not self.kinds[self.kind[i]].exploding_textures:
+                    removed[i] = True
+                sprite, on_hit, _ = self.targets[target[i]]
+                on_hit(sprite, float(self.pos[i, 0]), float(self.pos[i, 1]))
+            flying = self.state[:n] == FLYING
+
+        # sortie de l'écran
+        if self.bounds is not None:
+            left, bottom, right, top = self.bounds
+            x, y = self.pos[:n, 0], self.pos[:n, 1]
+            removed |= flying & ((x < left) | (x > right) | (y < bottom) | (y > top))
+
+        # animation : une image toutes les FRAME_TIME secondes
+        self.frame_timer[:n] += delta_time
+        step = self.frame_timer[:n] > FRAME_TIME
+        self.frame_timer[:n][step] = 0
+        self.frame[:n][step] += 1
+        kinds = self.kind[:n]
+        flying_frames = np.array([max(1, len(k.flying_textures)) for k in self.kinds], np.int32)[kinds]
+        exploding_frames = np.array([len(k.exploding_textures) for k in self.kinds], np.int32)[kinds]
+        exploding = self.state[:n] == EXPLODING
+        np.remainder(self.frame[:n], flying_frames, out=self.frame[:n], where=~exploding)
+        removed |= exploding & (self.frame[:n] >= exploding_frames)
+
+        if removed.any():
+            # compaction : les survivants restent contigus, dans l'ordre de tir
+            kept = ~removed
+            count = int(np.count_nonzero(kept))
+            for arr in (self.pos, self.vel, self.kind, self.state, self.frame,
+                        self.frame_timer, self.angle, self.serial):
+                arr[:count] = arr[:n][kept]
+            self.count = count
+        self.sync_sprites()
+
+    # -------------- rendu --------------
+    def sync_sprites(self):
+        """Recopie les projectiles dans les sprites de sprite_list."""
+        n = self.count
+        self._reserve_sprites(n)
+        sprites = self.sprite_list
+        shown = self._shown
+        current = np.stack([self.serial[:n], self.state[:n], self.frame[:n]], axis=1)
+        changed = np.flatnonzero((shown[:n] != current).any(axis=1)).tolist()
+        for i in changed:
+            kind = self.kinds[self.kind[i]]
+            sprite = sprites[i]
+            if shown[i, 0] != current[i, 0]:
+                sprite.scale = kind.scale
+                sprite.angle = float(self.angle[i])
+                sprite.visible = True
+                sprite.serial = int(current[i, 0])
+            textures = kind.flying_textures if self.state[i] == FLYING else kind.exploding_textures
+            if textures:
+                sprite.texture = textures[min(int(self.frame[i]), len(textures) - 1)]
+            shown[i] = current[i]
+        positions = self.pos[:n].tolist()
+        for i in range(n):
+            sprites[i].position = positions[i]
+        for i in range(n, self._shown_count):
+            sprites[i].visible = False
+            sprites[i].serial = -1
+            shown[i] = -1
+        self._shown_count = n
+        self._dirty = False
+
+    def draw(self):
+        if self._dirty:
+            self.sync_sprites()
+        self.sprite_list.draw()
@@ -0,0 +1,52 @@
+# ---------------- Seeded random streams ----------------
+import hashlib
+import os
+import random
+import threading
+
+import numpy as np
+
+
+class RandomStreams:
+    """
+    Un générateur aléatoire par sous-système (particules, pluie, menu...)
+    au lieu du module random global.
+
+    Toutes les graines dérivent d'une graine maître : avec la même graine,
+    chaque sous-système retrouve exactement les mêmes tirages, même si
+    d'autres sous-systèmes tirent plus ou moins de nombres entre-temps.
+    Les graines distribuées sont gardées dans issued pour l'enregistrement
+    des replays.
+    """
+    def __init__(self, master_seed: int | None = None):
+        self._lock = threading.Lock()
+        self.seed(master_seed)
+
+    def seed(self, master_seed: int | None = None):
+        """Réinitialise toutes les séquences ; None tire une graine maître au hasard."""
+        if master_seed is None:
+            master_seed = int.from_bytes(os.urandom(4), "little")
+        with self._lock:
+            self.master_seed = int(master_seed)
+            self._counters: dict[str, int] = {}
+            self.issued: dict[str, list[int]] = {}
+
+    def next_seed(self, name: str) -> int:
+        """Graine du prochain générateur de ce sous-système (chaque scène en crée un nouveau)."""
+        with self._lock:
+            n = self._counters.get(name, 0)
+            self._counters[name] = n + 1
+            digest = hashlib.blake2b(f"{self.master_seed}/{name}/{n}".encode(), digest_size=8).digest()
+            seed = int.from_bytes(digest, "little")
+            self.issued.setdefault(name, []).append(seed)
+            return seed
+
+    def python(self, name: str) -> random.Random:
+        return random.Random(self.next_seed(name))
+
+    def numpy(self, name: str) -> np.random.Generator:
+        return np.random.default_rng(self.next_seed(name))
+
+
+# Instance unique pour tout le processus
+random_streams = RandomStreams()
@@ -0,0 +1,215 @@
+"""
+Enregistrement et rejeu déterministe des parties.
+
+    python main.py --record runs/spike.replay     # jouer normalement, fichier écrit en quittant
+    python main.py --replay runs/spike.replay     # revoir la partie dans le jeu
+    python Replay.py runs/spike.replay --offscreen --out perf.json
+
+Le fichier (JSON gzip) contient la scène de départ, la graine maître et
+les graines de chaque sous-système (RandomStreams), les entrées clavier
+datées en ticks de simulation (MainView avance à pas fixe SIM_DT), et
+une empreinte de l'état tous les CHECKSUM_INTERVAL ticks. Au rejeu, les
+entrées sont réinjectées juste avant le même tick et chaque empreinte
+est recomparée : une divergence est signalée au premier tick concerné.
+
+Replay.py rejoue sans intervention (un pas par frame), vérifie les
+empreintes et mesure on_update / on_draw comme Benchmark.py : un replay
+sert donc aussi de cas de test de performance.
+"""
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from RandomStreams import random_streams
+
+FORMAT_VERSION = 1
+CHECKSUM_INTERVAL = 60
+PRESS, RELEASE = 0, 1
+# Listes de sprites incluses dans l'empreinte de l'état
+CHECKSUM_LISTS = ("player_list", "fireball_list")
+CHECKSUM_FIELDS = ("player_health", "hero_health", "dialogue_index", "dialogue_active", "attacking")
+
+# Enregistreur / lecteur actifs, lus par MainView (un seul module partagé même si main est lancé en script)
+recorder = None
+player = None
+
+
+def state_checksum(scene) -> str:
+    """Empreinte de l'état simulé d'une scène (positions, vie, particules)."""
+    h = hashlib.blake2b(digest_size=8)
+    for name in CHECKSUM_FIELDS:
+        h.update(repr(getattr(scene, name, None)).encode())
+    for name in CHECKSUM_LISTS:
+        for sprite in getattr(scene, name, None) or ():
+            if sprite.visible:
+                h.update(repr((round(sprite.center_x, 3), round(sprite.center_y, 3),
+                               round(sprite.change_x, 3), round(sprite.change_y, 3))).encode())
+    particles = getattr(scene, "particles", None)
+    if particles is not None:
+        h.update(np.ascontiguousarray(particles.pos[:particles.count]).tobytes())
+    return h.hexdigest()
+
+
+class ReplayRecorder:
+    """Note les entrées transmises à la scène et les empreintes d'état."""
+    def __init__(self, path: str):
+        self.path = path
+        self.start_scene = None
+        self.events: list[list] = []
+        self.checksums: list[list] = []
+        self.end_tick = 0
+
+    def scene_started(self, scene_module: str):
+        if self.start_scene is None:
+            self.start_scene = scene_module
+
+    def record(self, tick: int, kind: int, key: int, modifiers: int):
+        self.events.append([tick, kind, key, modifiers])
+
+    def after_step(self, tick: int, scene):
+        self.end_tick = tick + 1
+        if tick % CHECKSUM_INTERVAL == 0:
+            self.checksums.append([tick, state_checksum(scene)])
+
+    def save(self):
+        if self.start_scene is None:
+            return None
+        data = {
+            "version": FORMAT_VERSION,
+            "start_scene": self.start_scene,
+            "master_seed": random_streams.master_seed,
+            "seeds": random_streams.issued,
+            "end_tick": self.end_tick,
+            "events": self.events,
+            "checksums": self.checksums,
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        print(f"💾 Replay saved: {self.path} ({len(self.events)} inputs, {self.end_tick} ticks)")
+        return self.path
+
+
+class ReplayPlayer:
+    """Réinjecte les entrées enregistrées et vérifie les empreintes d'état."""
+    def __init__(self, path: str):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported replay version in {path}")
+        self.path = path
+        self.start_scene = data["start_scene"]
+        self.master_seed = data["master_seed"]
+        self.end_tick = data["end_tick"]
+        self._events: dict[int, list] = {}
+        for tick, kind, key, modifiers in data["events"]:
+            self._events.setdefault(tick, []).append((kind, key, modifiers))
+        self._checksums = dict(data["checksums"])
+        self.checked = 0
+        self.first_divergence = None
+
+    def start(self):
+        """Remet les générateurs aléatoires dans l'état de l'enregistrement."""
+        random_streams.seed(self.master_seed)
+
+    def events_at(self, tick: int) -> list:
+        return self._events.get(tick, [])
+
+    def after_step(self, tick: int, scene):
+        expected = self._checksums.get(tick)
+        if expected is None:
+            return
+        self.checked += 1
+        if self.first_divergence is None and state_checksum(scene) != expected:
+            self.first_divergence = tick
+            print(f"⚠️ Replay diverged at tick {tick}")
+
+
+def start_recording(path: str):
+    global recorder
+    random_streams.seed()
+    recorder = ReplayRecorder(path)
+    return recorder
+
+
+def start_replay(path: str):
+    global player
+    player = ReplayPlayer(path)
+    player.start()
+    return player
+
+
+def finish():
+    """À appeler en quittant le jeu : écrit l'enregistrement en cours."""
+    if recorder is not None:
+        recorder.save()
+
+
+# ---------------- Rejeu automatique (vérification + perf) ----------------
+def main(argv):
+    args = list(argv)
+    out_path = None
+    if "--out" in args:
+        i = args.index("--out")
+        out_path = args[i + 1]
+        del args[i:i + 2]
+    if "--offscreen" in args:
+        args.remove("--offscreen")
+        os.environ["ARCADE_HEADLESS"] = "1"
+    if not args:
+        print(__doc__)
+        return 1
+
+    import arcade
+    import main as game
+    import Replay  # le module importé par main (celui-ci peut être __main__)
+    from Benchmark import summarize
+    from FrameProfiler import entity_counts
+
+    replay = Replay.start_replay(args[0])
+    window = arcade.Window(960, 720, "Replay", visible=False)
+    view = game.MainView(window)
+    window.show_view(view)
+    view.setup_scene(replay.start_scene)
+
+    update_times, draw_times = [], []
+    peaks = {"fighters": 0, "particles": 0, "rain": 0, "fireballs": 0}
+    while view.sim_tick < replay.end_tick:
+        t = time.perf_counter()
+        view.on_update(game.SIM_DT)
+        update_times.append(time.perf_counter() - t)
+        t = time.perf_counter()
+        view.on_draw()
+        window.ctx.finish()
+        draw_times.append(time.perf_counter() - t)
+        if view.current_scene is not None:
+            for name, value in entity_counts(view.current_scene).items():
+                peaks[name] = max(peaks[name], value)
+    if view.video_player:
+        view.stop_video()
+
+    report = {
+        "replay": replay.path,
+        "ticks": view.sim_tick,
+        "frames": len(update_times),
+        "checksums_checked": replay.checked,
+        "first_divergence": replay.first_divergence,
+    }
+    report.update(summarize("update", update_times))
+    report.update(summarize("draw", draw_times))
+    report.update({f"peak_{name}": value for name, value in peaks.items()})
+    text = json.dumps(report, indent=1)
+    if out_path:
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+    return 0 if replay.first_divergence is None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,187 @@
+# ---------------- Background preloading of the next scene ----------------
+import importlib
+import os
+import queue
+import threading
+import time
+
+import arcade
+import pytiled_parser
+
+import MapCompiler
+import SpriteAtlas
+from Animator import animation_folders
+from CollisionBuilder import COLLISION_LAYERS
+from TextureCache import texture_cache
+
+# Temps max (secondes) passé par frame à envoyer des textures au GPU puis à construire la scène
+UPLOAD_BUDGET = 0.004
+
+
+# Cartes déjà lues par le thread de préchargement : chemin absolu -> CompiledMap ou TiledMap
+_parsed_maps: dict[str, object] = {}
+_parsed_maps_lock = threading.Lock()
+
+
+def read_map(map_file):
+    """Carte compilée (MapCompiler) si possible, sinon TMX parsé par pytiled_parser."""
+    compiled = MapCompiler.load_or_compile(map_file)
+    if compiled is not None:
+        return compiled
+    return pytiled_parser.parse_map(arcade.resources.resolve(map_file))
+
+
+def load_tilemap(map_file, scaling=1.0, stages=False):
+    """
+    Remplace arcade.load_tilemap : réutilise la carte déjà lue en arrière-plan
+    s'il y en a une, sinon la lit (version compilée .mapc en priorité).
+    stages=True : une carte compilée est rendue sans ses sprites, à construire
+    avec build_stages() (voir FightScene.setup_stages).
+    """
+    # calques de collision : hash spatial pour que la physique ne teste que les tuiles proches
+    layer_options = {name: {"use_spatial_hash": True} for name in COLLISION_LAYERS}
+    with _parsed_maps_lock:
+        tiled_map = _parsed_maps.pop(os.path.abspath(map_file), None)
+    if tiled_map is None:
+        tiled_map = read_map(map_file)
+    if isinstance(tiled_map, MapCompiler.CompiledMap):
+        return tiled_map.build(scaling=scaling, layer_options=layer_options, stages=stages)
+    return arcade.TileMap(tiled_map=tiled_map, scaling=scaling, layer_options=layer_options)
+
+
+class ScenePreloader:
+    """
+    Prépare la scène suivante pendant le combat / la cinématique en cours.
+
+    - thread de travail : lecture + décodage des PNG (ou des atlas), de la carte
+      compilée (.mapc) et des tuiles de ses tilesets ;
+    - thread principal (step, appelé à chaque frame) : création des textures et
+      envoi au GPU par petits lots, puis construction de la scène quand build
+      est autorisé. La construction suit scene.setup_stages() (carte par lots
+      de tuiles, combattants, physique...) : chaque step en avance les étapes
+      jusqu'à la fin de son budget, sur autant de frames qu'il faut.
+    """
+    def __init__(self, module_name: str):
+        self.module_name = module_name
+        self.module = None
+        self.scene = None
+        self.ready = False
+        self.failed = False
+        self._decoded: queue.Queue = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._worker_done = threading.Event()
+        self._stages = None
+
+    # -------------- worker thread --------------
+    def start(self):
+        try:
+            self.module = importlib.import_module(self.module_name)
+        except Exception as e:
+            print('[ScenePreloader] Failed to import', self.module_name, e)
+            self.failed = True
+            return
+        folders = [value for name, value in vars(self.module).items()
+                   if name.endswith('_FOLDER') and isinstance(value, str)]
+        # dossiers de frames des clips des personnages (fichiers animations.json)
+        for name, value in vars(self.module).items():
+            if name.endswith('_ANIMATIONS') and isinstance(value, str) and os.path.isfile(value):
+                folders += [folder for folder in animation_folders(value) if folder not in folders]
+        map_file = getattr(self.module, 'MAP_FILE', None)
+        # image de fond de la scène (attribut de classe de FightScene)
+        background = getattr(getattr(self.module, 'Scene', None), 'background', None)
+        files = [background] if isinstance(background, str) else []
+        self._worker = threading.Thread(
+            target=self._decode_assets, args=(folders, map_file, files),
+            name=f"preload-{self.module_name}", daemon=True,
+        )
+        self._worker.start()
+
+    def _decode_assets(self, folders, map_file, files=()):
+        try:
+            for path in files:
+                item = texture_cache.decode_file(path) + (None,)
+                if item[2] is not None:
+                    self._decoded.put(item)
+            for folder in folders:
+                packed = SpriteAtlas.find_animation(folder)
+                if packed is not None:
+                    decoded = texture_cache.decode_atlas_frames(*packed)
+                else:
+                    decoded = [texture_cache.decode_file(path) + (None,)
+                               for path in SpriteAtlas.list_frame_files(folder)]
+                for item in decoded:
+                    if item[2] is not None:
+                        self._decoded.put(item)
+            if map_file and os.path.isfile(map_file):
+                tiled_map = read_map(map_file)
+                if isinstance(tiled_map, MapCompiler.CompiledMap):
+                    # tuiles découpées ici, textures créées par step()
+                    for image_path, anim in tiled_map.image_frames().items():
+                        for item in texture_cache.decode_atlas_frames(image_path, anim):
+                            if item[2] is not None:
+                                self._decoded.put(item)
+                with _parsed_maps_lock:
+                    _parsed_maps[os.path.abspath(map_file)] = tiled_map
+        except Exception as e:
+            print('[ScenePreloader] Background decode failed for', self.module_name, e)
+        finally:
+            self._worker_done.set()
+
+    # -------------- main thread --------------
+    def step(self, allow_build: bool = False, budget: float = UPLOAD_BUDGET):
+        """Une tranche de travail sur le thread principal. Renvoie True quand la scène est prête."""
+        if self.ready or self.failed:
+            return self.ready
+        deadline = time.perf_counter() + budget
+        while time.perf_counter() < deadline:
+            try:
+                key, digest, image, hit_box = self._decoded.get_nowait()
+            except queue.Empty:
+                break
+            texture = texture_cache.add_image(key, digest, image, hit_box)
+            self._upload(texture)
+
+        if allow_build and self._worker_done.is_set() and self._decoded.empty():
+            if self._stages is None:
+                self._stages = self._build_stages()
+            # au moins une étape par step, même si les envois ont pris tout le budget
+            while True:
+                try:
+                    next(self._stages)
+                except StopIteration:
+                    break
+                except Exception as e:
+                    print('[ScenePreloader] Failed to build', self.module_name, e)
+                    self.failed = True
+                    break
+                if time.perf_counter() >= deadline:
+                    break
+        return self.ready
+
+    def finish(self):
+        """Termine tout de suite (transition arrivée avant la fin du préchargement)."""
+        if self._worker:
+            self._worker.join()
+        while not self.step(allow_build=True, budget=float('inf')):
+            if self.failed:
+                return None
+        return self.scene
+
+    @staticmethod
+    def _upload(texture):
+        # Envoi immédiat dans l'atlas par défaut plutôt qu'au premier draw
+        try:
+            arcade.get_window().ctx.default_atlas.add(texture)
+        except Exception:
+            pass
+
+    def _build_stages(self):
+        SceneClass = getattr(self.module, 'Scene')
+        scene = SceneClass()
+        yield
+        if hasattr(scene, "setup_stages"):
+            yield from scene.setup_stages()
+        elif hasattr(scene, "setup"):
+            scene.setup()
+        self.scene = scene
+        self.ready = True
@@ -0,0 +1,223 @@
+"""
+Atlas de sprites pré-packés.
+
+Étape de build (à relancer quand les PNG changent) :
+
+    python SpriteAtlas.py
+
+Chaque personnage (assets/sprites/Hero, ...) devient une seule image
+assets/atlases/Hero.png + un manifeste Hero.json qui contient, pour chaque
+animation, l'ordre des frames, leur rectangle dans l'atlas et la hit box
+déjà calculée. TextureCache.load_frames lit l'animation depuis l'atlas (une
+seule lecture de fichier) quand il existe et qu'il est à jour, sinon il
+retombe sur les PNG individuels. Les durées des clips ne sont pas ici : elles
+viennent des animations.json des personnages (voir Animator.py).
+"""
+import hashlib
+import json
+import os
+import sys
+
+from PIL import Image
+
+ATLAS_DIR = "assets/atlases"
+INDEX_FILE = "index.json"
+ATLAS_MAX_WIDTH = 2048
+
+# Dossiers packés par défaut : un atlas par personnage / effet
+DEFAULT_SOURCES = [
+    "assets/sprites/Hero",
+    "assets/sprites/Demon",
+    "assets/sprites/Monster_1",
+    "assets/sprites/Monster_2",
+    "assets/fireballshoot",
+    "assets/fireballexplode",
+]
+
+
+def frame_sort_key(file_name):
+    """Ordre des frames d'une animation : chiffres extraits du nom (Hero_idle_3.png -> 3)."""
+    name = os.path.splitext(file_name)[0]
+    digits = ''.join(filter(str.isdigit, name))
+    return int(digits) if digits != '' else 0
+
+
+def list_frame_files(folder):
+    """Liste triée des chemins .png d'un dossier d'animation."""
+    if not os.path.isdir(folder):
+        return []
+    files = [f for f in os.listdir(folder) if f.endswith('.png')]
+    files.sort(key=frame_sort_key)
+    return [os.path.join(folder, f) for f in files]
+
+
+def image_digest(image) -> str:
+    """Hash des pixels RGBA : même clé pour une frame d'atlas et pour son PNG (voir TextureCache)."""
+    return hashlib.blake2b(image.tobytes(), digest_size=16).hexdigest()
+
+
+def _rel(path):
+    return os.path.relpath(path).replace(os.sep, '/')
+
+
+def _source_signature(files):
+    """(nombre de fichiers, mtime max) : suffit pour savoir si l'atlas est périmé."""
+    mtime = 0
+    for path in files:
+        mtime = max(mtime, os.stat(path).st_mtime_ns)
+    return len(files), mtime
+
+
+# ---------------- Packing ----------------
+def _shelf_pack(sizes, max_width=ATLAS_MAX_WIDTH):
+    """Rangement en étagères : renvoie les positions (x, y) et la taille finale."""
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    positions = [None] * len(sizes)
+    x = y = shelf_h = width = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w > max_width and x > 0:
+            y += shelf_h
+            x = shelf_h = 0
+        positions[i] = (x, y)
+        x += w
+        shelf_h = max(shelf_h, h)
+        width = max(width, x)
+    return positions, (width, y + shelf_h)
+
+
+def _animation_folders(source):
+    """Un dossier contenant des PNG = une animation ; sinon chaque sous-dossier en est une."""
+    if list_frame_files(source):
+        return {os.path.basename(os.path.normpath(source)): source}
+    folders = {}
+    for name in sorted(os.listdir(source)):
+        path = os.path.join(source, name)
+        if list_frame_files(path):
+            folders[name] = path
+    return folders
+
+
+def pack_source(source, out_dir=ATLAS_DIR):
+    """Packe un personnage (ou un dossier d'animation) en un atlas + manifeste."""
+    import arcade  # uniquement pour l'algorithme de hit box par défaut
+
+    name = os.path.basename(os.path.normpath(source))
+    folders = _animation_folders(source)
+    if not folders:
+        return None
+
+    images, frames_meta = [], []
+    for anim, folder in list(folders.items()):
+        try:
+            loaded = [Image.open(path).convert("RGBA") for path in list_frame_files(folder)]
+        except OSError as e:
+            # animation ignorée : elle restera chargée depuis les PNG
+            print(f"⚠️ {folder} non packé : {e}")
+            del folders[anim]
+            continue
+        for path, im in zip(list_frame_files(folder), loaded):
+            images.append(im)
+            frames_meta.append((anim, path))
+    if not images:
+        return None
+
+    positions, size = _shelf_pack([im.size for im in images])
+    atlas = Image.new("RGBA", size, (0, 0, 0, 0))
+
+    animations = {}
+    for anim, folder in folders.items():
+        files = list_frame_files(folder)
+        count, mtime = _source_signature(files)
+        animations[anim] = {
+            "source": _rel(folder),
+            "source_count": count,
+            "source_mtime": mtime,
+            "frames": [],
+        }
+
+    for im, (anim, path), (x, y) in zip(images, frames_meta, positions):
+        atlas.paste(im, (x, y))
+        hit_box = arcade.hitbox.algo_default.calculate(im)
+        animations[anim]["frames"].append({
+            "file": os.path.basename(path),
+            "rect": [x, y, im.width, im.height],
+            "hit_box": [[float(px), float(py)] for px, py in hit_box],
+            "hash": image_digest(im),
+        })
+
+    os.makedirs(out_dir, exist_ok=True)
+    image_path = os.path.join(out_dir, f"{name}.png")
+    atlas.save(image_path, optimize=False)
+    manifest = {
+        "image": os.path.basename(image_path),
+        "size": list(size),
+        "animations": animations,
+    }
+    manifest_path = os.path.join(out_dir, f"{name}.json")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    return manifest_path
+
+
+def build(sources=None, out_dir=ATLAS_DIR):
+    """Packe toutes les sources et écrit l'index dossier -> (atlas, animation)."""
+    index = {}
+    for source in sources or DEFAULT_SOURCES:
+        manifest_path = pack_source(source, out_dir)
+        if manifest_path is None:
+            print(f"⚠️ Aucun PNG dans {source}")
+            continue
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        for anim, data in manifest["animations"].items():
+            index[data["source"]] = [os.path.basename(manifest_path), anim]
+        print(f"📦 {source} -> {manifest_path} ({len(manifest['animations'])} animations)")
+    with open(os.path.join(out_dir, INDEX_FILE), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+    _index_cache.clear()
+    _manifest_cache.clear()
+
+
+# ---------------- Lecture ----------------
+_index_cache = {}
+_manifest_cache = {}
+
+
+def _load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def find_animation(folder, atlas_dir=ATLAS_DIR):
+    """
+    Renvoie (chemin de l'image atlas, données de l'animation) si le dossier
+    a été packé et que l'atlas est à jour, sinon None.
+    """
+    index_path = os.path.join(atlas_dir, INDEX_FILE)
+    if atlas_dir not in _index_cache:
+        _index_cache[atlas_dir] = _load_json(index_path) if os.path.isfile(index_path) else {}
+    entry = _index_cache[atlas_dir].get(_rel(folder))
+    if entry is None:
+        return None
+
+    manifest_path = os.path.join(atlas_dir, entry[0])
+    if manifest_path not in _manifest_cache:
+        try:
+            _manifest_cache[manifest_path] = _load_json(manifest_path)
+        except (OSError, ValueError):
+            return None
+    manifest = _manifest_cache[manifest_path]
+    anim = manifest["animations"].get(entry[1])
+    if anim is None:
+        return None
+
+    # Atlas périmé si les PNG sources ont changé depuis le packing
+    count, mtime = _source_signature(list_frame_files(folder))
+    if count != anim["source_count"] or mtime > anim["source_mtime"]:
+        return None
+    return os.path.join(atlas_dir, manifest["image"]), anim
+
+
+if __name__ == "__main__":
+    build(sys.argv[1:] or None)
@@ -0,0 +1,158 @@
+# ---------------- Baked static tile layers ----------------
+import arcade
+import numpy as np
+from arcade import gl
+from arcade.types import LBWH, LRBT
+
+# Quad texturé couvrant la carte, en coordonnées monde
+VERTEX_SHADER = """
+#version 330
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+uniform vec4 rect;
+in vec2 in_vert;
+out vec2 v_uv;
+void main() {
+    gl_Position = window.projection * window.view * vec4(rect.xy + in_vert * rect.zw, 0.0, 1.0);
+    v_uv = in_vert;
+}
+"""
+FRAGMENT_SHADER = """
+#version 330
+uniform sampler2D layers;
+in vec2 v_uv;
+out vec4 out_color;
+void main() {
+    out_color = texture(layers, v_uv);
+}
+"""
+
+# Propriété Tiled (booléen) d'un calque à redessiner à chaque frame
+DYNAMIC_PROPERTY = "dynamic"
+# Pendant la cuisson : couleurs prémultipliées, alpha accumulé correctement
+BAKE_BLEND = (gl.SRC_ALPHA, gl.ONE_MINUS_SRC_ALPHA, gl.ONE, gl.ONE_MINUS_SRC_ALPHA)
+# Composition de la texture cuite (ctx.BLEND_PREMULTIPLIED_ALPHA d'arcade est additif)
+COMPOSITE_BLEND = (gl.ONE, gl.ONE_MINUS_SRC_ALPHA)
+
+
+def is_dynamic(sprite_list) -> bool:
+    properties = getattr(sprite_list, "properties", None) or {}
+    return bool(properties.get(DYNAMIC_PROPERTY, False))
+
+
+class StaticLayerCache:
+    """
+    Calques de tuiles statiques composés une fois dans une texture hors écran.
+
+    Les calques de la carte sont parcourus dans l'ordre de Tiled ; chaque
+    suite de calques statiques est cuite dans un framebuffer qui couvre la
+    carte (résolution virtuelle x échelle du viewport, pour rester net),
+    puis dessinée en un seul quad. Les calques marqués "dynamic" dans Tiled
+    sont dessinés normalement entre ces quads. La cuisson est refaite si
+    l'échelle du viewport change (redimensionnement) ou après invalidate().
+
+    draw(*extra) dessine aussi des listes supplémentaires (wall_list...) en
+    sautant celles qui sont déjà des calques de la carte.
+    """
+    def __init__(self, tile_map: arcade.TileMap | None):
+        self.tile_map = tile_map
+        self.layers = list(tile_map.sprite_lists.values()) if tile_map else []
+        if tile_map:
+            self.world_width = tile_map.width * tile_map.tile_width * tile_map.scaling
+            self.world_height = tile_map.height * tile_map.tile_height * tile_map.scaling
+        else:
+            self.world_width = self.world_height = 0
+        # Suites de calques dans l'ordre : ("static", [listes]) ou ("dynamic", liste)
+        self.segments: list[tuple[str, object]] = []
+        for layer in self.layers:
+            if is_dynamic(layer):
+                self.segments.append(("dynamic", layer))
+            elif self.segments and self.segments[-1][0] == "static":
+                self.segments[-1][1].append(layer)
+            else:
+                self.segments.append(("static", [layer]))
+        self.bakes = 0
+
+        # GL, créé au premier draw : un framebuffer par suite statique
+        self._program = None
+        self._geometry = None
+        self._framebuffers: dict[int, gl.Framebuffer] = {}
+        self._baked_size = None
+
+    def invalidate(self):
+        """À appeler si des tuiles d'un calque statique changent."""
+        self._baked_size = None
+
+    # -------------- cuisson --------------
+    def _pixel_scale(self) -> float:
+        """Pixels écran par unité monde de la caméra active (1.5 en 960x720 pour 640x480)."""
+        camera = arcade.get_window().current_camera
+        try:
+            return camera.viewport.height / camera.projection.height
+        except (AttributeError, ZeroDivisionError):
+            return 1.0
+
+    def _target_size(self, ctx, scale: float) -> tuple[int, int]:
+        limit = ctx.info.MAX_TEXTURE_SIZE
+        return (max(1, min(limit, round(self.world_width * scale))),
+                max(1, min(limit, round(self.world_height * scale))))
+
+    def _bake(self, ctx, size, scale):
+        self._framebuffers.clear()
+        # zone monde couverte exactement par les pixels de la texture : texels alignés sur l'écran
+        width, height = size[0] / scale, size[1] / scale
+        for i, (kind, layers) in enumerate(self.segments):
+            if kind != "static":
+                continue
+            texture = ctx.texture(size, components=4, filter=(ctx.NEAREST, ctx.NEAREST))
+            fbo = ctx.framebuffer(color_attachments=[texture])
+            fbo.clear()
+            camera = arcade.Camera2D(
+                position=(0, 0),
+                projection=LRBT(0, width, 0, height),
+                viewport=LBWH(0, 0, *size),
+                render_target=fbo,
+            )
+            with camera.activate():
+                for layer in layers:
+                    layer.draw(blend_function=BAKE_BLEND)
+            ctx.blend_func = ctx.BLEND_DEFAULT
+            self._framebuffers[i] = fbo
+        self._program["rect"] = (0.0, 0.0, width, height)
+        self._baked_size = size
+        self.bakes += 1
+
+    def _create_gl_objects(self, ctx):
+        self._program = ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+        self._program["layers"] = 0
+        quad = ctx.buffer(data=np.array([0, 1, 0, 0, 1, 1, 1, 0], np.float32))
+        self._geometry = ctx.geometry(
+            [gl.BufferDescription(quad, "2f", ["in_vert"])],
+            mode=ctx.TRIANGLE_STRIP,
+        )
+
+    # -------------- rendu --------------
+    def draw(self, *extra):
+        ctx = arcade.get_window().ctx
+        if self.segments:
+            if self._program is None:
+                self._create_gl_objects(ctx)
+            scale = self._pixel_scale()
+            size = self._target_size(ctx, scale)
+            if size != self._baked_size:
+                self._bake(ctx, size, scale)
+            for i, (kind, layer) in enumerate(self.segments):
+                if kind == "dynamic":
+                    layer.draw()
+                    continue
+                self._framebuffers[i].color_attachments[0].use(0)
+                ctx.enable(ctx.BLEND)
+                ctx.blend_func = COMPOSITE_BLEND
+                self._geometry.render(self._program)
+                ctx.blend_func = ctx.BLEND_DEFAULT
+        for sprite_list in extra:
+            # wall_list est souvent déjà un calque de la carte : pas de second draw
+            if sprite_list is not None and not any(sprite_list is layer for layer in self.layers):
+                sprite_list.draw()
@@ -0,0 +1,102 @@
+# ---------------- Cached text layout ----------------
+from collections import OrderedDict
+
+import arcade
+import pyglet
+
+# Nombre de textes gardés (les moins récents sont supprimés du batch)
+MAX_ENTRIES = 64
+DEFAULT_FONT = ("calibri", "arial")
+
+
+class TextCache:
+    """
+    Textes (arcade.Text) gardés d'une frame à l'autre dans un batch pyglet.
+
+    arcade.draw_text refait la mise en page dès que la chaîne change et
+    vide le pipeline GL à chaque appel. Ici chaque texte est indexé par
+    (chaîne, police, taille, largeur, ...) : la mise en page n'est faite
+    qu'à la création, une frame suivante ne fait que déplacer / recolorer
+    le texte si besoin. Les scènes appellent draw_text() comme avant, puis
+    draw() une fois en fin de on_draw : tous les textes de la frame partent
+    en un seul batch.draw(). Au-delà de max_entries, éviction LRU.
+    """
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.batch = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # clé -> arcade.Text, du moins récent au plus récent
+        self._entries: OrderedDict[tuple, arcade.Text] = OrderedDict()
+        # clés utilisées depuis le dernier draw() / affichées au dernier draw()
+        self._used: dict[tuple, None] = {}
+        self._shown: set[tuple] = set()
+
+    def draw_text(self, text, x: float, y: float, color=arcade.color.WHITE, font_size: float = 12,
+                  width: int = 0, align: str = "left", font_name=DEFAULT_FONT, bold: bool = False,
+                  anchor_x: str = "left", anchor_y: str = "baseline", multiline: bool = False) -> arcade.Text:
+        """Mêmes paramètres que arcade.draw_text ; le texte est dessiné au prochain draw()."""
+        text = str(text)
+        base = (text, font_name, font_size, width, align, bold, anchor_x, anchor_y, multiline)
+        # la même chaîne deux fois dans une frame -> deux entrées
+        key = base + (0,)
+        while key in self._used:
+            key = base + (key[-1] + 1,)
+
+        label = self._entries.get(key)
+        if label is None:
+            self.misses += 1
+            if self.batch is None:
+                self.batch = pyglet.graphics.Batch()
+            label = arcade.Text(text, x, y, color, font_size, width=width or None, align=align,
+                                font_name=font_name, bold=bold, anchor_x=anchor_x, anchor_y=anchor_y,
+                                multiline=multiline, batch=self.batch)
+            self._entries[key] = label
+            self._evict()
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            if label.x != x or label.y != y:
+                label.position = x, y
+            if label.color != color:
+                label.color = color
+        self._used[key] = None
+        return label
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            key, label = self._entries.popitem(last=False)
+            # libère les sommets du texte dans le batch
+            label.label.delete()
+            self._shown.discard(key)
+            self._used.pop(key, None)
+            self.evictions += 1
+
+    def draw(self):
+        """Dessine les textes demandés depuis le dernier appel, en un seul batch."""
+        used = set(self._used)
+        # ne touche la visibilité que des textes qui apparaissent / disparaissent
+        for key in self._shown - used:
+            self._entries[key].visible = False
+        for key in used - self._shown:
+            self._entries[key].visible = True
+        self._shown = used
+        self._used = {}
+        if self.batch is not None and used:
+            self.batch.draw()
+
+    def clear(self):
+        for label in self._entries.values():
+            label.label.delete()
+        self._entries.clear()
+        self._used = {}
+        self._shown = set()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions}
+
+
+# Instance unique partagée par les scènes
+text_cache = TextCache()
@@ -0,0 +1,246 @@
+# ---------------- Shared texture cache ----------------
+import io
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+import arcade
+from arcade.resources import resolve
+from PIL import Image
+
+import SpriteAtlas
+from SpriteAtlas import image_digest, list_frame_files
+
+# Budget des textures retenues par le cache (RGBA, ce qu'elles occupent dans l'atlas GPU)
+DEFAULT_BUDGET_BYTES = 256 * 1024 * 1024
+# Nombre d'images d'atlas décodées gardées en mémoire
+MAX_DECODED_SHEETS = 4
+
+
+class TextureCache:
+    """
+    Cache de textures commun à toutes les scènes, au menu et au sous-menu.
+
+    Les textures sont indexées par le hash de leurs pixels : deux PNG
+    identiques, ou un PNG et sa frame dans un atlas packé, donnent une seule
+    texture, et repasser d'une scène à l'autre
+    réutilise les textures déjà décodées (et déjà dans l'atlas GPU).
+
+    Le budget en octets est appliqué en LRU. L'atlas par défaut d'arcade ne
+    permet pas de retirer une texture à la main : il libère sa région quand
+    l'objet Texture est détruit. Une texture évincée n'est donc plus retenue
+    par le cache ; sa place dans l'atlas est rendue dès qu'aucun sprite ni
+    animation ne la référence. Tant qu'elle vit encore, un nouveau chargement
+    du même contenu la réutilise au lieu d'en créer une seconde.
+    """
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # digest -> (texture, nbytes), du moins récent au plus récent
+        self._entries: OrderedDict[str, tuple[arcade.Texture, int]] = OrderedDict()
+        # textures évincées encore référencées ailleurs (sprites, animations)
+        self._released: weakref.WeakValueDictionary[str, arcade.Texture] = weakref.WeakValueDictionary()
+        # (chemin, mtime_ns, taille) -> digest, pour ne pas relire le fichier
+        self._paths: dict[tuple[str, int, int], str] = {}
+        # atlas décodés (PIL), pour découper plusieurs animations d'un même fichier
+        self._sheets: OrderedDict[tuple[str, int, int], Image.Image] = OrderedDict()
+        self._lock = threading.RLock()
+
+    # -------------- lookup --------------
+    @staticmethod
+    def _path_key(file_path) -> tuple[str, int, int]:
+        path = os.path.abspath(str(resolve(file_path)))
+        st = os.stat(path)
+        return path, st.st_mtime_ns, st.st_size
+
+    def _has(self, digest: str) -> bool:
+        return digest in self._entries or digest in self._released
+
+    def _touch(self, digest: str) -> arcade.Texture | None:
+        entry = self._entries.get(digest)
+        if entry is None:
+            # évincée mais toujours vivante : elle reprend sa place dans le cache
+            texture = self._released.pop(digest, None)
+            if texture is None:
+                return None
+            self._insert(digest, texture)
+            return texture
+        self._entries.move_to_end(digest)
+        return entry[0]
+
+    def _insert(self, digest: str, texture: arcade.Texture):
+        nbytes = texture.width * texture.height * 4
+        self._entries[digest] = (texture, nbytes)
+        self.used_bytes += nbytes
+        self._evict()
+
+    def decode_file(self, file_path):
+        """
+        Lit et décode un fichier sans créer de texture (utilisable depuis un thread).
+        Renvoie (clé, digest, image) ; image vaut None si la texture est déjà en cache.
+        """
+        key = self._path_key(file_path)
+        with self._lock:
+            digest = self._paths.get(key)
+            if digest is not None and self._has(digest):
+                return key, digest, None
+
+        with open(key[0], 'rb') as f:
+            image = decode_image(f.read())
+        # hash des pixels, comme les frames des atlas : un PNG et sa frame packée partagent la texture
+        digest = image_digest(image)
+        with self._lock:
+            if self._has(digest):
+                # même contenu déjà chargé depuis un autre chemin (ou depuis un atlas)
+                self._paths[key] = digest
+                return key, digest, None
+        return key, digest, image
+
+    def load_texture(self, file_path) -> arcade.Texture:
+        """Remplace arcade.load_texture : renvoie la texture partagée pour ce fichier."""
+        while True:
+            key, digest, image = self.decode_file(file_path)
+            if image is not None:
+                return self.add_image(key, digest, image)
+            with self._lock:
+                texture = self._touch(digest)
+                if texture is not None:
+                    self.hits += 1
+                    return texture
+            # évincée entre-temps : on relit le fichier
+
+    def add_image(self, key, digest: str, image: Image.Image, hit_box=None) -> arcade.Texture:
+        """Insère une image déjà décodée (utilisé aussi par le préchargement)."""
+        with self._lock:
+            self._paths[key] = digest
+            texture = self._touch(digest)
+            if texture is not None:
+                self.hits += 1
+                return texture
+            self.misses += 1
+            texture = arcade.Texture(image, hash=digest, hit_box_points=hit_box)
+            texture.file_path = key[0]
+            self._insert(digest, texture)
+            return texture
+
+    def load_frames(self, folder) -> list[arcade.Texture]:
+        """Frames d'une animation, triées par numéro (remplace Scene.load_frames)."""
+        packed = SpriteAtlas.find_animation(folder)
+        if packed is not None:
+            return self.load_atlas_frames(*packed)
+        return [self.load_texture(path) for path in list_frame_files(folder)]
+
+    def decode_atlas_frames(self, image_path, anim: dict):
+        """
+        Découpe les frames d'une animation packée qui ne sont pas encore en cache.
+        Renvoie une liste de (clé, digest, image ou None, hit box) ; utilisable depuis un thread.
+        """
+        with self._lock:
+            missing = [not self._has(frame["hash"]) for frame in anim["frames"]]
+        sheet = self._load_sheet(image_path) if any(missing) else None
+        decoded = []
+        for frame, is_missing in zip(anim["frames"], missing):
+            x, y, w, h = frame["rect"]
+            key = (os.path.abspath(image_path), x, y, w, h)
+            image = sheet.crop((x, y, x + w, y + h)) if is_missing else None
+            hit_box = [tuple(p) for p in frame["hit_box"]]
+            decoded.append((key, frame["hash"], image, hit_box))
+        return decoded
+
+    def load_atlas_frames(self, image_path, anim: dict) -> list[arcade.Texture]:
+        """Découpe une animation dans un atlas packé (voir SpriteAtlas.py)."""
+        textures = []
+        for key, digest, image, hit_box in self.decode_atlas_frames(image_path, anim):
+            texture = None
+            if image is None:
+                with self._lock:
+                    texture = self._touch(digest)
+                    if texture is not None:
+                        self.hits += 1
+            if texture is None:
+                if image is None:
+                    x, y, w, h = key[1:]
+                    image = self._load_sheet(image_path).crop((x, y, x + w, y + h))
+                texture = self.add_image(key, digest, image, hit_box)
+            textures.append(texture)
+        return textures
+
+    def _load_sheet(self, image_path) -> Image.Image:
+        key = self._path_key(image_path)
+        with self._lock:
+            sheet = self._sheets.get(key)
+            if sheet is not None:
+                self._sheets.move_to_end(key)
+                return sheet
+        with open(key[0], 'rb') as f:
+            sheet = decode_image(f.read())
+        with self._lock:
+            self._sheets[key] = sheet
+            while len(self._sheets) > MAX_DECODED_SHEETS:
+                self._sheets.popitem(last=False)
+        return sheet
+
+    # -------------- budget --------------
+    def _evict(self):
+        # On garde toujours au moins l'entrée la plus récente
+        while self.used_bytes > self.budget_bytes and len(self._entries) > 1:
+            digest, (texture, nbytes) = self._entries.popitem(last=False)
+            self.used_bytes -= nbytes
+            self.evictions += 1
+            # plus de référence forte ici : l'atlas libère la région quand la texture meurt
+            self._released[digest] = texture
+            keys = [k for k, d in self._paths.items() if d == digest]
+            for key in keys:
+                del self._paths[key]
+            # atlas décodés dont on découpait cette frame
+            sources = {key[0] for key in keys if len(key) == 5}
+            for sheet_key in [k for k in self._sheets if k[0] in sources]:
+                del self._sheets[sheet_key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._released.clear()
+            self._paths.clear()
+            self._sheets.clear()
+            self.used_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "textures": len(self._entries),
+                "released_alive": len(self._released),
+                "used_bytes": self.used_bytes,
+                "budget_bytes": self.budget_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+def decode_image(data: bytes) -> Image.Image:
+    """Décode un PNG (bytes) en image RGBA, comme arcade.load_texture."""
+    im = Image.open(io.BytesIO(data))
+    if im.mode != "RGBA":
+        im = im.convert("RGBA")
+    else:
+        im.load()
+    return im
+
+
+# Instance unique pour tout le processus
+texture_cache = TextureCache()
+
+
+def load_texture(file_path) -> arcade.Texture:
+    return texture_cache.load_texture(file_path)
+
+
+def load_frames(folder) -> list[arcade.Texture]:
+    return texture_cache.load_frames(folder)
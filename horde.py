@@ -0,0 +1,268 @@
+#--- horde.py ---
+import math
+import time
+from collections import deque
+
+import arcade
+import numpy as np
+
+from Animator import END_EVENT
+from EntityWorld import AI_FOLLOW, Archetype
+from FightScene import SCREEN_HEIGHT, FightScene
+from RandomStreams import random_streams
+from TextCache import text_cache
+
+# Mode horde : vagues de héros contre le monstre du joueur (python main.py --horde)
+
+# Clips (durées, images d'événement) : un fichier de données par personnage
+PLAYER_ANIMATIONS = "assets/sprites/Monster_1/animations.json"
+FOLLOWER_ANIMATIONS = "assets/sprites/Hero/animations.json"
+TILE_SCALING = 1.48
+MAP_FILE = "assets/Tileset/Maps/First_Map.tmx"
+
+# Vagues : nombre de héros de chaque vague
+HORDE_WAVES = (10, 25, 50, 100, 200, 400)
+WAVE_PAUSE = 2.0             # secondes entre la fin d'une vague et la suivante
+SPAWN_PER_TICK = 8           # héros ajoutés par update (pas de pic au début d'une vague)
+SPAWN_LEFT = (90, 160)       # x d'apparition, bords gauche / droit de l'arène
+SPAWN_RIGHT = (560, 640)
+SPAWN_HEIGHT = (320, 440)    # les héros tombent dans l'arène
+
+# Héros : vitesse, distance d'attaque et réaction tirées par héros (la foule s'étale)
+HERO_HEALTH = 2
+HERO_SPEED = (1.2, 1.9)
+HERO_RANGE = (60, 110)
+HERO_REACTION = (0.0, 0.6)
+
+# Joueur : son coup touche tous les héros devant lui
+PLAYER_HEALTH = 100
+PLAYER_REACH = 130
+PLAYER_REACH_BACK = 20       # px derrière lui encore touchés
+PLAYER_REACH_Y = 60
+BLINK_HEALTH_THRESHOLD = 15
+
+# Effets étalés dans le temps
+SOUND_INTERVAL = 0.12        # au plus un son d'attaque de héros par intervalle (s)
+PARTICLE_BUDGET = 60         # particules émises par update ; le reste attend l'update suivant
+HIT_PARTICLES = 8
+
+
+class Scene(FightScene):
+    """
+    Vagues de héros, des dizaines aux centaines, contre le monstre du joueur.
+
+    Les héros sont des entités cinématiques de l'EntityWorld : approche,
+    délai avant l'attaque, orientation et déplacement sont des passes NumPy
+    sur toute la vague, sans corps physique par héros. Le coup du joueur
+    touche en une passe tous les héros devant lui. Sons d'attaque et
+    particules sont étalés (SOUND_INTERVAL, PARTICLE_BUDGET) pour qu'une
+    vague qui frappe ensemble ne coûte pas tout sur un seul update.
+
+    Les fps de chaque vague (une fois tous ses héros en jeu) sont affichés
+    à sa fin et gardés dans wave_report ; HordeBenchmark.py les mesure hors
+    écran pour une liste de tailles de vague.
+    """
+    dialogues = [
+        "Mushdoom : Blergh... shwoop?! (Wait, how many of them are there?!)",
+        "Hero army : For the kingdom! Charge!",
+    ]
+
+    name = "horde"
+    next_scene_module = None
+    map_file = MAP_FILE
+    tile_scaling = TILE_SCALING
+    background = ":resources:images/backgrounds/stars.png"
+
+    player_archetype = Archetype(
+        PLAYER_ANIMATIONS, health=PLAYER_HEALTH, scale=2.0, art_facing=-1, hit_particles=HIT_PARTICLES,
+        blink_below=BLINK_HEALTH_THRESHOLD, health_bar=(50, 10),
+    )
+    # pas de héros unique : les héros arrivent par vagues
+    follower_archetype = None
+    hero_archetype = Archetype(
+        FOLLOWER_ANIMATIONS, health=HERO_HEALTH, scale=2.0, strike_event=END_EVENT, hit_particles=HIT_PARTICLES // 2,
+        ai=AI_FOLLOW, follow_range=(HERO_RANGE[1], math.inf), kinematic=True,
+    )
+    player_start = (340, 400)
+    player_speed = 5
+    jump_speed = 20
+    waves = HORDE_WAVES
+
+    def __init__(self):
+        super().__init__()
+        self.rng = random_streams.numpy("horde")
+        # Vague en cours (nombre de vagues lancées) et héros qu'il reste à faire apparaître
+        self.wave = 0
+        self.wave_size = 0
+        self.to_spawn = 0
+        self.spawned = 0
+        self.wave_timer = 0.0
+        self.kills = 0
+        self.finished = False
+
+        # Effets étalés
+        self.sound_timer = 0.0
+        self.particle_queue: deque[tuple[float, float, int]] = deque()
+
+        # Fps par vague : intervalles entre deux draws, une fois la vague entière en jeu
+        self.wave_report: list[dict] = []
+        self._frame_times: list[float] = []
+        self._last_draw = None
+        self._peak_heroes = 0
+        self.wave_in_play = False
+
+    # -------------- horde --------------
+    def hero_ids(self) -> np.ndarray:
+        """Héros vivants (entités actives hors joueur)."""
+        alive = self.world.alive()
+        return alive[alive != self.player_entity]
+
+    @property
+    def hero_health(self) -> int:
+        """Vie restante de la horde : héros en jeu, à venir dans la vague et vagues suivantes."""
+        in_play = int(self.world.health[self.hero_ids()].sum())
+        queued = self.to_spawn + sum(self.waves[self.wave:])
+        return in_play + queued * self.hero_archetype.health
+
+    @property
+    def hero_max_health(self) -> int:
+        return sum(self.waves) * self.hero_archetype.health
+
+    def start_wave(self):
+        self.report_wave()
+        self.wave_size = self.to_spawn = self.waves[self.wave]
+        self.wave += 1
+        self.wave_timer = 0.0
+        print(f"🧟 Vague {self.wave}/{len(self.waves)} : {self.wave_size} héros")
+
+    def spawn_hero(self) -> int:
+        """Un héros sur un bord de l'arène (alternés), avec sa vitesse, sa portée et sa réaction."""
+        rng, world = self.rng, self.world
+        low, high = SPAWN_LEFT if self.spawned % 2 == 0 else SPAWN_RIGHT
+        e = self.spawn(self.hero_archetype, rng.uniform(low, high), rng.uniform(*SPAWN_HEIGHT))
+        world.target[e] = self.player_entity
+        world.speed[e] = rng.uniform(*HERO_SPEED)
+        world.follow_range[e, 0] = rng.uniform(*HERO_RANGE)
+        world.reaction[e] = rng.uniform(*HERO_REACTION)
+        self.spawned += 1
+        self.to_spawn -= 1
+        return e
+
+    def report_wave(self):
+        """Fps tenus pendant la vague qui se termine (médiane et 95e centile des frames)."""
+        frames = self._frame_times
+        self._frame_times = []
+        if self.wave == 0 or not frames:
+            return
+        p50, p95 = np.percentile(frames, (50, 95)).tolist()
+        report = {
+            "wave": self.wave,
+            "heroes": self._peak_heroes,
+            "frames": len(frames),
+            "fps_p50": round(1 / p50, 1) if p50 > 0 else 0.0,
+            "fps_p95": round(1 / p95, 1) if p95 > 0 else 0.0,
+        }
+        self.wave_report.append(report)
+        self._peak_heroes = 0
+        print(f"📈 Vague {report['wave']} : {report['heroes']} héros, "
+              f"{report['fps_p50']} fps (p95 {report['fps_p95']})")
+
+    # -------------- draw --------------
+    def on_draw(self):
+        now = time.perf_counter()
+        # la vague est entière en jeu : on mesure les frames
+        if self._last_draw is not None and self.wave_in_play:
+            self._frame_times.append(now - self._last_draw)
+        self._last_draw = now
+        super().on_draw()
+
+    def draw_overlay(self):
+        if self.dialogue_active:
+            return
+        text_cache.draw_text(f"Wave {self.wave}/{len(self.waves)}", 35, SCREEN_HEIGHT - 30, arcade.color.WHITE, 14)
+        text_cache.draw_text(f"Heroes {len(self.hero_ids()) + self.to_spawn}   Kills {self.kills}",
+                             35, SCREEN_HEIGHT - 50, arcade.color.LIGHT_GRAY, 12)
+        if self.player_health <= 0:
+            text_cache.draw_text("The horde got you...", 35, SCREEN_HEIGHT - 80, arcade.color.RED, 16)
+        elif self.finished:
+            text_cache.draw_text("The horde is defeated!", 35, SCREEN_HEIGHT - 80, arcade.color.LIGHT_GREEN, 16)
+
+    # -------------- update --------------
+    def update_before_physics(self, delta_time):
+        self.sound_timer = max(0.0, self.sound_timer - delta_time)
+        self.wave_in_play = False
+        if self.player_health <= 0 or self.finished:
+            return
+        heroes = len(self.hero_ids())
+        self._peak_heroes = max(self._peak_heroes, heroes)
+        self.wave_in_play = heroes > 0 and not self.to_spawn
+        if not self.to_spawn and not heroes:
+            if self.wave == len(self.waves):
+                self.report_wave()
+                self.finished = True
+                print(f"🏆 Horde vaincue : {self.kills} héros")
+                return
+            self.wave_timer += delta_time
+            if self.wave == 0 or self.wave_timer >= WAVE_PAUSE:
+                self.start_wave()
+        for _ in range(min(SPAWN_PER_TICK, self.to_spawn)):
+            self.spawn_hero()
+
+    def update_after_physics(self, delta_time):
+        # Particules en attente : au plus PARTICLE_BUDGET par update
+        budget = PARTICLE_BUDGET
+        queue = self.particle_queue
+        while queue and budget > 0:
+            x, y, count = queue.popleft()
+            self.spawn_particles(x, y, count=count)
+            budget -= count
+
+    def steer(self, delta_time):
+        # Le joueur vise (et regarde) le héros le plus proche
+        world, player = self.world, self.player_entity
+        heroes = self.hero_ids()
+        if len(heroes):
+            nearest = int(heroes[np.argmin(np.abs(world.pos[heroes, 0] - world.pos[player, 0]))])
+            world.target[player] = nearest
+            self.follower_sprite = world.sprites[nearest]
+        else:
+            world.target[player] = -1
+            self.follower_sprite = None
+
+    # -------------- combat --------------
+    def strike(self, e):
+        """Coup du joueur : tous les héros devant lui, à portée, en une passe."""
+        if e != self.player_entity:
+            super().strike(e)
+            return
+        world = self.world
+        heroes = self.hero_ids()
+        ahead = (world.pos[heroes, 0] - world.pos[e, 0]) * world.facing[e]
+        dy = np.abs(world.pos[heroes, 1] - world.pos[e, 1])
+        hit = heroes[(ahead >= -PLAYER_REACH_BACK) & (ahead <= PLAYER_REACH) & (dy < PLAYER_REACH_Y)]
+        world.health[hit] -= world.attack_damage[e]
+        for t in hit.tolist():
+            self.hit_effect(e, t)
+        for t in hit[world.health[hit] <= 0].tolist():
+            self.kill(t, e)
+
+    def hit_effect(self, attacker, target):
+        # mises en file : émises par update_after_physics dans la limite du budget
+        count = self.world.archetypes[attacker].hit_particles
+        if count:
+            sprite = self.world.sprites[target]
+            self.particle_queue.append((sprite.center_x, sprite.center_y, count))
+
+    def on_death(self, e, killer):
+        if e == self.player_entity:
+            self.report_wave()
+            print(f"💀 Vaincu à la vague {self.wave} ({self.kills} héros)")
+            return
+        # l'entité (et son sprite) servira au prochain héros
+        self.world.despawn(e)
+        self.kills += 1
+
+    def on_attack_started(self, e):
+        if self.sound_timer <= 0 and self.follower_attack_sound:
+            arcade.play_sound(self.follower_attack_sound)
+            self.sound_timer = SOUND_INTERVAL
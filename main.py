@@ -1,12 +1,17 @@
 import importlib
 import os
 import time
+import sys
 import arcade
 from arcade.types import LRBT
 from arcade import gl
 
 
+import Replay
 from CutscenePlayer import CutscenePlayer
+from EntityPool import EntityPool
+from FrameProfiler import entity_counts, profiler
+from ScenePreloader import ScenePreloader
 
 # --- Game constants ---
 SCREEN_TITLE = "Hold'em!"
@@ -14,6 +19,14 @@ VIRTUAL_W, VIRTUAL_H = 640, 480
 ASPECT = VIRTUAL_W / VIRTUAL_H
 start_time = 0
 
+# --- Simulation à pas fixe ---
+# Les vitesses des scènes sont en px par update : on les fait tourner à 60 updates/s
+# quelle que soit la fréquence d'affichage.
+SIM_DT = 1 / 60
+MAX_SIM_STEPS = 5  # au-delà (grosse saccade), on ralentit plutôt que de rattraper
+# Listes de sprites dont la position affichée est interpolée entre deux pas
+INTERPOLATED_LISTS = ("player_list", "fireball_list")
+
 # ---------------- Main view ----------------
 class MainView(arcade.View):
     def __init__(self, window):
@@ -37,6 +50,18 @@ class MainView(arcade.View):
         self.video_player: CutscenePlayer | None = None
         self.next_scene_after_video: str | None = None
 
+        # Préchargement de la scène suivante
+        self.preloader: ScenePreloader | None = None
+
+        # Pas fixe : temps pas encore simulé et positions avant le dernier pas
+        self.sim_accumulator = 0.0
+        self.sim_alpha = 1.0
+        self._previous_positions: list = []
+        # Numéro du prochain pas de simulation (toutes scènes confondues), base des replays
+        self.sim_tick = 0
+        self.recorder = Replay.recorder
+        self.replay = Replay.player
+
         self._fit_viewport()
 
     def start_timer(self):
@@ -50,16 +75,27 @@ class MainView(arcade.View):
 
     # -------------- scene loading --------------
     def setup_scene(self, scene_module_name='scene1'):
+        self._report_pools()
+        self.sim_accumulator = 0.0
+        self._previous_positions = []
+        if self.recorder:
+            self.recorder.scene_started(scene_module_name)
         try:
-            mod = importlib.import_module(scene_module_name)
-            SceneClass = getattr(mod, 'Scene', None)
-            if SceneClass is None:
-                print(f"No Scene class in {scene_module_name}")
-                return
-            self.scene_module = mod
-            self.current_scene = SceneClass()
-            if hasattr(self.current_scene, "setup"):
-                self.current_scene.setup()
+            preloader, self.preloader = self.preloader, None
+            if preloader and preloader.module_name == scene_module_name and preloader.finish() is not None:
+                # Scène déjà construite en arrière-plan
+                self.scene_module = preloader.module
+                self.current_scene = preloader.scene
+            else:
+                mod = importlib.import_module(scene_module_name)
+                SceneClass = getattr(mod, 'Scene', None)
+                if SceneClass is None:
+                    print(f"No Scene class in {scene_module_name}")
+                    return
+                self.scene_module = mod
+                self.current_scene = SceneClass()
+                if hasattr(self.current_scene, "setup"):
+                    self.current_scene.setup()
             # (Option) musique de fond de la scène courante
             if getattr(self.current_scene, 'background_music', None):
                 try:
@@ -71,29 +107,50 @@ class MainView(arcade.View):
         except Exception as e:
             print('[MainView] Failed to load scene module', scene_module_name, e)
 
+    def _report_pools(self):
+        """Affiche les high-water marks des pools de la scène qu'on quitte (réglage des capacités)."""
+        if self.current_scene is None:
+            return
+        for name, value in vars(self.current_scene).items():
+            if isinstance(value, EntityPool) and value.high_water:
+                print(f"♻️ Pool {name}:", value.stats())
+
+    def _step_preloader(self, allow_build: bool):
+        """Avance le préchargement de next_scene_module de la scène courante."""
+        next_mod = getattr(self.current_scene, 'next_scene_module', None)
+        if not next_mod:
+            return
+        if self.preloader is None or self.preloader.module_name != next_mod:
+            self.preloader = ScenePreloader(next_mod)
+            self.preloader.start()
+        self.preloader.step(allow_build=allow_build)
+
     # -------------- cutscene control --------------
     def play_video(self, file_path: str, next_scene: str | None, audio_path: str):
         self.stop_video()  # safety
 
         vp = CutscenePlayer(file_path, audio_path)
         if not vp.open():
-            print("⚠️ Could not start OpenCV playback. Skipping to next scene.")
+            print("⚠️ Could not start cutscene playback. Skipping to next scene.")
             if next_scene:
                 self.setup_scene(next_scene)
             return
-        self.bg_music.pause()
+        if self.bg_music:
+            self.bg_music.pause()
         vp.play_audio()
         self.video_player = vp
         self.next_scene_after_video = next_scene
-        print(f"▶️ Playing cutscene via OpenCV: {file_path}")
+        print(f"▶️ Playing cutscene: {file_path}")
 
     def stop_video(self):
         if self.video_player:
+            print("🎬 Cutscene stats:", self.video_player.stats())
             try:
                 self.video_player.close()
             except Exception:
                 pass
-        self.bg_music.play()
+        if self.bg_music:
+            self.bg_music.play()
         self.video_player = None
 
     # -------------- arcade lifecycle --------------
@@ -112,11 +169,74 @@ class MainView(arcade.View):
                 self.video_player.draw(0, 0, VIRTUAL_W, VIRTUAL_H)
 
             elif self.current_scene and hasattr(self.current_scene, "on_draw"):
+                current = self._apply_interpolation()
                 self.current_scene.on_draw()
+                # reste de on_draw après le HUD : dialogues et draw_text
+                profiler.lap("draw_text")
+                for sprite, x, y in current:
+                    sprite.position = (x, y)
+
+        # Profiler (F3) en coordonnées fenêtre, au-dessus de la caméra du jeu
+        if profiler.enabled:
+            profiler.end_frame(entity_counts(self.current_scene) if self.current_scene else None)
+            profiler.draw(self.window.width, self.window.height)
+
+    # -------------- fixed timestep --------------
+    def _interpolated_sprites(self):
+        for name in INTERPOLATED_LISTS:
+            sprite_list = getattr(self.current_scene, name, None)
+            if sprite_list:
+                yield from sprite_list
+
+    def _snapshot_positions(self):
+        # serial : ce que montre un sprite recyclé (projectiles) ; None pour les autres
+        self._previous_positions = [(sprite, sprite.center_x, sprite.center_y, getattr(sprite, "serial", None))
+                                    for sprite in self._interpolated_sprites()]
+
+    def _apply_interpolation(self):
+        """Place les sprites entre leur position précédente et actuelle ; renvoie les positions réelles."""
+        alpha = self.sim_alpha
+        current = []
+        if alpha >= 1.0:
+            return current
+        for sprite, px, py, serial in self._previous_positions:
+            x, y = sprite.center_x, sprite.center_y
+            if (x, y) == (px, py) or getattr(sprite, "serial", None) != serial:
+                # immobile, ou le sprite montre désormais un autre objet
+                continue
+            current.append((sprite, x, y))
+            sprite.position = (px + (x - px) * alpha, py + (y - py) * alpha)
+        return current
+
+    def _step_scene(self, delta_time: float):
+        """Avance la scène par pas de SIM_DT ; renvoie le nombre de pas simulés."""
+        self.sim_accumulator += delta_time
+        steps = 0
+        while self.sim_accumulator >= SIM_DT and steps < MAX_SIM_STEPS:
+            self._snapshot_positions()
+            if self.replay:
+                self._feed_replay_inputs()
+            self.current_scene.on_update(SIM_DT)
+            if self.recorder:
+                self.recorder.after_step(self.sim_tick, self.current_scene)
+            if self.replay:
+                self.replay.after_step(self.sim_tick, self.current_scene)
+            self.sim_tick += 1
+            self.sim_accumulator -= SIM_DT
+            steps += 1
+            if getattr(self.current_scene, 'player_health', 1) <= 0:
+                break
+        if steps == MAX_SIM_STEPS:
+            # trop de retard : on abandonne le reste au lieu de s'enfoncer
+            self.sim_accumulator = min(self.sim_accumulator, SIM_DT)
+        self.sim_alpha = min(1.0, self.sim_accumulator / SIM_DT) if self._previous_positions else 1.0
+        return steps
 
     def on_update(self, delta_time: float):
         # If a cutscene is playing
         if self.video_player and not self.video_player.finished:
+            # La scène suivante peut être construite pendant la cinématique
+            self._step_preloader(allow_build=True)
             self.video_player.update(delta_time)
             if self.video_player.finished:
                 next_mod = self.next_scene_after_video
@@ -128,7 +248,11 @@ class MainView(arcade.View):
 
         # Otherwise, normal scene update
         if self.current_scene and hasattr(self.current_scene, "on_update"):
-            self.current_scene.on_update(delta_time)
+            self._step_scene(delta_time)
+            # Décodage / upload des textures de la scène suivante pendant le combat
+            profiler.start()
+            self._step_preloader(allow_build=False)
+            profiler.lap("preload")
 
             # When scene1 ends, play MP4 then go to scene2
             # Keep compatibility with your previous trigger:
@@ -152,6 +276,13 @@ class MainView(arcade.View):
                     print(f"Switching to scene {next_mod}")
                     self.setup_scene(next_mod)
 
+    def _feed_replay_inputs(self):
+        for kind, key, modifiers in self.replay.events_at(self.sim_tick):
+            if kind == Replay.PRESS:
+                self.current_scene.on_key_press(key, modifiers)
+            else:
+                self.current_scene.on_key_release(key, modifiers)
+
     # -------------- inputs --------------
     def on_key_press(self, key, modifiers):
         # Allow skipping the cutscene
@@ -164,11 +295,23 @@ class MainView(arcade.View):
         #             self.setup_scene(next_mod)
         #         return
 
+        if key == arcade.key.F3:
+            profiler.toggle()
+            return
+        # Pas d'entrées pendant une cinématique ni pendant un replay (elles viennent du fichier)
+        if self.replay or (self.video_player and not self.video_player.finished):
+            return
         if self.current_scene and hasattr(self.current_scene, "on_key_press"):
+            if self.recorder:
+                self.recorder.record(self.sim_tick, Replay.PRESS, key, modifiers)
             self.current_scene.on_key_press(key, modifiers)
 
     def on_key_release(self, key, modifiers):
+        if self.replay or (self.video_player and not self.video_player.finished):
+            return
         if self.current_scene and hasattr(self.current_scene, "on_key_release"):
+            if self.recorder:
+                self.recorder.record(self.sim_tick, Replay.RELEASE, key, modifiers)
             self.current_scene.on_key_release(key, modifiers)
 
     def on_mouse_motion(self, x, y, dx, dy):
@@ -193,9 +336,28 @@ class MainView(arcade.View):
 
 
 if __name__ == '__main__':
+    # python main.py [--record FICHIER | --replay FICHIER] (voir Replay.py) [--horde] (voir horde.py)
+    args = sys.argv[1:]
+    if "--record" in args:
+        Replay.start_recording(args[args.index("--record") + 1])
+    elif "--replay" in args:
+        Replay.start_replay(args[args.index("--replay") + 1])
+
     window = arcade.Window(width=960, height=720, title=SCREEN_TITLE, resizable=True)
     window.set_fullscreen(True)
-    from MenuView import MenuView
-    window.show_view(MenuView())
+    if Replay.player:
+        game_view = MainView(window)
+        window.show_view(game_view)
+        game_view.setup_scene(Replay.player.start_scene)
+    elif "--horde" in args:
+        # Mode horde : directement la scène de vagues, sans menu ni cinématiques
+        game_view = MainView(window)
+        window.show_view(game_view)
+        game_view.setup_scene("horde")
+        game_view.start_timer()
+    else:
+        from MenuView import MenuView
+        window.show_view(MenuView())
 
     arcade.run()
+    Replay.finish()
@@ -1,23 +1,22 @@
-#--- scene2.py ---
+#--- scene3.py ---
 import arcade
-import os
+import math
 import time
 from main import start_time
-from MenuView import MenuView
-
-import random
-import math
+from FrameProfiler import profiler
+from EntityWorld import AI_FOLLOW, Archetype
+from FightScene import SCREEN_HEIGHT, SCREEN_WIDTH, FightScene
+from Animator import END_EVENT
+from ProjectileSystem import ProjectileSystem
+from TextCache import text_cache
+from TextureCache import texture_cache
 
 # Scene module for graphics, assets and logic
-SCREEN_WIDTH = 640
-SCREEN_HEIGHT = 480
 
 # Paths used by this scene (adjust per scene file)
-WALK_FRAMES_FOLDER = "assets/sprites/Demon/walk"
-ATTACK_FRAMES_FOLDER = "assets/sprites/Demon/attack"
-FOLLOWER_WALK_FOLDER = "assets/sprites/Hero/walk1"
-FOLLOWER_FRAMES_FOLDER = "assets/sprites/Hero/idle"
-FOLLOWER_ATTACK_FRAMES_FOLDER = "assets/sprites/Hero/attack2"
+# Clips (durées, images d'événement) : un fichier de données par personnage
+PLAYER_ANIMATIONS = "assets/sprites/Demon/animations.json"
+FOLLOWER_ANIMATIONS = "assets/sprites/Hero/animations.json"
 FIREBALL_SHOOT_FOLDER = "assets/fireballshoot"
 FIREBALL_EXPLODE_FOLDER = "assets/fireballexplode"
 TILE_SCALING = 1.48
@@ -29,93 +28,22 @@ LEADERBOARD_FILE = "leaderboard.txt"
 # Constantes pour le système de propulsion
 KNOCKBACK_FORCE = 7
 KNOCKBACK_DISTANCE = 270
+KNOCKBACK_DELAY = 0.2
 
 # Constantes pour le système de fireball
 FIREBALL_SPEED = 5
 FIREBALL_DAMAGE = 3
 FIREBALL_COOLDOWN = 2.0  # Délai entre les fireballs
+FIREBALL_POOL_SIZE = 4   # fireballs préallouées (voir projectiles.high_water)
+FIREBALL_SCALE = 3.0
+FIREBALL_RADIUS = 15     # rayon de collision (flamme visible ~10 px x3)
 
 # --- Clignotement du joueur ---
 BLINK_HEALTH_THRESHOLD = 10
-BLINK_INTERVAL = 0.15
-
-# Particules
-PARTICLE_DEFAULT_COUNT = 18
-PARTICLE_MIN_SPEED = 1.0
-PARTICLE_MAX_SPEED = 3.0
-PARTICLE_MIN_LIFE = 0.4
-PARTICLE_MAX_LIFE = 1.0
-
-class Fireball(arcade.Sprite):
-    """Classe pour les projectiles fireball"""
-    def __init__(self, shoot_textures, explode_textures):
-        super().__init__()
-        self.shoot_textures = shoot_textures
-        self.explode_textures = explode_textures
-        self.current_frame = 0
-        self.frame_timer = 0
-        self.exploding = False
-        self.target_x = 0
-        self.target_y = 0
-        self.velocity_x = 0
-        self.velocity_y = 0
-        
-        if shoot_textures:
-            self.texture = shoot_textures[0]
-            self.textures = shoot_textures
-    
-    def setup_trajectory(self, start_x, start_y, target_x, target_y):
-        """Configure la trajectoire de la fireball"""
-        
-        self.center_x = start_x
-        self.center_y = start_y
-        self.target_x = target_x
-        self.target_y = target_y
-        
-        # Calculer la direction
-        dx = target_x - start_x
-        dy = target_y - start_y
-        distance = (dx**2 + dy**2)**0.5
-        
-        if distance > 0:
-            self.velocity_x = (dx / distance) * FIREBALL_SPEED
-            self.velocity_y = (dy / distance) * FIREBALL_SPEED
-            
-            # Calculer l'angle pour orienter le haut de l'image vers la direction
-            angle_rad = math.atan2(dy, dx)
-            self.angle = math.degrees(angle_rad) + 90
-    
-    def update_animation(self, delta_time):
-        """Met à jour l'animation de la fireball"""
-        self.frame_timer += delta_time
-        
-        if self.exploding:
-            if self.frame_timer > 0.1:
-                self.current_frame += 1
-                if self.current_frame >= len(self.explode_textures):
-                    return True  # Animation d'explosion terminée
-                else:
-                    self.texture = self.explode_textures[self.current_frame]
-                self.frame_timer = 0
-        else:
-            if self.frame_timer > 0.1:
-                self.current_frame = (self.current_frame + 1) % len(self.shoot_textures)
-                self.texture = self.shoot_textures[self.current_frame]
-                self.frame_timer = 0
-        
-        return False
-    
-    def start_explosion(self):
-        """Démarre l'animation d'explosion"""
-        self.exploding = True
-        self.current_frame = 0
-        self.textures = self.explode_textures
-        self.velocity_x = 0
-        self.velocity_y = 0
-        if self.explode_textures:
-            self.texture = self.explode_textures[0]
-
-class Scene:
+
+
+class Scene(FightScene):
+    """Dernier combat : le démon contre le héros et ses fireballs, puis l'écran de fin."""
     def get_exec_time(self, start_time):
         end_time = time.perf_counter()
         exec_time = end_time - start_time
@@ -130,186 +58,62 @@ class Scene:
         "Demon: ZRHA’KUL-TRONK FAL’GESH! (I WILL TEAR YOU APART!)",
         "Hero: Another one casting incantations just to look menacing...",
     ]
-    dialogue_index = 0
-    dialogue_active = True
-    """Encapsule les assets graphiques, sons, logique et interfaces draw/update/inputs."""
-    def __init__(self):
-        # Visuals
-        self.background_texture = None
 
-        # Sounds
-        self.boss_attack_sound = None
-        self.follower_attack_sound = None
-        self.background_music = None
-
-        # Sprites & lists
-        self.player_list = arcade.SpriteList()
-        self.wall_list = arcade.SpriteList()
-        self.fireball_list = arcade.SpriteList()
-        self.player_sprite = None
-        self.follower_sprite = None
-        self.tile_map = None
-
-        # Physics
-        self.physics_engine = None
-        self.follower_physics = None
-
-        # Animations
-        self.walk_textures = []
-        self.attack_textures = []
-        self.follower_idle_textures = []
-        self.follower_walk_textures = []
-        self.follower_attack_textures = []
-        
-        # Fireball animations
-        self.fireball_shoot_textures = []
-        self.fireball_explode_textures = []
-
-        # Animation state
-        self.current_frame = 0
-        self.frame_timer = 0
-        self.attacking = False
-
-        self.follower_frame = 0
-        self.follower_timer = 0
-        self.follower_attacking = False
-        self.follower_attack_frame = 0
-        self.follower_attack_timer = 0
-
-        # Health and damage
-        self.player_health = 45
-        self.player_max_health = self.player_health
-        self.hero_health = 100
-        self.hero_max_health = self.hero_health
-        self.player_attack_damage = 1
-        self.follower_attack_damage = 1
-        self.player_dealt_damage = False
-
-        # Système de propulsion du boss
-        self.attack_hit_delay = 0.2
-        self.attack_hit_timer = 0
-        self.attack_pending = False
-        self.follower_hurt = False
-        self.follower_hurt_timer = 0
+    name = 3
+    next_scene_module = None
+    map_file = MAP_FILE
+    tile_scaling = TILE_SCALING
+
+    # Système de propulsion du boss
+    player_archetype = Archetype(
+        PLAYER_ANIMATIONS, health=45, scale=1.4, art_facing=-1, hit_particles=20,
+        knockback=(KNOCKBACK_FORCE, KNOCKBACK_DISTANCE, KNOCKBACK_DELAY),
+        blink_below=BLINK_HEALTH_THRESHOLD, health_bar=(50, 10),
+    )
+    # le héros abandonne son attaque si le boss s'éloigne
+    follower_archetype = Archetype(
+        FOLLOWER_ANIMATIONS, health=100, scale=2.0, strike_event=END_EVENT, hit_particles=12,
+        ai=AI_FOLLOW, speed=FOLLOWER_SPEED, follow_range=(60, math.inf), cancel_out_of_range=True,
+        health_bar=(40, 8),
+    )
+    player_start = (650, 600)
+    follower_start = (100, 600)
+    player_speed = 5
+    jump_speed = 20
 
+    def __init__(self):
+        super().__init__()
         # Suivi des touches pressées pour éviter les conflits
         self.left_pressed = False
         self.right_pressed = False
 
-        # Système de fireball
-        self.fireball_cooldown_timer = 0
+        # Système de fireball : projectiles en tableaux, affichés par fireball_list
         self.fireball_list = arcade.SpriteList()
-
-        # Clignotement du player (état)
-        self.player_blink_timer = 0.0
-        self.player_blink_visible = True
-        self.blink_interval = BLINK_INTERVAL
-
-        # Particules
-        try:
-            self.particle_texture = arcade.make_circle_texture(6, arcade.color.ALIZARIN_CRIMSON)
-        except Exception:
-            self.particle_texture = None
-        self.particle_list = arcade.SpriteList()
-
-        # Scene name
-        self.name = 3
-        # Name of the next scene module to load when player dies (optional)
-        self.next_scene_module = None
+        self.fireball_shoot_textures = []
+        self.fireball_explode_textures = []
+        self.fireball_cooldown_timer = 0
+        self.projectiles = ProjectileSystem(
+            self.fireball_list, bounds=(-50, -50, SCREEN_WIDTH + 50, SCREEN_HEIGHT + 50),
+        )
+        self.fireball_kind = None
 
     def load_frames(self, folder):
-        textures = []
-        if not os.path.isdir(folder):
-            return textures
-        files = [f for f in os.listdir(folder) if f.endswith('.png')]
-        def extract_number(f):
-            name = os.path.splitext(f)[0]
-            digits = ''.join(filter(str.isdigit, name))
-            return int(digits) if digits != '' else 0
-        files.sort(key=extract_number)
-        for f in files:
-            textures.append(arcade.load_texture(os.path.join(folder, f)))
-        return textures
-
-    def setup(self):
-        # Load sounds and music
-        try:
-            self.boss_attack_sound = arcade.load_sound(":resources:sounds/hit5.wav")
-        except Exception:
-            self.boss_attack_sound = None
-        try:
-            self.follower_attack_sound = arcade.load_sound(":resources:sounds/hit4.wav")
-        except Exception:
-            self.follower_attack_sound = None
-        try:
-            self.background_music = arcade.load_sound(":resources:music/funkyrobot.mp3")
-        except Exception:
-            self.background_music = None
+        # Textures partagées entre scènes (déjà décodées si une autre scène les a chargées)
+        return texture_cache.load_frames(folder)
 
-        # Background image
-        try:
-            self.background_texture = arcade.load_texture(":resources:images/backgrounds/stars.png")
-        except Exception:
-            self.background_texture = None
-
-        # Tilemap / ground
-        try:
-            self.tile_map = arcade.load_tilemap(MAP_FILE, scaling=TILE_SCALING)
-            self.wall_list = self.tile_map.sprite_lists.get('Platforms') or self.tile_map.sprite_lists.get('Ground') or arcade.SpriteList()
-        except Exception:
-            self.wall_list = arcade.SpriteList()
-
-        # Load frames
-        self.walk_textures = self.load_frames(WALK_FRAMES_FOLDER)
-        self.attack_textures = self.load_frames(ATTACK_FRAMES_FOLDER)[1:]
-        self.follower_idle_textures = self.load_frames(FOLLOWER_FRAMES_FOLDER)
-        self.follower_walk_textures = self.load_frames(FOLLOWER_WALK_FOLDER)
-        self.follower_attack_textures = self.load_frames(FOLLOWER_ATTACK_FRAMES_FOLDER)
-        if not self.follower_attack_textures:
-            self.follower_attack_textures = self.follower_idle_textures.copy()
-        
+    def setup_scene(self):
         # Load fireball animations
         self.fireball_shoot_textures = self.load_frames(FIREBALL_SHOOT_FOLDER)
         self.fireball_explode_textures = self.load_frames(FIREBALL_EXPLODE_FOLDER)
+        self.fireball_kind = self.projectiles.add_kind(
+            self.fireball_shoot_textures, self.fireball_explode_textures,
+            scale=FIREBALL_SCALE, radius=FIREBALL_RADIUS,
+        )
+        self.projectiles.reserve(FIREBALL_POOL_SIZE)
+
+        # Le boss est la cible des fireballs du héros
+        self.projectiles.add_target(self.player_sprite, self.on_fireball_hit, kinds=[self.fireball_kind])
 
-        # Create sprites
-        self.player_sprite = arcade.Sprite()
-        self.player_sprite.textures = self.walk_textures
-        if self.walk_textures:
-            self.player_sprite.texture = self.walk_textures[0]
-
-
-
-        self.player_sprite.center_x = 650
-
-        self.player_sprite.center_y = 600
-        self.player_sprite.scale = 1.4
-        self.player_sprite.scale_x = -abs(self.player_sprite.scale_x)
-        self.player_list.append(self.player_sprite)
-
-        self.follower_sprite = arcade.Sprite()
-        self.follower_sprite.textures = self.follower_idle_textures
-        if self.follower_idle_textures:
-            self.follower_sprite.texture = self.follower_idle_textures[0]
-        self.follower_sprite.center_x = 100
-        self.follower_sprite.center_y = 600
-        self.follower_sprite.scale = 2.0
-        self.follower_sprite.scale_x = -abs(self.follower_sprite.scale_x)
-        self.player_list.append(self.follower_sprite)
-
-        # Physics
-        self.physics_engine = arcade.PhysicsEnginePlatformer(self.player_sprite, self.wall_list, gravity_constant=1)
-        self.follower_physics = arcade.PhysicsEnginePlatformer(self.follower_sprite, self.wall_list, gravity_constant=1)
-
-    def check_boss_attack_hit(self):
-        """Vérifie si l'attaque du boss va toucher le héros (avec délai)"""
-        distance = abs(self.player_sprite.center_x - self.follower_sprite.center_x)
-        
-        # Le boss peut propulser le héros
-        if distance <= KNOCKBACK_DISTANCE and not self.follower_hurt and not self.attack_pending:
-            self.attack_pending = True
-            self.attack_hit_timer = 0
-    
     def end_Timer(self):
         """Calcule et affiche le temps total de jeu"""
         global exec_time, start_time
@@ -326,419 +130,129 @@ class Scene:
         print("Temps total de jeu : ", exec_time_min, "min")
         print("Temps total de jeu : ", exec_time, "sec")
 
+    # -------------- fireballs --------------
     def create_fireball(self):
         """Crée une nouvelle fireball dirigée vers le boss"""
         if self.fireball_shoot_textures and self.hero_health > 0:
-            fireball = Fireball(self.fireball_shoot_textures, self.fireball_explode_textures)
-            
             # Position de départ (follower)
             start_x = self.follower_sprite.center_x
             start_y = self.follower_sprite.center_y
-            
+
             # Position cible (quart bas du boss)
             target_x = self.player_sprite.center_x
             target_y = self.player_sprite.center_y - (self.player_sprite.height * 0.375)
-            
+
             # Configurer la trajectoire
-            fireball.setup_trajectory(start_x, start_y, target_x, target_y)
-            fireball.scale = 3.0
-            
-            # Ajouter à la liste
-            self.fireball_list.append(fireball)
-            
+            self.projectiles.fire(self.fireball_kind, start_x, start_y, target_x, target_y, FIREBALL_SPEED)
+
             # Reset du cooldown
             self.fireball_cooldown_timer = 0
 
-    def start_follower_attack(self):
-        if self.player_health <= 0:
-            self.follower_attacking = False
-            self.follower_sprite.change_x = 0
-            return
-        self.follower_attacking = True
-        self.follower_attack_frame = 0
-        self.follower_attack_timer = 0
-        self.follower_sprite.change_x = 0
-        if self.follower_attack_textures:
-            self.follower_sprite.textures = self.follower_attack_textures
-            self.follower_sprite.texture = self.follower_attack_textures[0]
-        if self.follower_attack_sound:
-            arcade.play_sound(self.follower_attack_sound)
-
-    def finish_follower_attack(self):
-        """Termine l'attaque du follower et inflige des dégâts"""
-        self.player_health -= self.follower_attack_damage
-        # particules quand le joueur est touché
+    def on_fireball_hit(self, target, x, y):
+        """Impact d'une fireball sur le boss (appelé par ProjectileSystem)"""
+        # particules à l'impact
+        try:
+            self.spawn_particles(self.player_sprite.center_x, self.player_sprite.center_y, count=14)
+        except Exception:
+            pass
+        if self.world.damage(self.player_entity, FIREBALL_DAMAGE):
+            self.kill(self.player_entity, None)
+
+    # -------------- fin de partie --------------
+    def on_death(self, e, killer):
+        if e == self.player_entity:
+            print("Fin du jeu - Boss vaincu par fireball" if killer is None else "Fin du jeu - Boss vaincu par le héros")
+        else:
+            print("Fin du jeu - Héros vaincu")
         try:
-            self.spawn_particles(self.player_sprite.center_x, self.player_sprite.center_y, count=12)
+            self.end_Timer()
+            self.ending_time = self.get_exec_time(start_time)
+            self.ending_screen_active = True
         except Exception:
             pass
-        if self.player_health <= 0:
-            try:
-                self.player_sprite.kill()
-                print("Fin du jeu - Boss vaincu par le héros")
-                self.end_Timer()
-                self.ending_time = self.get_exec_time(start_time)
-                self.ending_screen_active = True
-            except Exception:
-                pass
-        self.follower_attacking = False
-        self.follower_attack_frame = 0
-        self.follower_attack_timer = 0
-        if not self.follower_hurt:
-            self.follower_sprite.change_x = 0
-        self.follower_sprite.textures = self.follower_idle_textures
-        if self.follower_idle_textures:
-            self.follower_sprite.texture = self.follower_idle_textures[0]
 
     def on_draw(self):
         # Display ending screen if active
         if self.ending_screen_active:
+            profiler.start()
             endRect = arcade.rect.LRBT(SCREEN_WIDTH // 2, 500, SCREEN_HEIGHT//2, 200)
             arcade.draw_rect_filled(endRect, arcade.color.BLACK)
-            arcade.draw_text("You held the Hero for : ", SCREEN_WIDTH//2, SCREEN_HEIGHT//2+60, arcade.color.WHITE, 28, anchor_x="center")
+            text_cache.draw_text("You held the Hero for : ", SCREEN_WIDTH//2, SCREEN_HEIGHT//2+60, arcade.color.WHITE, 28, anchor_x="center")
             if self.ending_time is not None:
-                arcade.draw_text(f"{self.ending_time:.2f} seconds", SCREEN_WIDTH//2, SCREEN_HEIGHT//2+10, arcade.color.LIGHT_GREEN, 20, anchor_x="center")
+                text_cache.draw_text(f"{self.ending_time:.2f} seconds", SCREEN_WIDTH//2, SCREEN_HEIGHT//2+10, arcade.color.LIGHT_GREEN, 20, anchor_x="center")
             message = ""
             if self.ending_time < 60 :
                 message = "What the hell ?? You didn't even try to held the Hero! Pathetic scum!"
-            elif self.ending_time < 90 : 
+            elif self.ending_time < 90 :
                 message = "You managed well, but the Hero still tore you apart..."
-            else : 
+            else :
                 message = "You held the Hero for a long time, the monster kingdom is proud of you!"
-            arcade.draw_text(message , SCREEN_WIDTH//2+30, SCREEN_HEIGHT//2-40, arcade.color.LIGHT_GRAY, 16, anchor_x="center")
-            arcade.draw_text("Press ESC to quit", SCREEN_WIDTH//2, SCREEN_HEIGHT//2-70, arcade.color.LIGHT_GRAY, 16, anchor_x="center")
+            text_cache.draw_text(message , SCREEN_WIDTH//2+30, SCREEN_HEIGHT//2-40, arcade.color.LIGHT_GRAY, 16, anchor_x="center")
+            text_cache.draw_text("Press ESC to quit", SCREEN_WIDTH//2, SCREEN_HEIGHT//2-70, arcade.color.LIGHT_GRAY, 16, anchor_x="center")
+            text_cache.draw()
             return
-        if self.tile_map:
-            for layer in self.tile_map.sprite_lists.values():
-                layer.draw()
-
-        # Draw layers
-        self.wall_list.draw()
-        self.player_list.draw()
-        self.fireball_list.draw()
-
-        # draw particles (au-dessus des sprites)
-        self.particle_list.draw()
-
-        # Health bars
-        hb_w, hb_h = 50, 10
-        hx = self.player_sprite.center_x - hb_w//2
-        hy = self.player_sprite.center_y + self.player_sprite.height//4
-        arcade.draw_lbwh_rectangle_filled(hx, hy, hb_w, hb_h, arcade.color.GRAY)
-        hp_p = self.player_health / max(1, self.player_max_health)
-        arcade.draw_lbwh_rectangle_filled(hx, hy, hb_w * hp_p, hb_h, arcade.color.GREEN if hp_p > 0.3 else arcade.color.RED)
-
-        # Hero bar
-        hero_w, hero_h = 40, 8
-        hx2 = self.follower_sprite.center_x - hero_w//2
-        hy2 = self.follower_sprite.center_y + self.follower_sprite.height//4
-        arcade.draw_lbwh_rectangle_filled(hx2, hy2, hero_w, hero_h, arcade.color.GRAY)
-        hero_p = max(0.0, min(1.0, (self.hero_health / max(1, self.hero_max_health))))
-        arcade.draw_lbwh_rectangle_filled(hx2, hy2, hero_w * hero_p, hero_h, arcade.color.GREEN if hero_p > 0.3 else arcade.color.RED)
-
-        # Display current dialogue (smaller font)
-        if self.dialogue_active:
-            text = self.dialogues[self.dialogue_index]
-            arcade.draw_text(text, 35, 40, arcade.color.WHITE, 14, width=580, align="left")
-            arcade.draw_text("Press SPACE to continue...", 35, 10, arcade.color.LIGHT_GRAY, 12)
+        super().on_draw()
+
+    def draw_foreground_sprites(self):
+        self.projectiles.draw()
 
+    # -------------- update --------------
     def on_update(self, delta_time):
         # If ending screen is active, skip update logic
         if self.ending_screen_active:
+            profiler.start()
             return
-        if self.dialogue_active:
-            return
-        if self.physics_engine:
-            self.physics_engine.update()
-        if self.follower_physics:
-            self.follower_physics.update()
+        super().on_update(delta_time)
 
+    def update_after_physics(self, delta_time):
         # Système de fireball avec cooldown dynamique selon la vie du héros
         self.fireball_cooldown_timer += delta_time
         # Cooldown minimum 0.5s, maximum 2.0s (ajuste selon besoin)
         cooldown = max(0.5, 2.0 * (self.hero_health / max(1, self.hero_max_health)))
-        if (self.fireball_cooldown_timer >= cooldown and 
-            not self.follower_attacking and 
+        if (self.fireball_cooldown_timer >= cooldown and
+            not self.follower_attacking and
             self.hero_health > 0 and self.player_health > 0):
             # Lancer une fireball seulement si à distance raisonnable
             distance = abs(self.player_sprite.center_x - self.follower_sprite.center_x)
             if distance > 100:  # Pas trop proche pour éviter le spam
                 self.create_fireball()
 
-        # Mise à jour des fireballs
-        fireballs_to_remove = []
-        for fireball in self.fireball_list:
-            # Mouvement de la fireball
-            if not fireball.exploding:
-                fireball.center_x += fireball.velocity_x
-                fireball.center_y += fireball.velocity_y
-                
-                # Vérifier collision avec le boss (zone du quart bas)
-                boss_target_y = self.player_sprite.center_y - (self.player_sprite.height * 0.375)
-                if (abs(fireball.center_x - self.player_sprite.center_x) < 30 and
-                    abs(fireball.center_y - boss_target_y) < 30):
-                    # Collision détectée
-                    fireball.start_explosion()
-                    # particules à l'impact
-                    try:
-                        self.spawn_particles(self.player_sprite.center_x, self.player_sprite.center_y, count=14)
-                    except Exception:
-                        pass
-                    self.player_health -= FIREBALL_DAMAGE
-                    if self.player_health <= 0:
-                        try:
-                            self.player_sprite.kill()
-                            print("Fin du jeu - Boss vaincu par fireball")
-                            self.ending_time = self.get_exec_time(start_time)
-                            self.ending_screen_active = True
-                            self.end_Timer()
-                        except Exception:
-                            pass
-                
-                # Supprimer si sort de l'écran
-                if (fireball.center_x < -50 or fireball.center_x > SCREEN_WIDTH + 50 or
-                    fireball.center_y < -50 or fireball.center_y > SCREEN_HEIGHT + 50):
-                    fireballs_to_remove.append(fireball)
-            
-            # Animation
-            if fireball.update_animation(delta_time):
-                fireballs_to_remove.append(fireball)
-        
-        # Supprimer les fireballs terminées
-        for fireball in fireballs_to_remove:
-            fireball.remove_from_sprite_lists()
-
-        # Player animation and attack
-        if self.attacking:
-            self.frame_timer += delta_time
-            if self.frame_timer > 0.1:
-                self.current_frame += 1
-                if self.current_frame >= len(self.attack_textures):
-                    self.attacking = False
-                    self.current_frame = 0
-                    self.player_sprite.textures = self.walk_textures
-                else:
-                    self.player_sprite.texture = self.attack_textures[self.current_frame]
-                    hit_frame = 7  # 8e frame (index 7, car on commence à 0)
-                    if self.current_frame == hit_frame and not self.player_dealt_damage:
-                        self.check_boss_attack_hit()
-                        self.player_dealt_damage = True
-                self.frame_timer = 0
-        else:
-            if getattr(self.player_sprite, 'change_x', 0) != 0 and self.walk_textures:
-                self.frame_timer += delta_time
-                if self.frame_timer > 0.1:
-                    self.current_frame = (self.current_frame + 1) % len(self.walk_textures)
-                    self.player_sprite.texture = self.walk_textures[self.current_frame]
-                    self.frame_timer = 0
-            else:
-                if self.walk_textures:
-                    self.player_sprite.texture = self.walk_textures[0]
-
-        # Gestion du délai d'attaque du boss (propulsion)
-        if self.attack_pending:
-            self.attack_hit_timer += delta_time
-            if self.attack_hit_timer >= self.attack_hit_delay:
-                self.attack_pending = False
-                
-                # Appliquer la propulsion
-                self.follower_hurt = True
-                self.follower_hurt_timer = 0
-                
-                # Calculer la direction et appliquer la propulsion
-                if self.follower_sprite.center_x < self.player_sprite.center_x:
-                    knockback_direction = -1
-                else:
-                    knockback_direction = 1
-                
-                self.follower_sprite.change_x = KNOCKBACK_FORCE * knockback_direction
-                
-                # Dégâts de propulsion
-                self.hero_health -= self.player_attack_damage
-                # particules au point d'impact du follower
-                try:
-                    self.spawn_particles(self.follower_sprite.center_x, self.follower_sprite.center_y, count=20)
-                except Exception:
-                    pass
-                if self.hero_health <= 0:
-                    try:
-                        self.follower_sprite.kill()
-                        print("Fin du jeu - Héros vaincu")
-                        self.end_Timer()
-                        self.ending_time = self.get_exec_time(start_time)
-                        self.ending_screen_active = True
-                    except Exception:
-                        pass
-
-        # Follower logic
-        if self.follower_hurt:
-            # Animation et logique de propulsion
-            self.follower_hurt_timer += delta_time
-            if self.follower_hurt_timer > 0.5:  # Durée de l'état hurt
-                self.follower_hurt = False
-                self.follower_hurt_timer = 0
-            
-            # Réduire progressivement la vitesse de propulsion
-            self.follower_sprite.change_x *= 0.95
-            if abs(self.follower_sprite.change_x) < 0.5:
-                self.follower_sprite.change_x = 0
+        # Mise à jour des fireballs (mouvement, impacts balayés, animation)
+        self.projectiles.update(delta_time)
 
-        else:
-            # Comportement normal : suivre le boss
-            dx = self.player_sprite.center_x - self.follower_sprite.center_x
-            min_distance = 60
-
-            if self.player_health > 0:
-                if abs(dx) > min_distance:
-                    # Assez loin du boss - arrêter l'attaque et suivre
-                    if self.follower_attacking:
-                        self.follower_attacking = False
-                        self.follower_attack_frame = 0
-                        self.follower_attack_timer = 0
-                        self.follower_sprite.textures = self.follower_idle_textures
-                    self.follower_sprite.change_x = FOLLOWER_SPEED if dx > 0 else -FOLLOWER_SPEED
-                else:
-                    # Assez proche du boss - déclencher l'attaque si pas déjà en cours
-                    if not self.follower_attacking:
-                        self.start_follower_attack()
-            else:
-                # Boss mort - arrêter toute activité
-                if self.follower_attacking:
-                    self.follower_attacking = False
-                self.follower_sprite.change_x = 0
-
-            # Animation de marche normale (seulement si pas en train d'attaquer)
-            if not self.follower_attacking:
-                if getattr(self.follower_sprite, 'change_x', 0) != 0 and self.follower_walk_textures:
-                    self.follower_timer += delta_time
-                    if self.follower_timer > 0.05:
-                        self.follower_frame = (self.follower_frame + 1) % len(self.follower_walk_textures)
-                        self.follower_sprite.texture = self.follower_walk_textures[self.follower_frame]
-                        self.follower_timer = 0
-                else:
-                    if self.follower_idle_textures:
-                        self.follower_sprite.texture = self.follower_idle_textures[0]
-
-        # Animation d'attaque normale du follower
-        if self.follower_attacking:
-            self.follower_attack_timer += delta_time
-            if self.follower_attack_timer > 0.02:
-                self.follower_attack_frame += 1
-                if self.follower_attack_frame >= len(self.follower_attack_textures):
-                    self.finish_follower_attack()
-                else:
-                    self.follower_sprite.texture = self.follower_attack_textures[self.follower_attack_frame]
-                self.follower_attack_timer = 0
+        profiler.lap("fireballs")
 
+    def steer(self, delta_time):
         # Réduire progressivement la vitesse du boss (pour l'effet de knockback)
         player_input = self.left_pressed or self.right_pressed
-        
+        vel = self.world.vel[self.player_entity]
+
         # Ne ralentir que si c'est un knockback et pas un input du joueur
-        if abs(getattr(self.player_sprite, 'change_x', 0)) > 0 and not self.attacking and not player_input:
+        if abs(vel[0]) > 0 and not self.attacking and not player_input:
             # Seulement ralentir si la vitesse est élevée (knockback)
-            if abs(self.player_sprite.change_x) > 5:
-                self.player_sprite.change_x *= 0.9
-                if abs(self.player_sprite.change_x) < 0.1:
-                    self.player_sprite.change_x = 0
-
-        # Orientation (flip)
-        if self.follower_sprite.center_x < self.player_sprite.center_x:
-            self.player_sprite.scale_x = abs(self.player_sprite.scale_x)
-            self.follower_sprite.scale_x = abs(self.follower_sprite.scale_x)
-        else:
-            self.player_sprite.scale_x = -abs(self.player_sprite.scale_x)
-            self.follower_sprite.scale_x = -abs(self.follower_sprite.scale_x)
-
-        # Clignotement : faire clignoter le joueur si sa vie est strictement inférieure au seuil
-        if self.player_sprite:
-            if 0 < self.player_health < BLINK_HEALTH_THRESHOLD:
-                self.player_blink_timer += delta_time
-                if self.player_blink_timer > self.blink_interval:
-                    self.player_blink_visible = not self.player_blink_visible
-                    self.player_sprite.alpha = 255 if self.player_blink_visible else 0
-                    self.player_blink_timer = 0.0
-            else:
-                # s'assurer que le sprite est visible quand la condition n'est plus vraie
-                if getattr(self.player_sprite, 'alpha', 255) != 255:
-                    self.player_sprite.alpha = 255
-                self.player_blink_timer = 0.0
-                self.player_blink_visible = True
-
-        # Mettre à jour les particules (position, gravité simple, alpha)
-        if len(self.particle_list) > 0:
-            remove_list = []
-            for p in self.particle_list:
-                p.center_x += getattr(p, 'vx', 0)
-                p.center_y += getattr(p, 'vy', 0)
-                p.vy -= 0.12  # légère gravité
-                p.life = getattr(p, 'life', getattr(p, 'max_life', 0)) - delta_time
-                setattr(p, 'life', p.life)
-                if p.life <= 0:
-                    remove_list.append(p)
-                else:
-                    try:
-                        p.alpha = int(255 * (p.life / max(0.0001, p.max_life)))
-                    except Exception:
-                        p.alpha = 255
-            for p in remove_list:
-                p.remove_from_sprite_lists()
+            if abs(vel[0]) > 5:
+                vel[0] *= 0.9
+                if abs(vel[0]) < 0.1:
+                    vel[0] = 0
 
+    # -------------- inputs --------------
     def on_key_press(self, key, modifiers):
-        global start_time
         # Allow quitting from ending screen
         if self.ending_screen_active and key == arcade.key.ESCAPE:
             arcade.exit()
             return
-        # Advance dialogue with SPACE, start fight after last
-        if self.dialogue_active and key == arcade.key.SPACE:
-            self.dialogue_index += 1
-            if self.dialogue_index >= len(self.dialogues):
-                self.dialogue_active = False
-            return
-        if key == arcade.key.UP and self.physics_engine and self.physics_engine.can_jump():
-            self.player_sprite.change_y = 20
-        elif key == arcade.key.LEFT:
+        if key == arcade.key.LEFT:
             self.left_pressed = True
-            self.player_sprite.change_x = -5
         elif key == arcade.key.RIGHT:
             self.right_pressed = True
-            self.player_sprite.change_x = 5
-        elif key == arcade.key.SPACE:
-            if not self.attacking and self.player_health > 0:
-                self.attacking = True
-                self.player_dealt_damage = False
-                self.current_frame = 0
-                self.player_sprite.textures = self.attack_textures
-                if self.attack_textures:
-                    self.player_sprite.texture = self.attack_textures[0]
-                if self.boss_attack_sound:
-                    arcade.play_sound(self.boss_attack_sound)
-
-    def on_key_release(self, key, modifiers):            
+        super().on_key_press(key, modifiers)
+
+    def on_key_release(self, key, modifiers):
         if key == arcade.key.LEFT:
             self.left_pressed = False
             if not self.right_pressed:
-                self.player_sprite.change_x = 0
+                self.world.set_velocity(self.player_entity, vx=0)
         elif key == arcade.key.RIGHT:
             self.right_pressed = False
             if not self.left_pressed:
-                self.player_sprite.change_x = 0
-
-    def spawn_particles(self, x, y, count=PARTICLE_DEFAULT_COUNT):
-        """Crée des particules simples autour de (x,y)."""
-        if self.particle_texture is None:
-            return
-        for _ in range(count):
-            p = arcade.Sprite()
-            p.texture = self.particle_texture
-            p.center_x = x + random.uniform(-6, 6)
-            p.center_y = y + random.uniform(-6, 6)
-            speed = random.uniform(PARTICLE_MIN_SPEED, PARTICLE_MAX_SPEED)
-            angle = random.uniform(0, 2 * math.pi)
-            p.vx = math.cos(angle) * speed
-            p.vy = math.sin(angle) * speed * 0.8
-            p.max_life = random.uniform(PARTICLE_MIN_LIFE, PARTICLE_MAX_LIFE)
-            p.life = p.max_life
-            p.alpha = 255
-            p.scale = random.uniform(0.6, 1.2)
-            self.particle_list.append(p)
+                self.world.set_velocity(self.player_entity, vx=0)